@@ -1,6 +1,27 @@
+from .modules.attitude import AttitudeEstimator, AttitudeFilter, EstimatorStats
+from .modules.buffers import OutBuffer
+from .modules.calibration import ADCCalibration, ChannelCalibration
+from .modules.comparator import ComparatorBank
+from .modules.console import TextConsole
+from .modules.commands import CommandCanvas, ScreenOp, replay_commands
+from .modules.debounce import IODebouncer
 from .modules.emulation import SensorEmulator
+from .modules.events import IOEdge, IOEvent, IOEventDispatcher
+from .modules.leds import LEDAnimation, LEDAnimator
 from .modules.loader import load_lib
-from .modules.logger import set_log_level
+from .modules.framebuffer import ScreenCompositor, SharedCanvas
+from .modules.logger import (
+    set_log_level,
+    set_log_aggregation,
+    start_log_listener,
+    stop_log_listener,
+    RepeatAggregator,
+)
+from .modules.loop import ControlLoop, LoopStats, OverrunPolicy
+from .modules.mirror import MirrorScreen, MirrorViewer, MirrorStats
+from .modules.parallel import ParallelReader, ParallelReadStats
+from .modules.plot import Sparkline
+from .modules.profile import BoardProfile, ProfileStep
 from .modules.pins import (
     pin_setter_constructor,
     pin_getter_constructor,
@@ -11,9 +32,18 @@ from .modules.pins import (
     PinModeSetter,
     IndexedGetter,
     IndexedSetter,
+    Pin,
+    PinGroup,
 )
 from .modules.screen import Screen, Color, FontSize
 from .modules.sensors import OnBoardSensors, ADCArrayType, MPUArrayType
+from .modules.shared import SensorPublisher, SensorSubscriber
+from .modules.snapshot import SensorSnapshot
+from .modules.text import layout_text
+from .modules.trace import ScreenRecorder, ScreenTrace, TraceReport
+from .modules.sprite import Sprite, SpriteCache
+from .modules.watchdog import BoundedReader, Reading
+from .modules.widgets import Widget, Label, ValueField, BarGauge, IndicatorRow, Page, PageContainer
 from .tools.display import (
     adc_io_display_on_lcd,
     make_adc_table,
@@ -21,21 +51,76 @@ from .tools.display import (
     make_mpu_table,
     make_io_table,
 )
+from .tools.dashboard import TerminalDashboard
 
 __all__ = [
     "OnBoardSensors",
     "SensorEmulator",
+    "SensorSnapshot",
+    "ParallelReader",
+    "ParallelReadStats",
+    "BoundedReader",
+    "Reading",
+    "BoardProfile",
+    "ProfileStep",
+    "ADCCalibration",
+    "ChannelCalibration",
+    "ComparatorBank",
+    "AttitudeEstimator",
+    "AttitudeFilter",
+    "EstimatorStats",
+    "SensorPublisher",
+    "SensorSubscriber",
     "Screen",
     "Color",
     "FontSize",
+    "TextConsole",
+    "Widget",
+    "Label",
+    "ValueField",
+    "BarGauge",
+    "IndicatorRow",
+    "Page",
+    "PageContainer",
+    "layout_text",
+    "Sparkline",
+    "LEDAnimation",
+    "LEDAnimator",
+    "Sprite",
+    "SpriteCache",
+    "CommandCanvas",
+    "ScreenOp",
+    "replay_commands",
+    "ScreenCompositor",
+    "ScreenRecorder",
+    "ScreenTrace",
+    "TraceReport",
+    "MirrorScreen",
+    "MirrorViewer",
+    "MirrorStats",
+    "SharedCanvas",
+    "IOEdge",
+    "IOEvent",
+    "IOEventDispatcher",
+    "IODebouncer",
     "set_log_level",
+    "set_log_aggregation",
+    "start_log_listener",
+    "stop_log_listener",
+    "RepeatAggregator",
+    "ControlLoop",
+    "LoopStats",
+    "OverrunPolicy",
     "pin_getter_constructor",
     "pin_setter_constructor",
     "multiple_pin_mode_setter_constructor",
     "pin_mode_setter_constructor",
+    "Pin",
+    "PinGroup",
     # typing
     "ADCArrayType",
     "MPUArrayType",
+    "OutBuffer",
     "PinGetter",
     "PinSetter",
     "PinModeSetter",
@@ -47,4 +132,5 @@ __all__ = [
     "mpu_display_on_lcd",
     "make_mpu_table",
     "make_io_table",
+    "TerminalDashboard",
 ]
@@ -0,0 +1,305 @@
+from enum import Enum
+from math import atan2, asin, sqrt, degrees
+from time import perf_counter_ns
+from typing import Self, Sequence, TYPE_CHECKING
+
+from .constant import MPUDataPack
+
+if TYPE_CHECKING:
+    from .sensors import OnBoardSensors
+
+E9 = 1000000000
+
+# the longest gap between two samples that is integrated, longer gaps restart the integration
+MAX_DT_S = 0.5
+
+
+class AttitudeFilter(Enum):
+    """
+    The fusion algorithms supported by the `AttitudeEstimator`
+    """
+
+    COMPLEMENTARY = "complementary"
+    MADGWICK = "madgwick"
+
+
+class EstimatorStats:
+    """
+    The cost of the estimator, and its disagreement with the DMP attitude.
+    """
+
+    __slots__ = (
+        "updates",
+        "total_update_ns",
+        "last_sample_age_ns",
+        "dmp_comparisons",
+        "dmp_yaw_error",
+        "dmp_max_abs_error",
+        "_first_yaw_error",
+        "_first_comparison_ns",
+        "_last_comparison_ns",
+    )
+
+    def __init__(self):
+        self.updates: int = 0
+        self.total_update_ns: int = 0
+        self.last_sample_age_ns: int = 0
+        self.dmp_comparisons: int = 0
+        self.dmp_yaw_error: float = 0.0
+        self.dmp_max_abs_error: float = 0.0
+        self._first_yaw_error: float = 0.0
+        self._first_comparison_ns: int = 0
+        self._last_comparison_ns: int = 0
+
+    @property
+    def mean_update_ns(self) -> float:
+        """
+        the mean cost of an update, in nanoseconds
+        """
+        return self.total_update_ns / self.updates if self.updates else 0.0
+
+    @property
+    def dmp_yaw_drift_deg_s(self) -> float:
+        """
+        how fast the yaw error against the DMP grows, in degrees per second
+        """
+        elapsed = self._last_comparison_ns - self._first_comparison_ns
+        if elapsed <= 0:
+            return 0.0
+        return (self.dmp_yaw_error - self._first_yaw_error) / (elapsed / E9)
+
+
+def _wrap_degrees(angle: float) -> float:
+    return (angle + 180.0) % 360.0 - 180.0
+
+
+class AttitudeEstimator:
+    """
+    Fuses the gyroscope and accelerometer samples into an attitude at the rate of the control loop.
+
+    The DMP attitude of `atti_all()` is updated at the firmware rate, this estimator is updated as often as it is
+    sampled, which gives a fresher yaw for fast turning. The yaw is integrated from the gyroscope only, so it drifts,
+    `compare_with_dmp()` tracks that drift against the DMP output.
+
+    The angles follow `atti_all()`: pitch around axis X, roll around axis Y, yaw around axis Z, in degrees.
+    """
+
+    __slots__ = (
+        "_sensors",
+        "_filter",
+        "_alpha",
+        "_beta",
+        "_q0",
+        "_q1",
+        "_q2",
+        "_q3",
+        "_pitch",
+        "_roll",
+        "_yaw",
+        "_last_timestamp_ns",
+        "_stats",
+    )
+
+    def __init__(
+        self,
+        sensors: "OnBoardSensors | None" = None,
+        algorithm: AttitudeFilter = AttitudeFilter.COMPLEMENTARY,
+        alpha: float = 0.98,
+        beta: float = 0.1,
+    ):
+        """
+        Initializes an instance of the AttitudeEstimator class.
+
+        Args:
+            sensors (OnBoardSensors, optional): The sensors to sample, required by `sample()`. Defaults to None.
+            algorithm (AttitudeFilter): The fusion algorithm. Defaults to AttitudeFilter.COMPLEMENTARY.
+            alpha (float): The weight of the gyroscope in the complementary filter. Defaults to 0.98.
+            beta (float): The gain of the Madgwick filter. Defaults to 0.1.
+
+        Examples:
+            >>> estimator = AttitudeEstimator(sensors, AttitudeFilter.MADGWICK)
+            >>> yaw = estimator.sample().yaw
+        """
+        self._sensors: "OnBoardSensors | None" = sensors
+        self._filter: AttitudeFilter = algorithm
+        self._alpha: float = alpha
+        self._beta: float = beta
+        self._stats: EstimatorStats = EstimatorStats()
+        self.reset()
+
+    def reset(self) -> Self:
+        """
+        Reset the attitude to level and the yaw to zero.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self._q0, self._q1, self._q2, self._q3 = 1.0, 0.0, 0.0, 0.0
+        self._pitch = self._roll = self._yaw = 0.0
+        self._last_timestamp_ns: int | None = None
+        return self
+
+    @property
+    def pitch(self) -> float:
+        """
+        the rotation around axis X, in degrees
+        """
+        return self._pitch
+
+    @property
+    def roll(self) -> float:
+        """
+        the rotation around axis Y, in degrees
+        """
+        return self._roll
+
+    @property
+    def yaw(self) -> float:
+        """
+        the rotation around axis Z, in degrees
+        """
+        return self._yaw
+
+    @property
+    def stats(self) -> EstimatorStats:
+        """
+        the cost and drift statistics of the estimator
+        """
+        return self._stats
+
+    def attitude(self) -> MPUDataPack:
+        """
+        Get the estimated attitude in the layout of `atti_all()`.
+
+        Returns:
+            MPUDataPack: (pitch, roll, yaw) in degrees.
+        """
+        return self._pitch, self._roll, self._yaw
+
+    def update(self, gyro: Sequence[float], acc: Sequence[float], timestamp_ns: int) -> Self:
+        """
+        Fuse a pair of samples.
+
+        Args:
+            gyro (Sequence[float]): The angular velocity in rad/s, as returned by `gyro_si()`.
+            acc (Sequence[float]): The accelerometer reading, in any unit, only its direction is used.
+            timestamp_ns (int): The perf_counter_ns timestamp of the samples.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        started = perf_counter_ns()
+        last = self._last_timestamp_ns
+        self._last_timestamp_ns = timestamp_ns
+        if last is not None and 0 < (dt := (timestamp_ns - last) / E9) <= MAX_DT_S:
+            if self._filter is AttitudeFilter.MADGWICK:
+                self._madgwick(gyro[0], gyro[1], gyro[2], acc[0], acc[1], acc[2], dt)
+            else:
+                self._complementary(gyro[0], gyro[1], gyro[2], acc[0], acc[1], acc[2], dt)
+        stats = self._stats
+        stats.updates += 1
+        finished = perf_counter_ns()
+        stats.total_update_ns += finished - started
+        stats.last_sample_age_ns = finished - timestamp_ns
+        return self
+
+    def sample(self) -> Self:
+        """
+        Read the gyroscope with `gyro_si()` and the accelerometer of the sensors and fuse them.
+
+        Inside a `tick()` block the samples and the timestamp come from the tick snapshot.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        sensors = self._sensors
+        snapshot = sensors.tick_snapshot
+        if snapshot is not None and snapshot.has_mpu:
+            timestamp = snapshot.timestamp_ns
+        else:
+            timestamp = perf_counter_ns()
+        return self.update(sensors.gyro_si(), sensors.acc_all(), timestamp)
+
+    def compare_with_dmp(self, atti: Sequence[float] | None = None) -> Self:
+        """
+        Record the difference between the estimate and the DMP attitude.
+
+        Args:
+            atti (Sequence[float], optional): The DMP attitude, read with `atti_all()` of the sensors if None.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        if atti is None:
+            atti = self._sensors.atti_all()
+        now = perf_counter_ns()
+        stats = self._stats
+        yaw_error = _wrap_degrees(self._yaw - atti[2])
+        max_error = max(
+            abs(_wrap_degrees(self._pitch - atti[0])),
+            abs(_wrap_degrees(self._roll - atti[1])),
+            abs(yaw_error),
+        )
+        if stats.dmp_comparisons == 0:
+            stats._first_yaw_error = yaw_error
+            stats._first_comparison_ns = now
+        stats.dmp_comparisons += 1
+        stats.dmp_yaw_error = yaw_error
+        stats._last_comparison_ns = now
+        if max_error > stats.dmp_max_abs_error:
+            stats.dmp_max_abs_error = max_error
+        return self
+
+    def _complementary(
+        self, gx: float, gy: float, gz: float, ax: float, ay: float, az: float, dt: float
+    ) -> None:
+        alpha = self._alpha
+        pitch = self._pitch + degrees(gx * dt)
+        roll = self._roll + degrees(gy * dt)
+        if ax or ay or az:
+            pitch = alpha * pitch + (1 - alpha) * degrees(atan2(ay, az))
+            roll = alpha * roll + (1 - alpha) * degrees(atan2(-ax, sqrt(ay * ay + az * az)))
+        self._pitch = pitch
+        self._roll = roll
+        self._yaw = _wrap_degrees(self._yaw + degrees(gz * dt))
+
+    def _madgwick(
+        self, gx: float, gy: float, gz: float, ax: float, ay: float, az: float, dt: float
+    ) -> None:
+        q0, q1, q2, q3 = self._q0, self._q1, self._q2, self._q3
+
+        # rate of change of the quaternion from the gyroscope
+        q_dot0 = 0.5 * (-q1 * gx - q2 * gy - q3 * gz)
+        q_dot1 = 0.5 * (q0 * gx + q2 * gz - q3 * gy)
+        q_dot2 = 0.5 * (q0 * gy - q1 * gz + q3 * gx)
+        q_dot3 = 0.5 * (q0 * gz + q1 * gy - q2 * gx)
+
+        if norm := sqrt(ax * ax + ay * ay + az * az):
+            ax, ay, az = ax / norm, ay / norm, az / norm
+            # gradient descent step towards the gravity measured by the accelerometer
+            _2q0, _2q1, _2q2, _2q3 = 2 * q0, 2 * q1, 2 * q2, 2 * q3
+            _4q0, _4q1, _4q2 = 4 * q0, 4 * q1, 4 * q2
+            _8q1, _8q2 = 8 * q1, 8 * q2
+            q0q0, q1q1, q2q2, q3q3 = q0 * q0, q1 * q1, q2 * q2, q3 * q3
+            s0 = _4q0 * q2q2 + _2q2 * ax + _4q0 * q1q1 - _2q1 * ay
+            s1 = _4q1 * q3q3 - _2q3 * ax + 4 * q0q0 * q1 - _2q0 * ay - _4q1 + _8q1 * q1q1 + _8q1 * q2q2 + _4q1 * az
+            s2 = 4 * q0q0 * q2 + _2q0 * ax + _4q2 * q3q3 - _2q3 * ay - _4q2 + _8q2 * q1q1 + _8q2 * q2q2 + _4q2 * az
+            s3 = 4 * q1q1 * q3 - _2q1 * ax + 4 * q2q2 * q3 - _2q2 * ay
+            if s_norm := sqrt(s0 * s0 + s1 * s1 + s2 * s2 + s3 * s3):
+                beta = self._beta / s_norm
+                q_dot0 -= beta * s0
+                q_dot1 -= beta * s1
+                q_dot2 -= beta * s2
+                q_dot3 -= beta * s3
+
+        q0 += q_dot0 * dt
+        q1 += q_dot1 * dt
+        q2 += q_dot2 * dt
+        q3 += q_dot3 * dt
+        norm = sqrt(q0 * q0 + q1 * q1 + q2 * q2 + q3 * q3)
+        q0, q1, q2, q3 = q0 / norm, q1 / norm, q2 / norm, q3 / norm
+        self._q0, self._q1, self._q2, self._q3 = q0, q1, q2, q3
+
+        self._pitch = degrees(atan2(2 * (q0 * q1 + q2 * q3), 1 - 2 * (q1 * q1 + q2 * q2)))
+        self._roll = degrees(asin(max(-1.0, min(1.0, 2 * (q0 * q2 - q3 * q1)))))
+        self._yaw = degrees(atan2(2 * (q0 * q3 + q1 * q2), 1 - 2 * (q2 * q2 + q3 * q3)))
@@ -0,0 +1,39 @@
+from typing import Any, Protocol, Sequence, TypeVar
+
+
+class OutBuffer(Protocol):
+    """
+    A caller-provided buffer the getters fill in place, e.g. a list, an array.array, a numpy array or a ctypes array.
+    """
+
+    def __getitem__(self, index: int) -> Any: ...
+
+    def __setitem__(self, index: int, value: Any) -> None: ...
+
+
+_Out = TypeVar("_Out", bound=OutBuffer)
+
+
+def fill_buffer(out: _Out, source: Sequence, count: int | None = None) -> _Out:
+    """
+    Copy the elements of a source into a buffer in place, converting them to the element type of the buffer.
+
+    The copy goes element by element, which any buffer type supports without knowing it. A typed buffer, i.e. an
+    array.array, a numpy array or a ctypes array, converts the values into its own storage, so a read allocates nothing
+    that outlives it. A list only holds references, so every read stores new int or float objects in it, and the
+    replaced ones are freed.
+
+    Args:
+        out (OutBuffer): The buffer to fill, at least as long as the copied part.
+        source (Sequence): The elements, e.g. a ctypes output buffer of the lib.
+        count (int, optional): The count of elements to copy, all of them if None. Defaults to None.
+
+    Returns:
+        OutBuffer: The filled buffer.
+
+    Examples:
+        >>> fill_buffer(array("H", bytes(20)), sensors_buffer)
+    """
+    for index in range(len(source) if count is None else count):
+        out[index] = source[index]
+    return out
@@ -0,0 +1,214 @@
+import json
+import tomllib
+from bisect import bisect_right
+from operator import getitem
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Self, Sequence, Tuple, TypeAlias
+
+ADC_CHANNELS = 10
+POWER_CHANNEL = 9
+
+CalibratedADCDataPack: TypeAlias = Tuple[float, float, float, float, float, float, float, float, float, float]
+
+
+class ChannelCalibration:
+    """
+    The conversion from the raw counts of an ADC channel to a physical unit.
+
+    Exactly one of the forms is used:
+        points: measured (raw, value) pairs, linearly interpolated in between and clamped outside
+        polynomial: coefficients from the constant term up, value = c0 + c1 * raw + c2 * raw ** 2 ...
+        scale/offset: value = raw * scale + offset
+    """
+
+    def __init__(
+        self,
+        points: Sequence[Sequence[float]] | None = None,
+        polynomial: Sequence[float] | None = None,
+        scale: float = 1.0,
+        offset: float = 0.0,
+    ):
+        """
+        Args:
+            points: the measured (raw, value) pairs, at least two
+            polynomial: the coefficients from the constant term up
+            scale: the factor of the linear form
+            offset: the offset of the linear form
+        """
+        if points is not None and polynomial is not None:
+            raise ValueError("Only one of points and polynomial can be given")
+        if points is not None:
+            if len(points) < 2:
+                raise ValueError("At least two calibration points are required")
+            points = sorted((float(raw), float(value)) for raw, value in points)
+        self._points: List[Tuple[float, float]] | None = points
+        self._polynomial: Tuple[float, ...] | None = tuple(polynomial) if polynomial is not None else None
+        self._scale: float = scale
+        self._offset: float = offset
+
+    @classmethod
+    def from_dict(cls, profile: Mapping[str, Any]) -> Self:
+        """
+        Create a calibration from a dict, e.g. a channel entry of a calibration file.
+
+        Args:
+            profile: the dict with the keys "points", "polynomial", or "scale" and "offset"
+        """
+        return cls(
+            points=profile.get("points"),
+            polynomial=profile.get("polynomial"),
+            scale=profile.get("scale", 1.0),
+            offset=profile.get("offset", 0.0),
+        )
+
+    def evaluate(self, raw: float) -> float:
+        """
+        Convert a single raw count, used to build the lookup table.
+
+        Args:
+            raw: the raw count
+
+        Returns:
+            the converted value
+        """
+        if (points := self._points) is not None:
+            if raw <= points[0][0]:
+                return points[0][1]
+            if raw >= points[-1][0]:
+                return points[-1][1]
+            i = bisect_right(points, (raw, float("inf")))
+            (x0, y0), (x1, y1) = points[i - 1], points[i]
+            return y0 + (y1 - y0) * (raw - x0) / (x1 - x0)
+        if (polynomial := self._polynomial) is not None:
+            value = 0.0
+            for coefficient in reversed(polynomial):
+                value = value * raw + coefficient
+            return value
+        return raw * self._scale + self._offset
+
+    def compile(self, resolution: int) -> List[float]:
+        """
+        Evaluate every raw count of the ADC range into a dense lookup table.
+
+        Args:
+            resolution: the count of the raw values, e.g. 4096 for a 12-bit ADC
+
+        Returns:
+            the lookup table, indexed by the raw count
+        """
+        evaluate = self.evaluate
+        return [evaluate(raw) for raw in range(resolution)]
+
+
+class ADCCalibration:
+    """
+    The calibration of all the 10 ADC channels, precompiled into dense lookup tables.
+
+    Converting a frame is a single table lookup per channel, done in one `map` pass over the frame.
+    Channels without a profile are passed through as floats.
+    """
+
+    def __init__(
+        self,
+        channels: Mapping[int, ChannelCalibration] | None = None,
+        resolution_bits: int = 12,
+    ):
+        """
+        Initializes an instance of the ADCCalibration class, builds the lookup tables.
+
+        Args:
+            channels (Mapping[int, ChannelCalibration], optional): The calibration of each channel, by channel index.
+                Defaults to None, which passes all the channels through.
+            resolution_bits (int): The bit width of the ADC, raw counts above the range are clamped. Defaults to 12.
+
+        Examples:
+            >>> calibration = ADCCalibration({9: ChannelCalibration(scale=3.3 / 4095 * 11)})
+        """
+        channels = dict(channels or {})
+        if any(not 0 <= index < ADC_CHANNELS for index in channels):
+            raise ValueError(f"ADC channel index must be between 0 and {ADC_CHANNELS - 1}")
+        self._channels: Dict[int, ChannelCalibration] = channels
+        self._resolution: int = 1 << resolution_bits
+        identity = [float(raw) for raw in range(self._resolution)]
+        self._luts: Tuple[List[float], ...] = tuple(
+            channels[index].compile(self._resolution) if index in channels else identity
+            for index in range(ADC_CHANNELS)
+        )
+
+    @property
+    def resolution(self) -> int:
+        """
+        the count of the raw values each lookup table covers
+        """
+        return self._resolution
+
+    @property
+    def luts(self) -> Tuple[List[float], ...]:
+        """
+        the lookup table of each channel, indexed by the raw count
+        """
+        return self._luts
+
+    @classmethod
+    def from_dict(cls, profile: Mapping[str, Any]) -> Self:
+        """
+        Create a calibration from a dict.
+
+        Args:
+            profile: {"resolution_bits": 12, "channels": {"9": {"scale": 0.0089}, "0": {"points": [[300, 80], ...]}}}
+        """
+        return cls(
+            {int(index): ChannelCalibration.from_dict(channel) for index, channel in profile.get("channels", {}).items()},
+            profile.get("resolution_bits", 12),
+        )
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> Self:
+        """
+        Load a calibration from a .json or a .toml file, in the layout of `from_dict`.
+
+        Args:
+            path: the path of the file
+        """
+        path = Path(path)
+        if path.suffix == ".toml":
+            with path.open("rb") as f:
+                return cls.from_dict(tomllib.load(f))
+        with path.open("r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def convert(self, frame: Sequence[int], out: Any = None) -> CalibratedADCDataPack | Any:
+        """
+        Convert a whole raw ADC frame.
+
+        Args:
+            frame: the raw frame, e.g. the return of `OnBoardSensors.adc_all_channels()`
+            out: a buffer of floats with at least 10 elements to fill in place instead of returning a new tuple
+
+        Returns:
+            the converted values of all the channels, out if given
+        """
+        if out is not None:
+            luts, top = self._luts, self._resolution - 1
+            for index in range(ADC_CHANNELS):
+                raw = frame[index]
+                out[index] = luts[index][raw if raw < top else top]
+            return out
+        try:
+            return tuple(map(getitem, self._luts, frame))  # type: ignore
+        except IndexError:
+            top = self._resolution - 1
+            return tuple(lut[raw if raw < top else top] for lut, raw in zip(self._luts, frame))  # type: ignore
+
+    def convert_channel(self, index: int, raw: int) -> float:
+        """
+        Convert a single raw count of a channel.
+
+        Args:
+            index: the index of the channel
+            raw: the raw count
+
+        Returns:
+            the converted value
+        """
+        return self._luts[index][min(raw, self._resolution - 1)]
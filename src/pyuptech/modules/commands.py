@@ -0,0 +1,271 @@
+from enum import IntEnum
+from struct import Struct
+from typing import Any, Dict, Iterator, Self, Tuple
+
+from .screen import Color, FontSize
+from .sprite import Sprite
+
+
+class ScreenOp(IntEnum):
+    """
+    The opcodes of the drawing calls of `Screen` in a binary command stream
+    """
+
+    FILL_SCREEN = 1
+    PUT_STRING = 2
+    FILL_FRAME = 3
+    FILL_ROUND_FRAME = 4
+    FILL_CIRCLE = 5
+    DRAW_MESH = 6
+    DRAW_FRAME = 7
+    DRAW_ROUND_FRAME = 8
+    DRAW_PIXEL = 9
+    DRAW_CIRCLE = 10
+    DRAW_ARC = 11
+    DRAW_LINE = 12
+    SET_FONT_SIZE = 13
+    SET_FORE_COLOR = 14
+    SET_BACK_COLOR = 15
+    REFRESH = 16
+
+
+# opcode => (the method of Screen, the layout of the arguments)
+# coordinates are signed 16-bit, colors are 24-bit rgb stored in 32 bits
+COMMAND_LAYOUTS: Dict[ScreenOp, Tuple[str, Struct]] = {
+    ScreenOp.FILL_SCREEN: ("fill_screen", Struct("<I")),
+    ScreenOp.PUT_STRING: ("put_string", Struct("<hhH")),
+    ScreenOp.FILL_FRAME: ("fill_frame", Struct("<hhhhI")),
+    ScreenOp.FILL_ROUND_FRAME: ("fill_round_frame", Struct("<hhhhhI")),
+    ScreenOp.FILL_CIRCLE: ("fill_circle", Struct("<hhhI")),
+    ScreenOp.DRAW_MESH: ("draw_mesh", Struct("<hhhhI")),
+    ScreenOp.DRAW_FRAME: ("draw_frame", Struct("<hhhhI")),
+    ScreenOp.DRAW_ROUND_FRAME: ("draw_round_frame", Struct("<hhhhhI")),
+    ScreenOp.DRAW_PIXEL: ("draw_pixel", Struct("<hhI")),
+    ScreenOp.DRAW_CIRCLE: ("draw_circle", Struct("<hhhI")),
+    ScreenOp.DRAW_ARC: ("draw_arc", Struct("<hhhhI")),
+    ScreenOp.DRAW_LINE: ("draw_line", Struct("<hhhhI")),
+    ScreenOp.SET_FONT_SIZE: ("set_font_size", Struct("<B")),
+    ScreenOp.SET_FORE_COLOR: ("set_fore_color", Struct("<I")),
+    ScreenOp.SET_BACK_COLOR: ("set_back_color", Struct("<I")),
+    ScreenOp.REFRESH: ("refresh", Struct("<")),
+}
+
+OPCODES_BY_METHOD: Dict[str, ScreenOp] = {
+    method: op for op, (method, _) in COMMAND_LAYOUTS.items()
+}
+
+
+def encode_command(op: ScreenOp, *args: Any) -> bytes:
+    """
+    Encode a single drawing call.
+
+    Args:
+        op (ScreenOp): The opcode of the call.
+        *args (Any): The arguments of the call, in the order of the `Screen` method.
+
+    Returns:
+        bytes: The encoded call, the opcode byte followed by the packed arguments.
+    """
+    method, layout = COMMAND_LAYOUTS[op]
+    if op is ScreenOp.PUT_STRING:
+        x, y, display_string = args
+        text = display_string.encode()
+        return bytes((op,)) + layout.pack(x, y, len(text)) + text
+    if op is ScreenOp.SET_FONT_SIZE:
+        return bytes((op,)) + layout.pack(args[0].value)
+    return bytes((op,)) + layout.pack(*args)
+
+
+def decode_command(payload: bytes | bytearray | memoryview, offset: int = 0) -> Tuple[ScreenOp, Tuple, int]:
+    """
+    Decode the single call encoded by `encode_command` at an offset of a buffer.
+
+    Args:
+        payload (bytes): The buffer.
+        offset (int): The offset of the call. Defaults to 0.
+
+    Returns:
+        Tuple[ScreenOp, Tuple, int]: The opcode, the arguments, and the offset right after the call.
+    """
+    op = ScreenOp(payload[offset])
+    offset += 1
+    layout = COMMAND_LAYOUTS[op][1]
+    args = layout.unpack_from(payload, offset)
+    offset += layout.size
+    if op is ScreenOp.PUT_STRING:
+        x, y, length = args
+        args = (x, y, bytes(payload[offset : offset + length]).decode())
+        offset += length
+    elif op is ScreenOp.SET_FONT_SIZE:
+        args = (FontSize(args[0]),)
+    return op, args, offset
+
+
+def decode_commands(payload: bytes | bytearray | memoryview) -> Iterator[Tuple[ScreenOp, Tuple]]:
+    """
+    Decode a command stream encoded by `encode_command`.
+
+    Args:
+        payload (bytes): The command stream.
+
+    Yields:
+        Tuple[ScreenOp, Tuple]: The opcode and the arguments of each call, ready to be applied to the `Screen` method.
+    """
+    offset = 0
+    end = len(payload)
+    while offset < end:
+        op, args, offset = decode_command(payload, offset)
+        yield op, args
+
+
+def replay_commands(payload: bytes | bytearray | memoryview, target: Any) -> int:
+    """
+    Apply a command stream to a `Screen`, or any object that has the same drawing methods.
+
+    Args:
+        payload (bytes): The command stream.
+        target (Any): The object to draw on, e.g. a `Screen`.
+
+    Returns:
+        int: The count of the calls applied.
+    """
+    count = 0
+    for op, args in decode_commands(payload):
+        getattr(target, COMMAND_LAYOUTS[op][0])(*args)
+        count += 1
+    return count
+
+
+class CommandCanvas:
+    """
+    Records the drawing calls of the `Screen` API into a binary command stream instead of drawing them.
+
+    The stream can be replayed onto a real `Screen` later, or in another process.
+    """
+
+    def __init__(self):
+        self._commands: bytearray = bytearray()
+
+    @property
+    def commands(self) -> bytes:
+        """
+        the command stream recorded so far
+        """
+        return bytes(self._commands)
+
+    def clear(self) -> Self:
+        """
+        Drop all the recorded calls.
+        """
+        self._commands.clear()
+        return self
+
+    def _record(self, op: ScreenOp, *args: Any) -> Self:
+        self._commands += encode_command(op, *args)
+        return self
+
+    def refresh(self) -> Self:
+        """
+        Record `Screen.refresh`.
+        """
+        return self._record(ScreenOp.REFRESH)
+
+    def set_font_size(self, font_size: FontSize) -> Self:
+        """
+        Record `Screen.set_font_size`.
+        """
+        return self._record(ScreenOp.SET_FONT_SIZE, font_size)
+
+    def set_fore_color(self, color: Color | int) -> Self:
+        """
+        Record `Screen.set_fore_color`.
+        """
+        return self._record(ScreenOp.SET_FORE_COLOR, color)
+
+    def set_back_color(self, color: Color | int) -> Self:
+        """
+        Record `Screen.set_back_color`.
+        """
+        return self._record(ScreenOp.SET_BACK_COLOR, color)
+
+    def fill_screen(self, color: Color | int) -> Self:
+        """
+        Record `Screen.fill_screen`.
+        """
+        return self._record(ScreenOp.FILL_SCREEN, color)
+
+    def put_string(self, x: int, y: int, display_string: str) -> Self:
+        """
+        Record `Screen.put_string`.
+        """
+        return self._record(ScreenOp.PUT_STRING, x, y, display_string)
+
+    def fill_frame(self, x1: int, y1: int, x2: int, y2: int, color: Color | int) -> Self:
+        """
+        Record `Screen.fill_frame`.
+        """
+        return self._record(ScreenOp.FILL_FRAME, x1, y1, x2, y2, color)
+
+    def fill_round_frame(
+        self, x1: int, y1: int, x2: int, y2: int, r: int, color: Color | int
+    ) -> Self:
+        """
+        Record `Screen.fill_round_frame`.
+        """
+        return self._record(ScreenOp.FILL_ROUND_FRAME, x1, y1, x2, y2, r, color)
+
+    def fill_circle(self, x0: int, y0: int, r: int, color: Color | int) -> Self:
+        """
+        Record `Screen.fill_circle`.
+        """
+        return self._record(ScreenOp.FILL_CIRCLE, x0, y0, r, color)
+
+    def draw_mesh(self, x1: int, y1: int, x2: int, y2: int, color: Color | int) -> Self:
+        """
+        Record `Screen.draw_mesh`.
+        """
+        return self._record(ScreenOp.DRAW_MESH, x1, y1, x2, y2, color)
+
+    def draw_frame(self, x1: int, y1: int, x2: int, y2: int, color: Color | int) -> Self:
+        """
+        Record `Screen.draw_frame`.
+        """
+        return self._record(ScreenOp.DRAW_FRAME, x1, y1, x2, y2, color)
+
+    def draw_round_frame(
+        self, x1: int, y1: int, x2: int, y2: int, r: int, color: Color | int
+    ) -> Self:
+        """
+        Record `Screen.draw_round_frame`.
+        """
+        return self._record(ScreenOp.DRAW_ROUND_FRAME, x1, y1, x2, y2, r, color)
+
+    def draw_pixel(self, x0: int, y0: int, color: Color | int) -> Self:
+        """
+        Record `Screen.draw_pixel`.
+        """
+        return self._record(ScreenOp.DRAW_PIXEL, x0, y0, color)
+
+    def draw_circle(self, x0: int, y0: int, r: int, color: Color | int) -> Self:
+        """
+        Record `Screen.draw_circle`.
+        """
+        return self._record(ScreenOp.DRAW_CIRCLE, x0, y0, r, color)
+
+    def draw_arc(self, x0: int, y0: int, r: int, s: int, color: Color | int) -> Self:
+        """
+        Record `Screen.draw_arc`.
+        """
+        return self._record(ScreenOp.DRAW_ARC, x0, y0, r, s, color)
+
+    def draw_line(self, x1: int, y1: int, x2: int, y2: int, color: Color | int) -> Self:
+        """
+        Record `Screen.draw_line`.
+        """
+        return self._record(ScreenOp.DRAW_LINE, x1, y1, x2, y2, color)
+
+    def blit(self, sprite: Sprite, x: int, y: int) -> Self:
+        """
+        Record `Screen.blit` as the drawing calls of the sprite.
+        """
+        return sprite.draw(self, x, y)
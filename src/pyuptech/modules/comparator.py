@@ -0,0 +1,153 @@
+from operator import ge, le, mul
+from time import perf_counter_ns
+from typing import Callable, List, Mapping, Self, Sequence, Tuple, TypeAlias
+
+ADC_CHANNELS = 10
+ADC_FULL_MASK = (1 << ADC_CHANNELS) - 1
+IO_CHANNELS = 8
+
+FrameGetter: TypeAlias = Callable[[], Sequence[int]]
+MaskChangeCallback: TypeAlias = Callable[[int, int, int], None]
+
+# the weight of each channel bit, summing the weighted comparisons packs them into a mask
+_WEIGHTS: Tuple[int, ...] = tuple(1 << index for index in range(ADC_CHANNELS))
+
+# thresholds that a channel without a profile never crosses
+_NEVER_HIGH = 1 << 32
+_NEVER_LOW = -1
+
+
+class ComparatorBank:
+    """
+    Thresholds all the ADC channels with hysteresis and packs the results into a bitmask.
+
+    A channel bit is set once the raw value reaches its high threshold, and cleared once it falls to its low
+    threshold, in between the bit keeps its state. Each frame is compared in one `map` pass per threshold side.
+    """
+
+    def __init__(
+        self,
+        thresholds: Mapping[int, Tuple[int, int]],
+        frame_getter: FrameGetter | None = None,
+        inverted: int = 0,
+    ):
+        """
+        Initializes an instance of the ComparatorBank class.
+
+        Args:
+            thresholds (Mapping[int, Tuple[int, int]]): The (low, high) thresholds by ADC channel index, the channels
+                not listed always read 0.
+            frame_getter (FrameGetter, optional): The function that returns the raw ADC frame, required by `sample()`.
+                Defaults to None.
+            inverted (int): The mask of the channels that are active low, their bits are set below the low threshold
+                and cleared above the high one instead, each of them must have thresholds. Defaults to 0.
+
+        Examples:
+            >>> bank = ComparatorBank({0: (1800, 2200), 1: (1800, 2200)}, sensors.adc_all_channels)
+        """
+        # an inverted channel without thresholds would always read 1
+        if unset := inverted & ADC_FULL_MASK & ~sum(1 << index for index in thresholds):
+            channels = [index for index in range(ADC_CHANNELS) if unset >> index & 1]
+            raise ValueError(f"Inverted ADC channels {channels} have no thresholds")
+        self._frame_getter: FrameGetter | None = frame_getter
+        self._lows: List[int] = [_NEVER_LOW] * ADC_CHANNELS
+        self._highs: List[int] = [_NEVER_HIGH] * ADC_CHANNELS
+        self._inverted: int = inverted & ADC_FULL_MASK
+        self._state: int = 0
+        self._callbacks: List[MaskChangeCallback] = []
+        for index, (low, high) in thresholds.items():
+            self.set_threshold(index, low, high)
+
+    @property
+    def mask(self) -> int:
+        """
+        the packed comparison result of the latest frame, bit i for ADC channel i
+        """
+        return self._state ^ self._inverted
+
+    @property
+    def thresholds(self) -> List[Tuple[int, int] | None]:
+        """
+        the (low, high) thresholds of each channel, None for the channels without thresholds
+        """
+        return [
+            None if high == _NEVER_HIGH else (low, high)
+            for low, high in zip(self._lows, self._highs)
+        ]
+
+    def set_threshold(self, index: int, low: int, high: int) -> Self:
+        """
+        Set the thresholds of a channel.
+
+        Args:
+            index (int): The index of the ADC channel.
+            low (int): The raw value at or below which the bit is cleared.
+            high (int): The raw value at or above which the bit is set.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        if not 0 <= index < ADC_CHANNELS:
+            raise ValueError(f"ADC channel index must be between 0 and {ADC_CHANNELS - 1}, got {index}")
+        if low >= high:
+            raise ValueError(f"Low threshold must be below the high one, got {low} and {high}")
+        self._lows[index] = low
+        self._highs[index] = high
+        return self
+
+    def on_change(self, callback: MaskChangeCallback) -> Self:
+        """
+        Register a callback that is called whenever the mask flips.
+
+        Args:
+            callback (MaskChangeCallback): Called with the new mask, the mask of the flipped bits and the timestamp
+                in nanoseconds.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self._callbacks.append(callback)
+        return self
+
+    def update(self, frame: Sequence[int]) -> int:
+        """
+        Compare a raw ADC frame and return the mask.
+
+        Args:
+            frame (Sequence[int]): The raw frame, e.g. the return of `OnBoardSensors.adc_all_channels()`.
+
+        Returns:
+            int: The packed comparison result, bit i for ADC channel i.
+        """
+        above = sum(map(mul, map(ge, frame, self._highs), _WEIGHTS))
+        below = sum(map(mul, map(le, frame, self._lows), _WEIGHTS))
+        state = (self._state | above) & ~below
+        if changed := state ^ self._state:
+            self._state = state
+            if self._callbacks:
+                timestamp = perf_counter_ns()
+                mask = state ^ self._inverted
+                for callback in self._callbacks:
+                    callback(mask, changed, timestamp)
+        return state ^ self._inverted
+
+    def sample(self) -> int:
+        """
+        Read the raw ADC frame with the frame getter, and return the mask.
+
+        Returns:
+            int: The packed comparison result, bit i for ADC channel i.
+        """
+        return self.update(self._frame_getter())
+
+    def combine_with_io(self, io_mask: int) -> int:
+        """
+        Merge the mask with an io mask into a single int.
+
+        Args:
+            io_mask (int): The io mask, e.g. the return of `OnBoardSensors.io_all_channels()`.
+
+        Returns:
+            int: Bits 0~7 for io0~io7, bits 8~17 for ADC channel 0~9.
+        """
+        return io_mask | ((self._state ^ self._inverted) << IO_CHANNELS)
@@ -0,0 +1,181 @@
+from collections import deque
+from typing import Any, Deque, List, Self
+
+from .screen import Color, FontSize, ScreenDirection
+from .text import layout_text
+
+
+class TextConsole:
+    """
+    A scrolling text console inside a rectangle of the screen.
+
+    The console keeps a shadow of the text shown on each row. After a write, a row is only redrawn from its first
+    changed character, and the tail left by a shorter line is cleared with a single fill. The glyphs of uGUI are drawn
+    with their background, so overwriting a row needs no clearing. A line that scrolls by one row is still redrawn,
+    the lib has no call to move pixels.
+    """
+
+    def __init__(
+        self,
+        screen: Any,
+        x: int = 0,
+        y: int = 0,
+        width: int | None = None,
+        height: int | None = None,
+        font_size: FontSize = FontSize.FONT_6X8,
+        fore_color: Color | int = Color.WHITE,
+        back_color: Color | int = Color.BLACK,
+    ):
+        """
+        Initializes an instance of the TextConsole class.
+
+        Args:
+            screen (Any): The `Screen`, or any object with the same drawing methods, e.g. a `CommandCanvas`.
+            x (int): The X coordinate of the top-left corner. Defaults to 0.
+            y (int): The Y coordinate of the top-left corner. Defaults to 0.
+            width (int, optional): The width in pixels, up to the right edge of the screen if None. Defaults to None.
+            height (int, optional): The height in pixels, up to the bottom of the screen if None. Defaults to None.
+            font_size (FontSize): The font of the console. Defaults to FontSize.FONT_6X8.
+            fore_color (Color | int): The color of the text. Defaults to Color.WHITE.
+            back_color (Color | int): The color of the background. Defaults to Color.BLACK.
+
+        Examples:
+            >>> console = TextConsole(screen, y=16)
+            >>> console.print("adc0:", sensors.adc_all_channels()[0])
+            >>> screen.refresh()
+        """
+        direction = getattr(screen, "direction", None) or ScreenDirection.HORIZONTAL
+        width = direction.width - x if width is None else width
+        height = direction.height - y if height is None else height
+        self._screen: Any = screen
+        self._x: int = x
+        self._y: int = y
+        self._font_size: FontSize = font_size
+        self._fore_color: int = fore_color
+        self._back_color: int = back_color
+        self._column_width: int = font_size.column_width
+        self._row_height: int = font_size.row_height
+        self._columns: int = width // self._column_width
+        self._rows: int = height // self._row_height
+        if self._columns < 1 or self._rows < 1:
+            raise ValueError(f"A {width}x{height} console cannot fit a single {font_size.name} character")
+        self._lines: Deque[str] = deque([""], maxlen=self._rows)
+        # the raw text of the open line and the count of rows it is wrapped into, the wrapping drops the spaces at
+        # the end of a row, so the line is wrapped again from its raw text when a write continues it
+        self._open: str = ""
+        self._open_rows: int = 1
+        self._shown: List[str] = [""] * self._rows
+        self.rows_drawn: int = 0
+
+    @property
+    def columns(self) -> int:
+        """
+        the count of characters per row
+        """
+        return self._columns
+
+    @property
+    def rows(self) -> int:
+        """
+        the count of rows
+        """
+        return self._rows
+
+    @property
+    def lines(self) -> List[str]:
+        """
+        the text of each row, the last one being the line being written
+        """
+        return list(self._lines)
+
+    def write(self, text: str) -> Self:
+        """
+        Append a text, "\\n" starts a new line, and redraw the rows that changed.
+
+        Args:
+            text (str): The text to append.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        lines = self._lines
+        paragraphs = text.split("\n")
+        # the first paragraph continues the open line
+        paragraphs[0] = self._open + paragraphs[0]
+        for _ in range(min(self._open_rows, len(lines))):
+            lines.pop()
+        for paragraph in paragraphs:
+            wrapped = layout_text(paragraph, self._columns)
+            lines.extend(wrapped)
+        self._open = paragraphs[-1]
+        self._open_rows = len(wrapped)
+        return self.render()
+
+    def print(self, *values: Any, sep: str = " ") -> Self:
+        """
+        Append the values as a line, like the builtin print.
+
+        Args:
+            *values (Any): The values to print.
+            sep (str): The separator between the values. Defaults to " ".
+
+        Returns:
+            Self: The instance of the class.
+        """
+        return self.write(sep.join(map(str, values)) + "\n")
+
+    def clear(self) -> Self:
+        """
+        Erase all the rows.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self._lines.clear()
+        self._lines.append("")
+        self._open = ""
+        self._open_rows = 1
+        return self.render()
+
+    def render(self) -> Self:
+        """
+        Redraw the rows whose text differs from what is shown, the writes call it already.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        screen = self._screen
+        shown = self._shown
+        lines = self._lines
+        column_width, row_height = self._column_width, self._row_height
+        styled = False
+        for row in range(self._rows):
+            new = lines[row] if row < len(lines) else ""
+            if (old := shown[row]) == new:
+                continue
+            if not styled:
+                screen.set_font_size(self._font_size).set_fore_color(self._fore_color).set_back_color(self._back_color)
+                styled = True
+            y = self._y + row * row_height
+            start = _common_prefix(old, new)
+            if start < len(new):
+                screen.put_string(self._x + start * column_width, y, new[start:])
+            if len(new) < len(old):
+                screen.fill_frame(
+                    self._x + len(new) * column_width,
+                    y,
+                    self._x + len(old) * column_width - 1,
+                    y + row_height - 1,
+                    self._back_color,
+                )
+            shown[row] = new
+            self.rows_drawn += 1
+        return self
+
+
+def _common_prefix(old: str, new: str) -> int:
+    length = min(len(old), len(new))
+    index = 0
+    while index < length and old[index] == new[index]:
+        index += 1
+    return index
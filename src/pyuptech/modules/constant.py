@@ -1,5 +1,8 @@
 from pathlib import Path
-from typing import TypeAlias, Literal
+from typing import TypeAlias, Literal, Tuple
 
 LIB_FILE_PATH: str = (Path(__file__).parent.parent / "lib/libuptech.so").as_posix()
 BinaryIO: TypeAlias = Literal[0, 1] | int
+
+ADCDataPack: TypeAlias = Tuple[int, int, int, int, int, int, int, int, int, int]
+MPUDataPack: TypeAlias = Tuple[float, float, float]
@@ -0,0 +1,145 @@
+from typing import Callable, List, Self, Sequence, TypeAlias
+
+MaskGetter: TypeAlias = Callable[[], int]
+
+IO_CHANNELS = 8
+IO_FULL_MASK = (1 << IO_CHANNELS) - 1
+
+
+class IODebouncer:
+    """
+    Debounces all the 8 io inputs at once with bit-sliced vertical counters.
+
+    Every pin owns a counter of how many consecutive samples disagreed with its debounced level, the counters are
+    stored "vertically", one int per counter bit, so that all the pins are counted by the same few integer ops.
+    A pin flips its debounced level once its counter reaches its own stability window.
+    """
+
+    def __init__(
+        self,
+        mask_getter: MaskGetter | None = None,
+        windows: int | Sequence[int] = 4,
+        initial_mask: int = 0,
+    ):
+        """
+        Initializes an instance of the IODebouncer class.
+
+        Args:
+            mask_getter (MaskGetter, optional): The function that returns the raw io mask, required by `sample()`.
+                Defaults to None.
+            windows (int | Sequence[int]): The count of consecutive samples a change must hold before it is accepted,
+                a single int for all the pins, or one for each pin, index 0 for io0. Defaults to 4.
+            initial_mask (int): The debounced mask before any sample is taken. Defaults to 0.
+
+        Examples:
+            >>> debouncer = IODebouncer(sensors.io_all_channels, windows=[4, 4, 8, 8, 1, 1, 1, 1])
+        """
+        self._mask_getter: MaskGetter | None = mask_getter
+        self._state: int = initial_mask & IO_FULL_MASK
+        self._windows: List[int] = []
+        self._window_slices: List[int] = []
+        self._counter_slices: List[int] = []
+        self.set_windows(windows)
+
+    @property
+    def windows(self) -> List[int]:
+        """
+        the stability window of each pin, in samples
+        """
+        return list(self._windows)
+
+    @property
+    def mask(self) -> int:
+        """
+        the debounced io mask of the latest sample, each bit represents a channel, 1 for high, 0 for low
+        """
+        return self._state
+
+    def set_windows(self, windows: int | Sequence[int]) -> Self:
+        """
+        Set the stability windows, the pending counts of all the pins will be reset.
+
+        Args:
+            windows (int | Sequence[int]): A single window for all the pins, or one for each pin.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        if isinstance(windows, int):
+            windows = [windows] * IO_CHANNELS
+        if len(windows) != IO_CHANNELS:
+            raise ValueError(f"Expected {IO_CHANNELS} windows, got {len(windows)}")
+        if any(w < 1 for w in windows):
+            raise ValueError("Debounce window must be at least 1 sample")
+
+        slice_count = max(windows).bit_length()
+        self._windows = list(windows)
+        self._window_slices = [
+            sum(((w >> j) & 1) << pin for pin, w in enumerate(windows))
+            for j in range(slice_count)
+        ]
+        self._counter_slices = [0] * slice_count
+        return self
+
+    def reset(self, mask: int | None = None) -> Self:
+        """
+        Drop all the pending counts, and optionally force the debounced mask.
+
+        Args:
+            mask (int, optional): The debounced mask to set. Defaults to None, keeping the current one.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        if mask is not None:
+            self._state = mask & IO_FULL_MASK
+        self._counter_slices = [0] * len(self._window_slices)
+        return self
+
+    def update(self, raw_mask: int) -> int:
+        """
+        Feed a raw io mask and return the debounced one.
+
+        Args:
+            raw_mask (int): The raw io mask, e.g. the return of `OnBoardSensors.io_all_channels()`.
+
+        Returns:
+            int: The debounced io mask.
+        """
+        delta = (raw_mask ^ self._state) & IO_FULL_MASK
+        counters = self._counter_slices
+        if not delta and not any(counters):
+            return self._state
+
+        # increase the counters of the disagreeing pins by one, and clear the agreeing ones
+        carry = delta
+        reached = delta
+        for j, window_bits in enumerate(self._window_slices):
+            bits = counters[j] & delta
+            counters[j] = bits ^ carry
+            carry &= bits
+            reached &= ~(counters[j] ^ window_bits)
+
+        if reached:
+            self._state ^= reached
+            for j in range(len(counters)):
+                counters[j] &= ~reached
+        return self._state
+
+    def sample(self) -> int:
+        """
+        Read the raw io mask with the mask getter, and return the debounced one.
+
+        Returns:
+            int: The debounced io mask.
+        """
+        return self.update(self._mask_getter())
+
+    def io_all_channels(self) -> int:
+        """
+        Same as `sample()`, so that the debouncer can be used wherever an io mask getter is expected.
+
+        Examples:
+            >>> dispatcher = IOEventDispatcher(debouncer.io_all_channels)
+        """
+        return self.update(self._mask_getter())
@@ -2,8 +2,9 @@ import ctypes
 from random import randint
 from typing import Self, Literal, Any
 
+from .buffers import OutBuffer, fill_buffer
 from .constant import BinaryIO
-from .sensors import OnBoardSensors, MPUDataPack, ADCDataPack
+from .sensors import OnBoardSensors, MPUDataPack, ADCDataPack, DEFAULT_GYRO_FSR, DEFAULT_ACC_FSR
 
 
 class SensorEmulator(OnBoardSensors):
@@ -12,9 +13,13 @@ class SensorEmulator(OnBoardSensors):
     io_rand_range = (0, 2**8 - 1)
 
     def adc_io_open(self) -> Self:
+        self._adc_io_opened = True
+        self._io_levels = None
         return self
 
     def adc_io_close(self) -> Self:
+        self._adc_io_opened = False
+        self._io_levels = None
         return self
 
     def set_io_mode(self, index: int, mode: BinaryIO) -> Self:
@@ -24,39 +29,71 @@ class SensorEmulator(OnBoardSensors):
         return self
 
     def set_all_io_levels(self, levels: BinaryIO) -> Self:
+        self._io_levels = levels & 0xFF
         return self
 
-    @staticmethod
-    def io_all_channels() -> int:
-        return ctypes.c_uint8(randint(*SensorEmulator.io_rand_range)).value
+    def flip_io_level(self, index: int) -> Self:
+        if self._io_levels is not None:
+            self._io_levels ^= 1 << index
+        return self
 
-    def adc_all_channels(self) -> ADCDataPack:
+    def io_all_channels(self) -> int:
+        if (snapshot := self._tick_state.snapshot) is not None:
+            return snapshot.io
+        return ctypes.c_uint8(randint(*SensorEmulator.io_rand_range)).value
 
+    def adc_all_channels(self, out: OutBuffer | None = None) -> ADCDataPack | OutBuffer:
+        if (snapshot := self._tick_state.snapshot) is not None:
+            return snapshot.adc_all_channels(out)
         for i in range(10):
             self._adc_all[i] = randint(*self.adc_rand_range)
-
+        if out is not None:
+            return fill_buffer(out, self._adc_all)
         return tuple(self._adc_all)  # type: ignore
 
     def MPU6500_Open(self) -> Self:
+        self._mpu_opened = True
+        return self._cache_gyro_fsr(DEFAULT_GYRO_FSR)._cache_acc_fsr(DEFAULT_ACC_FSR)
+
+    def mpu_set_gyro_fsr(self, fsr: int) -> Self:
+        return self._cache_gyro_fsr(fsr)
+
+    def mpu_set_accel_fsr(self, fsr: int) -> Self:
+        return self._cache_acc_fsr(fsr)
+
+    def sync_mpu_fsr(self) -> Self:
         return self
 
-    def acc_all(self) -> MPUDataPack:
+    def acc_all(self, out: OutBuffer | None = None) -> MPUDataPack | OutBuffer:
+        if (snapshot := self._tick_state.snapshot) is not None and snapshot.has_mpu:
+            return snapshot.acc_all(out)
         for i in range(3):
             self._accel_all[i] = randint(*self.mpu_rand_range)
+        if out is not None:
+            return fill_buffer(out, self._accel_all)
         return tuple(self._accel_all)  # type: ignore
 
-    def gyro_all(self) -> MPUDataPack:
+    def gyro_all(self, out: OutBuffer | None = None) -> MPUDataPack | OutBuffer:
+        if (snapshot := self._tick_state.snapshot) is not None and snapshot.has_mpu:
+            return snapshot.gyro_all(out)
         for i in range(3):
             self._gyro_all[i] = randint(*self.mpu_rand_range)
+        if out is not None:
+            return fill_buffer(out, self._gyro_all)
         return tuple(self._gyro_all)  # type: ignore
 
-    def atti_all(self) -> MPUDataPack:
+    def atti_all(self, out: OutBuffer | None = None) -> MPUDataPack | OutBuffer:
+        if (snapshot := self._tick_state.snapshot) is not None and snapshot.has_mpu:
+            return snapshot.atti_all(out)
         for i in range(3):
             self._atti_all[i] = randint(*self.mpu_rand_range)
+        if out is not None:
+            return fill_buffer(out, self._atti_all)
         return tuple(self._atti_all)  # type: ignore
 
-    @staticmethod
-    def get_io_level(index: Literal[0, 1, 2, 3, 4, 5, 6, 7] | int) -> int:
+    def get_io_level(self, index: Literal[0, 1, 2, 3, 4, 5, 6, 7] | int) -> int:
+        if (snapshot := self._tick_state.snapshot) is not None:
+            return (snapshot.io >> index) & 1
         return randint(0, 1)
 
     @staticmethod
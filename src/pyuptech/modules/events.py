@@ -0,0 +1,215 @@
+from enum import IntFlag
+from queue import Queue, Full
+from time import perf_counter_ns
+from typing import Callable, Dict, List, NamedTuple, Self, Tuple, TypeAlias
+
+from .logger import _logger
+from .periodic import PeriodicThread
+
+E6 = 1000000
+
+
+class IOEdge(IntFlag):
+    """
+    The edge types that an io event can be triggered by
+    """
+
+    RISING = 1
+    FALLING = 2
+    ANY = RISING | FALLING
+
+
+class IOEvent(NamedTuple):
+    """
+    A single edge detected on an io pin
+    """
+
+    pin: int
+    edge: IOEdge
+    timestamp_ns: int
+    mask: int
+
+
+IOEventCallback: TypeAlias = Callable[[IOEvent], None]
+MaskGetter: TypeAlias = Callable[[], int]
+
+
+class IOEventDispatcher:
+    """
+    Polls the 8-bit io mask and dispatches the edge events to the registered callbacks.
+
+    Each poll XORs the fresh mask against the previous one, so only the pins that actually
+    changed are visited, an unchanged mask costs a single comparison.
+    """
+
+    def __init__(
+        self,
+        mask_getter: MaskGetter,
+        poll_interval_ms: float = 5,
+        queue: Queue | None = None,
+    ):
+        """
+        Initializes an instance of the IOEventDispatcher class.
+
+        Args:
+            mask_getter (MaskGetter): The function that returns the io mask, e.g. `OnBoardSensors.io_all_channels`.
+            poll_interval_ms (float): The interval between two polls in the background thread. Defaults to 5.
+            queue (Queue, optional): If given, every event will also be put into it, so that consumers on other threads
+                can receive the events without registering callbacks. Defaults to None.
+
+        Examples:
+            >>> dispatcher = IOEventDispatcher(sensors.io_all_channels).on(0, IOEdge.RISING, print).start()
+        """
+        self._mask_getter: MaskGetter = mask_getter
+        self._queue: Queue | None = queue
+
+        # per pin (rising callbacks, falling callbacks)
+        self._callbacks: Dict[int, Tuple[List[IOEventCallback], List[IOEventCallback]]] = {}
+        self._watched_mask: int = 0
+        self._last_mask: int | None = None
+
+        self._timer: PeriodicThread = PeriodicThread(
+            self.poll, int(poll_interval_ms * E6), "IO event dispatcher", "pyuptech-io-events"
+        )
+
+    @property
+    def poll_interval_ms(self) -> float:
+        """
+        get the interval between two polls in the background thread, in milliseconds
+        """
+        return self._timer.interval_ns / E6
+
+    @poll_interval_ms.setter
+    def poll_interval_ms(self, value: float):
+        self._timer.interval_ns = int(value * E6)
+
+    @property
+    def queue(self) -> Queue | None:
+        """
+        the queue that receives every dispatched event, None if not used
+        """
+        return self._queue
+
+    @property
+    def last_mask(self) -> int | None:
+        """
+        the io mask of the latest poll, None if never polled
+        """
+        return self._last_mask
+
+    @property
+    def is_running(self) -> bool:
+        """
+        whether the background polling thread is alive
+        """
+        return self._timer.is_running
+
+    def on(self, pin: int, edge: IOEdge, callback: IOEventCallback) -> Self:
+        """
+        Register a callback to the specified edge of the pin.
+
+        Args:
+            pin (int): The index of the io pin, 0~7.
+            edge (IOEdge): The edge that triggers the callback.
+            callback (IOEventCallback): The function to call with the IOEvent.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        if not 0 <= pin < 8:
+            raise ValueError(f"Pin index must be between 0 and 7, got {pin}")
+        rising, falling = self._callbacks.setdefault(pin, ([], []))
+        if edge & IOEdge.RISING:
+            rising.append(callback)
+        if edge & IOEdge.FALLING:
+            falling.append(callback)
+        self._watched_mask |= 1 << pin
+        return self
+
+    def off(self, pin: int, callback: IOEventCallback | None = None) -> Self:
+        """
+        Unregister the callback of the pin, all callbacks of the pin will be removed if callback is None.
+
+        Args:
+            pin (int): The index of the io pin, 0~7.
+            callback (IOEventCallback, optional): The callback to remove. Defaults to None.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        if pin not in self._callbacks:
+            return self
+        if callback is None:
+            del self._callbacks[pin]
+        else:
+            for callbacks in self._callbacks[pin]:
+                while callback in callbacks:
+                    callbacks.remove(callback)
+            if not any(self._callbacks[pin]):
+                del self._callbacks[pin]
+        if pin not in self._callbacks:
+            self._watched_mask &= ~(1 << pin)
+        return self
+
+    def poll(self) -> int:
+        """
+        Read the io mask once and dispatch the edge events.
+
+        The first poll only records the mask as the reference, no event will be dispatched. An exception raised by a
+        callback is logged, and the dispatching goes on.
+
+        Returns:
+            int: The mask of the changed pins, 0 if nothing changed.
+        """
+        mask = self._mask_getter()
+        timestamp = perf_counter_ns()
+        last_mask = self._last_mask
+        self._last_mask = mask
+        if last_mask is None or not (changed := mask ^ last_mask):
+            return 0
+
+        queue = self._queue
+        pending = changed if queue is not None else changed & self._watched_mask
+        while pending:
+            lowest = pending & -pending
+            pending ^= lowest
+            pin = lowest.bit_length() - 1
+            edge = IOEdge.RISING if mask & lowest else IOEdge.FALLING
+            event = IOEvent(pin, edge, timestamp, mask)
+            if queue is not None:
+                try:
+                    queue.put_nowait(event)
+                except Full:
+                    _logger.warning("IO event queue is full, dropping event of pin %d", pin)
+            if (callbacks := self._callbacks.get(pin)) is None:
+                continue
+            for callback in callbacks[0] if edge is IOEdge.RISING else callbacks[1]:
+                try:
+                    callback(event)
+                except Exception as e:
+                    # one failing callback must not cost the other callbacks and pins their events
+                    _logger.error("IO event callback of pin %d failed, %s", pin, e)
+        return changed
+
+    def start(self) -> Self:
+        """
+        Start polling in a daemon thread at the configured poll interval.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self._timer.start()
+        return self
+
+    def stop(self, timeout: float | None = None) -> Self:
+        """
+        Stop the background polling thread.
+
+        Args:
+            timeout (float, optional): The seconds to wait for the thread to exit. Defaults to None.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self._timer.stop(timeout)
+        return self
@@ -0,0 +1,298 @@
+from struct import Struct
+from time import perf_counter_ns
+from typing import List, Self, Tuple
+
+from .commands import CommandCanvas, replay_commands
+from .logger import _logger
+from .periodic import PeriodicThread
+from .screen import Screen, Color, FontSize
+from .shared import (
+    create_shared_memory,
+    attach_shared_memory,
+    release_shared_memory,
+    wait_for_writer,
+    SEQLOCK_SPINS,
+    DEFAULT_SEQLOCK_TIMEOUT_MS,
+)
+
+E6 = 1000000
+E9 = 1000000000
+
+DEFAULT_FB_NAME = "pyuptech_screen"
+
+# segment layout, little endian without padding
+# [0, 8)  header: layer count, layer capacity
+# then for each layer, 8 + capacity bytes: seq, length, the command stream of the layer
+_HEADER = Struct("<II")
+_LAYER_HEADER = Struct("<II")
+
+
+def _layer_offset(layer: int, capacity: int) -> int:
+    return _HEADER.size + layer * (_LAYER_HEADER.size + capacity)
+
+
+class SharedCanvas(CommandCanvas):
+    """
+    Draws onto a layer of the shared screen owned by a `ScreenCompositor`, from any local process.
+
+    The drawing calls are recorded locally, `commit()` publishes them as the whole content of the layer.
+    The compositor owns the refresh, so `refresh()` is a no-op here.
+    Each layer is meant to be drawn by a single canvas, give every process its own layer.
+    """
+
+    def __init__(self, layer: int, name: str = DEFAULT_FB_NAME):
+        """
+        Initializes an instance of the SharedCanvas class, attaches to the shared screen.
+
+        Args:
+            layer (int): The layer to draw on, layers with greater index are drawn on top.
+            name (str): The name of the shared memory segment. Defaults to "pyuptech_screen".
+
+        Raises:
+            FileNotFoundError: If no compositor has created the shared screen yet.
+
+        Examples:
+            >>> canvas = SharedCanvas(1).put_string(0, 0, "target locked").commit()
+        """
+        super().__init__()
+        self._shm = attach_shared_memory(name)
+        self._buf = self._shm.buf
+        layer_count, self._capacity = _HEADER.unpack_from(self._buf, 0)
+        if not 0 <= layer < layer_count:
+            self.close()
+            raise ValueError(f"Layer must be between 0 and {layer_count - 1}, got {layer}")
+        self._layer: int = layer
+        self._offset: int = _layer_offset(layer, self._capacity)
+
+    @property
+    def layer(self) -> int:
+        """
+        the layer this canvas draws on
+        """
+        return self._layer
+
+    def refresh(self) -> Self:
+        """
+        Does nothing, the compositor refreshes the screen at its own rate.
+        """
+        return self
+
+    def commit(self) -> Self:
+        """
+        Publish the recorded calls as the new content of the layer, then start recording a new content.
+
+        Returns:
+            Self: The instance of the class.
+
+        Raises:
+            ValueError: If the recorded calls do not fit into the layer.
+        """
+        length = len(self._commands)
+        if length > self._capacity:
+            raise ValueError(
+                f"Layer {self._layer} content of {length} bytes exceeds the capacity of {self._capacity} bytes"
+            )
+        buf = self._buf
+        offset = self._offset
+        seq = _LAYER_HEADER.unpack_from(buf, offset)[0]
+        # an odd seq is left by a canvas that died in the middle of a commit, start over from the next even one
+        seq += seq & 1
+        _LAYER_HEADER.pack_into(buf, offset, (seq + 1) & 0xFFFFFFFF, length)
+        start = offset + _LAYER_HEADER.size
+        buf[start : start + length] = self._commands
+        _LAYER_HEADER.pack_into(buf, offset, (seq + 2) & 0xFFFFFFFF, length)
+        self._commands.clear()
+        return self
+
+    def close(self) -> None:
+        """
+        Detach from the shared screen, the content of the layer is left on the screen.
+        """
+        self._buf = None
+        self._shm.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class ScreenCompositor:
+    """
+    Owns the `Screen` and composes the layers drawn by the `SharedCanvas` of the local processes.
+
+    The layers are kept as command streams rather than pixels, since the lib offers no bulk pixel transfer.
+    Whenever a layer changes, all the layers are replayed from the bottom to the top, and the screen is refreshed
+    at most `max_fps` times per second.
+    """
+
+    def __init__(
+        self,
+        screen: Screen,
+        name: str = DEFAULT_FB_NAME,
+        layers: int = 4,
+        layer_capacity: int = 4096,
+        max_fps: float = 20,
+        background: Color | int = Color.BLACK,
+        font_size: FontSize = FontSize.FONT_6X8,
+        layer_timeout_ms: float = DEFAULT_SEQLOCK_TIMEOUT_MS,
+    ):
+        """
+        Initializes an instance of the ScreenCompositor class, creates the shared screen.
+
+        Args:
+            screen (Screen): The opened screen, the only instance that touches the lcd.
+            name (str): The name of the shared memory segment. Defaults to "pyuptech_screen".
+            layers (int): The count of the layers. Defaults to 4.
+            layer_capacity (int): The size of the command stream of each layer, in bytes. Defaults to 4096.
+            max_fps (float): The max refresh rate. Defaults to 20.
+            background (Color | int): The color to clear the screen with before composing. Defaults to Color.BLACK.
+            font_size (FontSize): The font size every layer starts with. Defaults to FontSize.FONT_6X8.
+            layer_timeout_ms (float): How long to wait for a layer being committed, a layer still being committed
+                after that, e.g. by a killed process, is composed as empty. Defaults to DEFAULT_SEQLOCK_TIMEOUT_MS.
+
+        Examples:
+            >>> compositor = ScreenCompositor(Screen(screen_dir=2)).start()
+        """
+        self._screen: Screen = screen
+        self._layers: int = layers
+        self._capacity: int = layer_capacity
+        self._min_interval_ns: int = int(E9 / max_fps)
+        self._background: Color | int = background
+        self._font_size: FontSize = font_size
+        self._layer_timeout_ns: int = int(layer_timeout_ms * E6)
+
+        self._shm = create_shared_memory(name, _layer_offset(layers, layer_capacity))
+        self._buf = self._shm.buf
+        _HEADER.pack_into(self._buf, 0, layers, layer_capacity)
+
+        self._composed_seqs: List[int] = [0] * layers
+        # the odd seq each layer timed out at, 0 for none, so a stuck layer is waited for only once
+        self._stuck_seqs: List[int] = [0] * layers
+        self._last_flush_ns: int = 0
+
+        self._timer: PeriodicThread = PeriodicThread(
+            self.poll, self._min_interval_ns, "Screen compositor", "pyuptech-screen-compositor"
+        )
+        _logger.info("Screen compositor created at shared memory [%s] with %s layers", name, layers)
+
+    @property
+    def name(self) -> str:
+        """
+        the name of the shared memory segment
+        """
+        return self._shm.name
+
+    def _read_layer(self, layer: int) -> Tuple[int, bytes]:
+        buf = self._buf
+        offset = _layer_offset(layer, self._capacity)
+        start = offset + _LAYER_HEADER.size
+        tries = started = 0
+        while True:
+            seq, length = _LAYER_HEADER.unpack_from(buf, offset)
+            if not seq & 1:
+                payload = bytes(buf[start : start + length])
+                if _LAYER_HEADER.unpack_from(buf, offset)[0] == seq:
+                    return seq, payload
+            tries += 1
+            if tries >= SEQLOCK_SPINS:
+                started = wait_for_writer(self._shm.name, started, self._layer_timeout_ns)
+
+    def _layer_seqs(self) -> List[int]:
+        buf = self._buf
+        capacity = self._capacity
+        return [
+            _LAYER_HEADER.unpack_from(buf, _layer_offset(layer, capacity))[0]
+            for layer in range(self._layers)
+        ]
+
+    def compose(self) -> Self:
+        """
+        Replay all the layers and refresh the screen, regardless of the rate limit.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        screen = self._screen
+        stuck_seqs = self._stuck_seqs
+        screen.fill_screen(self._background)
+        for layer in range(self._layers):
+            seq = _LAYER_HEADER.unpack_from(self._buf, _layer_offset(layer, self._capacity))[0]
+            if seq == stuck_seqs[layer]:
+                # still stuck at the seq it timed out at, skipped without waiting again
+                payload = b""
+            else:
+                try:
+                    seq, payload = self._read_layer(layer)
+                    stuck_seqs[layer] = 0
+                except TimeoutError as e:
+                    _logger.error("Skipping layer %s, %s", layer, e)
+                    # composed as it is, so that the stuck layer alone does not trigger composing again
+                    seq, payload = _LAYER_HEADER.unpack_from(self._buf, _layer_offset(layer, self._capacity))[0], b""
+                    stuck_seqs[layer] = seq if seq & 1 else 0
+            self._composed_seqs[layer] = seq
+            if not payload:
+                continue
+            screen.set_font_size(self._font_size).set_fore_color(Color.WHITE).set_back_color(
+                self._background
+            )
+            try:
+                replay_commands(payload, screen)
+            except Exception as e:
+                _logger.error("Failed to compose layer %s, %s", layer, e)
+        screen.refresh()
+        self._last_flush_ns = perf_counter_ns()
+        return self
+
+    def poll(self) -> bool:
+        """
+        Compose the layers if any of them changed and the rate limit allows.
+
+        Returns:
+            bool: Whether the screen was refreshed.
+        """
+        if perf_counter_ns() - self._last_flush_ns < self._min_interval_ns:
+            return False
+        if self._layer_seqs() == self._composed_seqs:
+            return False
+        self.compose()
+        return True
+
+    def start(self) -> Self:
+        """
+        Poll the layers in a daemon thread at the max refresh rate.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self._timer.start()
+        return self
+
+    def stop(self, timeout: float | None = None) -> Self:
+        """
+        Stop the polling thread.
+
+        Args:
+            timeout (float, optional): The seconds to wait for the thread to exit. Defaults to None.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self._timer.stop(timeout)
+        return self
+
+    def close(self) -> None:
+        """
+        Stop polling, then close and unlink the shared screen.
+        """
+        self.stop()
+        self._buf = None
+        release_shared_memory(self._shm)
+        _logger.info("Screen compositor at shared memory [%s] closed", self._shm.name)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,317 @@
+from bisect import bisect_right
+from threading import Lock
+from time import perf_counter_ns
+from typing import Any, Dict, List, Self, Sequence, Tuple, TypeAlias
+
+from .periodic import PeriodicThread
+from .screen import Color
+
+E9 = 1000000000
+
+LED_COUNT = 2
+
+# (seconds from the start of the animation, 24-bit rgb color)
+Keyframe: TypeAlias = Tuple[float, int]
+
+
+def _lerp_color(start: int, end: int, ratio: float) -> int:
+    color = 0
+    for shift in (16, 8, 0):
+        a = start >> shift & 0xFF
+        b = end >> shift & 0xFF
+        color |= round(a + (b - a) * ratio) << shift
+    return color
+
+
+class LEDAnimation:
+    """
+    A color over time, given by keyframes, either stepped or faded between them.
+    """
+
+    __slots__ = ("_times", "_colors", "_fades", "duration", "loop")
+
+    def __init__(
+        self,
+        keyframes: Sequence[Keyframe],
+        duration_s: float | None = None,
+        loop: bool = False,
+        fade: bool | Sequence[bool] = False,
+    ):
+        """
+        Initializes an instance of the LEDAnimation class.
+
+        Args:
+            keyframes (Sequence[Keyframe]): The (seconds, color) keyframes, in time order, the first one at 0.
+            duration_s (float, optional): The length of one run, the time of the last keyframe if None.
+                Defaults to None.
+            loop (bool): Whether to start over after each run. Defaults to False.
+            fade (bool | Sequence[bool]): Whether to fade between the keyframes instead of stepping, either for all of
+                them or for each keyframe towards the next one. Defaults to False.
+
+        Examples:
+            >>> police = LEDAnimation([(0, Color.RED), (0.25, Color.BLUE)], duration_s=0.5, loop=True)
+        """
+        if not keyframes:
+            raise ValueError("At least one keyframe is required")
+        times = [float(time) for time, _ in keyframes]
+        if times[0] != 0 or any(b < a for a, b in zip(times, times[1:])):
+            raise ValueError(f"Keyframes must start at 0 and be in time order, got times {times}")
+        self._times: List[float] = times
+        self._colors: List[int] = [int(color) for _, color in keyframes]
+        self._fades: List[bool] = [fade] * len(times) if isinstance(fade, bool) else list(fade)
+        if len(self._fades) != len(times):
+            raise ValueError(f"Expected {len(times)} fade flags, got {len(self._fades)}")
+        self.duration: float = times[-1] if duration_s is None else duration_s
+        self.loop: bool = loop
+
+    @classmethod
+    def solid(cls, color: Color | int) -> Self:
+        """
+        A constant color.
+        """
+        return cls([(0, color)])
+
+    @classmethod
+    def blink(
+        cls, color: Color | int, period_s: float = 1.0, duty: float = 0.5, off: Color | int = Color.BLACK
+    ) -> Self:
+        """
+        Switch between a color and off, forever.
+
+        Args:
+            color (Color | int): The color when on.
+            period_s (float): The length of one on-off cycle. Defaults to 1.0.
+            duty (float): The fraction of the period spent on. Defaults to 0.5.
+            off (Color | int): The color when off. Defaults to Color.BLACK.
+        """
+        return cls([(0, color), (period_s * duty, off)], duration_s=period_s, loop=True)
+
+    @classmethod
+    def breathe(cls, color: Color | int, period_s: float = 2.0, low: Color | int = Color.BLACK) -> Self:
+        """
+        Fade from low up to a color and back down, forever.
+
+        Args:
+            color (Color | int): The color at the peak.
+            period_s (float): The length of one breath. Defaults to 2.0.
+            low (Color | int): The color at the bottom. Defaults to Color.BLACK.
+        """
+        return cls([(0, low), (period_s / 2, color), (period_s, low)], loop=True, fade=True)
+
+    @classmethod
+    def fade_between(cls, start: Color | int, end: Color | int, duration_s: float) -> Self:
+        """
+        Fade once from a color to another, then hold the latter.
+        """
+        return cls([(0, start), (duration_s, end)], fade=True)
+
+    @classmethod
+    def sequence(cls, *animations: "LEDAnimation", loop: bool = False) -> Self:
+        """
+        Chain one run of each animation.
+
+        Args:
+            *animations (LEDAnimation): The animations in order.
+            loop (bool): Whether to start the chain over after its end. Defaults to False.
+        """
+        if not animations:
+            raise ValueError("At least one animation is required")
+        keyframes: List[Keyframe] = []
+        fades: List[bool] = []
+        offset = 0.0
+        for animation in animations:
+            keyframes.extend((offset + time, color) for time, color in zip(animation._times, animation._colors))
+            fades.extend(animation._fades)
+            # the last keyframe of a run holds until the next animation starts
+            fades[-1] = False
+            offset += animation.duration
+        # hold the last color until the end of the last animation
+        keyframes.append((offset, animations[-1].color_at(animations[-1].duration)))
+        fades.append(False)
+        return cls(keyframes, loop=loop, fade=fades)
+
+    def finished(self, elapsed_s: float) -> bool:
+        """
+        Whether a run that started elapsed_s ago is over for good.
+        """
+        return not self.loop and elapsed_s >= self.duration
+
+    def color_at(self, elapsed_s: float) -> int:
+        """
+        The color at a time since the start.
+
+        Args:
+            elapsed_s (float): The seconds since the start.
+
+        Returns:
+            int: The 24-bit rgb color.
+        """
+        if self.loop and self.duration > 0:
+            elapsed_s %= self.duration
+        times, colors = self._times, self._colors
+        index = bisect_right(times, elapsed_s) - 1
+        if index + 1 >= len(times) or not self._fades[index]:
+            return colors[index]
+        span = times[index + 1] - times[index]
+        if span <= 0:
+            return colors[index + 1]
+        return _lerp_color(colors[index], colors[index + 1], (elapsed_s - times[index]) / span)
+
+
+class LEDAnimator:
+    """
+    Plays LED animations on a low priority timer thread.
+
+    The animator reads the color each LED shows from the `led_colors` shadow of the screen, and calls
+    `set_led_color` of the screen, which is `adc_led_set` on the ADC-IO channel, only when a color changes, so a
+    held color or a slow fade does not keep the channel busy. The colors set on the screen directly are taken into
+    account as well.
+    """
+
+    def __init__(self, screen: Any, frequency_hz: float = 50, niceness: int = 10):
+        """
+        Initializes an instance of the LEDAnimator class.
+
+        Args:
+            screen (Any): The `Screen`, or any object with its `set_led_color(index, color)` and `led_colors`.
+            frequency_hz (float): The rate the colors are updated at by the timer thread. Defaults to 50.
+            niceness (int): The nice value added to the timer thread, where the OS allows. Defaults to 10.
+
+        Examples:
+            >>> leds = LEDAnimator(screen).start()
+            >>> leds.play(0, LEDAnimation.breathe(Color.GREEN))
+            >>> leds.play(1, LEDAnimation.blink(Color.RED, period_s=0.2))
+        """
+        self._screen: Any = screen
+        self._lock: Lock = Lock()
+        self._playing: Dict[int, Tuple[LEDAnimation, int]] = {}
+        self._timer: PeriodicThread = PeriodicThread(
+            self.tick, int(E9 / frequency_hz), "LED animator", "pyuptech-led-animator", niceness
+        )
+        self.writes: int = 0
+        self.skipped_writes: int = 0
+
+    @property
+    def colors(self) -> List[int | None]:
+        """
+        the color shown by each LED, from the shadow of the screen, None for a LED not set yet
+        """
+        return list(self._screen.led_colors)
+
+    @property
+    def playing(self) -> List[int]:
+        """
+        the indices of the LEDs running an animation
+        """
+        with self._lock:
+            return sorted(self._playing)
+
+    def _check_index(self, index: int) -> None:
+        if not 0 <= index < LED_COUNT:
+            raise ValueError(f"LED index must be between 0 and {LED_COUNT - 1}, got {index}")
+
+    def _write(self, index: int, color: int) -> None:
+        if self._screen.led_colors[index] == color:
+            self.skipped_writes += 1
+            return
+        self._screen.set_led_color(index, color)
+        self.writes += 1
+
+    def set(self, index: int, color: Color | int) -> Self:
+        """
+        Stop the animation of a LED and hold a color.
+
+        Args:
+            index (int): The index of the LED.
+            color (Color | int): The color.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self._check_index(index)
+        with self._lock:
+            self._playing.pop(index, None)
+            self._write(index, int(color))
+        return self
+
+    def play(self, index: int, animation: LEDAnimation) -> Self:
+        """
+        Start an animation on a LED, replacing the one it runs.
+
+        Args:
+            index (int): The index of the LED.
+            animation (LEDAnimation): The animation.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self._check_index(index)
+        now = perf_counter_ns()
+        with self._lock:
+            self._playing[index] = (animation, now)
+            self._write(index, animation.color_at(0))
+        return self
+
+    def stop_animation(self, index: int) -> Self:
+        """
+        Stop the animation of a LED, which holds the color it shows.
+
+        Args:
+            index (int): The index of the LED.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        with self._lock:
+            self._playing.pop(index, None)
+        return self
+
+    def tick(self, now_ns: int | None = None) -> Self:
+        """
+        Update the colors of the animated LEDs, the timer thread calls it at the set rate.
+
+        Args:
+            now_ns (int, optional): The perf_counter_ns timestamp to render, the current one if None.
+                Defaults to None.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        now_ns = perf_counter_ns() if now_ns is None else now_ns
+        with self._lock:
+            for index, (animation, started) in tuple(self._playing.items()):
+                elapsed = (now_ns - started) / E9
+                self._write(index, animation.color_at(elapsed))
+                if animation.finished(elapsed):
+                    del self._playing[index]
+        return self
+
+    @property
+    def is_running(self) -> bool:
+        """
+        whether the timer thread is alive
+        """
+        return self._timer.is_running
+
+    def start(self) -> Self:
+        """
+        Update the colors in a daemon thread at the set rate.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self._timer.start()
+        return self
+
+    def stop(self, timeout: float | None = None) -> Self:
+        """
+        Stop the timer thread, the LEDs hold their colors.
+
+        Args:
+            timeout (float, optional): The seconds to wait for the thread to exit. Defaults to None.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self._timer.stop(timeout)
+        return self
@@ -26,9 +26,9 @@ def load_lib(lib_file_path: str) -> ctypes.CDLL | None:
     try:
         obj = ctypes.cdll.LoadLibrary(lib_file_path)
     except Exception as e:
-        _logger.critical(f"Can't load lib [{lib_file_path}],{e}")
+        _logger.critical("Can't load lib [%s],%s", lib_file_path, e)
         return None
-    _logger.info(f"Lib [{lib_file_path}] loaded")
+    _logger.info("Lib [%s] loaded", lib_file_path)
     return obj
 
 
@@ -0,0 +1,19 @@
+"""
+The locks of the hardware subsystems driven through libuptech.
+
+ctypes releases the GIL during each foreign call, so calls guarded by different locks overlap on a multicore board.
+The locks are module level because the state of libuptech is per process, not per wrapper instance.
+
+    ADC_IO_LOCK: the channel to the ADC-IO co-processor, shared by the ADC, the IO pins and the LEDs
+    MPU_LOCK: the MPU6500
+    LCD_LOCK: the LCD and the uGUI drawing state, e.g. the font and the colors
+
+All of them are reentrant, hold one with `with` around a sequence of calls to make the sequence atomic,
+e.g. setting the fore color and then putting a string. Never hold two of them at once.
+"""
+
+from threading import RLock
+
+ADC_IO_LOCK: RLock = RLock()
+MPU_LOCK: RLock = RLock()
+LCD_LOCK: RLock = RLock()
@@ -1,12 +1,256 @@
+import atexit
 import logging
+import os
+from logging.handlers import QueueHandler, QueueListener
+from queue import Empty, SimpleQueue
+from threading import Lock
+from time import perf_counter_ns
+from typing import Callable, Dict, List, Tuple
 
 import coloredlogs
 
+E9 = 1000000000
+
+# the period at which the listener thread closes the expired aggregation windows
+SWEEP_INTERVAL_S = 0.1
+
 # 初始化logger
 _logger = logging.getLogger("pyuptech")
 coloredlogs.install(logger=_logger, level=logging.DEBUG)
 
 
+class RepeatAggregator(logging.Filter):
+    """
+    Aggregates the records repeatedly logged at the same call site.
+
+    The first record of a call site in each window passes, the following ones are only counted, and once the window
+    is over, the latest of them is passed with the count, e.g. "Failed to get all ADC channels. [412x in last 1.0s]".
+    The windows are closed by `sweep()`, which the log listener thread calls periodically, so a burst followed by
+    silence still gets its summary; without a listener, the next record of the aggregated level closes them.
+    """
+
+    def __init__(
+        self,
+        window_s: float = 1.0,
+        level: int = logging.WARNING,
+        sink: Callable[[logging.LogRecord], None] | None = None,
+    ):
+        """
+        Initializes an instance of the RepeatAggregator class.
+
+        Args:
+            window_s (float): The length of the aggregation window, in seconds. Defaults to 1.0.
+            level (int): The level from which the records are aggregated. Defaults to logging.WARNING.
+            sink (Callable[[logging.LogRecord], None], optional): Called with the summary records, they are dropped
+                if None. Defaults to None.
+        """
+        super().__init__()
+        self._window_ns: int = int(window_s * E9)
+        self._level: int = level
+        self._sink: Callable[[logging.LogRecord], None] | None = sink
+        self._lock: Lock = Lock()
+        # call site => [window start, suppressed count, latest suppressed record]
+        self._windows: Dict[Tuple[str, int, str, int], list] = {}
+        self._next_sweep_ns: int = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < self._level or getattr(record, "aggregated", False):
+            return True
+        now = perf_counter_ns()
+        key = (record.name, record.levelno, record.pathname, record.lineno)
+        with self._lock:
+            summaries = self._sweep(now) if now >= self._next_sweep_ns else None
+            window = self._windows.get(key)
+            if window is not None and now - window[0] >= self._window_ns:
+                # the window of this call site is over, but was not swept yet
+                del self._windows[key]
+                if window[1]:
+                    summaries = (summaries or []) + [_summarize(window[2], window[1], self._window_ns / E9)]
+                window = None
+            if window is None:
+                self._windows[key] = [now, 0, None]
+                passed = True
+            else:
+                window[1] += 1
+                window[2] = record
+                passed = False
+        if summaries and self._sink is not None:
+            for summary in summaries:
+                self._sink(summary)
+        return passed
+
+    def _sweep(self, now: int, everything: bool = False) -> List[logging.LogRecord]:
+        summaries = []
+        for key, (start, count, record) in list(self._windows.items()):
+            if everything or now - start >= self._window_ns:
+                del self._windows[key]
+                if count:
+                    # a window closed early by flush() only covers the time elapsed so far
+                    summaries.append(_summarize(record, count, min(now - start, self._window_ns) / E9))
+        self._next_sweep_ns = now + self._window_ns
+        return summaries
+
+    def _close(self, everything: bool) -> List[logging.LogRecord]:
+        with self._lock:
+            summaries = self._sweep(perf_counter_ns(), everything)
+        if self._sink is not None:
+            for summary in summaries:
+                self._sink(summary)
+        return summaries
+
+    def sweep(self) -> List[logging.LogRecord]:
+        """
+        Close the windows that are over.
+
+        Returns:
+            List[logging.LogRecord]: The summaries of the closed windows with suppressed records, also passed to the
+                sink.
+        """
+        return self._close(everything=False)
+
+    def flush(self) -> List[logging.LogRecord]:
+        """
+        Close all the windows.
+
+        Returns:
+            List[logging.LogRecord]: The summaries of the windows with suppressed records, also passed to the sink.
+        """
+        return self._close(everything=True)
+
+    def reset(self):
+        """
+        Drop all the windows and renew the lock, e.g. in a forked child, where another thread may have held it.
+        """
+        self._lock = Lock()
+        self._windows = {}
+        self._next_sweep_ns = 0
+
+
+def _summarize(record: logging.LogRecord, count: int, elapsed_s: float) -> logging.LogRecord:
+    summary = logging.makeLogRecord(record.__dict__)
+    # the suffix carries no '%', so the args are still applied lazily by the formatter
+    summary.msg = f"{record.msg} [{count}x in last {elapsed_s:.1f}s]"
+    summary.aggregated = True
+    return summary
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    A QueueHandler that enqueues the records unformatted, the message is only formatted by the listener thread.
+
+    The records do not cross a process boundary, so there is no need to flatten them, only pass args that are not
+    mutated after the call.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class SweepingQueueListener(QueueListener):
+    """
+    A QueueListener that also calls a function periodically from its thread, between the records or while idle.
+    """
+
+    def __init__(
+        self,
+        queue: SimpleQueue,
+        *handlers: logging.Handler,
+        on_tick: Callable[[], object],
+        interval_s: float = SWEEP_INTERVAL_S,
+        respect_handler_level: bool = False,
+    ):
+        """
+        Initializes an instance of the SweepingQueueListener class.
+
+        Args:
+            queue (SimpleQueue): The queue of the records.
+            *handlers (logging.Handler): The handlers the records are passed to.
+            on_tick (Callable[[], object]): Called every interval_s, e.g. `RepeatAggregator.sweep`.
+            interval_s (float): The period of on_tick, in seconds. Defaults to SWEEP_INTERVAL_S.
+            respect_handler_level (bool): Whether to honor the level of each handler. Defaults to False.
+        """
+        super().__init__(queue, *handlers, respect_handler_level=respect_handler_level)
+        self._on_tick: Callable[[], object] = on_tick
+        self._interval_ns: int = int(interval_s * E9)
+        self._next_tick_ns: int = 0
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        while True:
+            now = perf_counter_ns()
+            if now >= self._next_tick_ns:
+                self._next_tick_ns = now + self._interval_ns
+                try:
+                    self._on_tick()
+                except Exception:  # noqa, the listener must survive a failing tick
+                    pass
+            try:
+                return self.queue.get(block, timeout=max(self._next_tick_ns - now, 0) / E9)
+            except Empty:
+                continue
+
+
+# 将coloredlogs安装的终端handler移到队列之后，由监听线程负责格式化和输出，日志调用不会阻塞在终端IO上
+_direct_handlers: List[logging.Handler] = list(_logger.handlers)
+_log_queue: SimpleQueue = SimpleQueue()
+_queue_handler: DeferredQueueHandler = DeferredQueueHandler(_log_queue)
+_aggregator: RepeatAggregator = RepeatAggregator(sink=_queue_handler.emit)
+_queue_handler.addFilter(_aggregator)
+_listener: QueueListener | None = None
+
+
+def _sweep_aggregator():
+    # resolved on every tick, set_log_aggregation() replaces the aggregator
+    _aggregator.sweep()
+
+
+def start_log_listener():
+    """
+    启动日志监听线程，日志记录经队列交给监听线程输出，导入时自动调用
+    :return:
+    """
+    global _listener
+    if _listener is not None:
+        return
+    for handler in _direct_handlers:
+        _logger.removeHandler(handler)
+    _logger.addHandler(_queue_handler)
+    _listener = SweepingQueueListener(
+        _log_queue, *_direct_handlers, on_tick=_sweep_aggregator, respect_handler_level=True
+    )
+    _listener.start()
+
+
+def stop_log_listener():
+    """
+    输出被聚合的重复日志，停止日志监听线程并恢复同步输出，退出时自动调用
+    :return:
+    """
+    global _listener
+    if _listener is None:
+        return
+    _aggregator.flush()
+    _listener.stop()
+    _listener = None
+    _logger.removeHandler(_queue_handler)
+    for handler in _direct_handlers:
+        _logger.addHandler(handler)
+
+
+def set_log_aggregation(window_s: float, level: int = logging.WARNING):
+    """
+    设置重复日志的聚合窗口，同一位置重复记录的日志在窗口内只输出一次，窗口结束时输出重复次数
+    :param window_s: 聚合窗口长度，单位为秒，为0时不聚合
+    :param level: 参与聚合的最低日志级别
+    :return:
+    """
+    global _aggregator
+    _aggregator.flush()
+    _queue_handler.removeFilter(_aggregator)
+    _aggregator = RepeatAggregator(window_s, level, sink=_queue_handler.emit)
+    if window_s > 0:
+        _queue_handler.addFilter(_aggregator)
+
+
 def set_log_level(level: int | str):
     """
     设置日志级别
@@ -16,7 +260,26 @@ def set_log_level(level: int | str):
     _logger.setLevel(level)
 
 
+def _restart_listener_in_child():
+    # a forked child inherits the listener object but not its thread, the records would pile up in the queue
+    global _listener, _log_queue
+    _aggregator.reset()
+    if _listener is None:
+        return
+    _log_queue = SimpleQueue()
+    _queue_handler.queue = _log_queue
+    _listener = None
+    _logger.removeHandler(_queue_handler)
+    for handler in _direct_handlers:
+        _logger.addHandler(handler)
+    start_log_listener()
+
+
 set_log_level(logging.INFO)
+start_log_listener()
+atexit.register(stop_log_listener)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listener_in_child)
 if __name__ == "__main__":
 
     _logger.debug("This is a debug log.")
@@ -0,0 +1,313 @@
+from collections import deque
+from enum import Enum
+from threading import Event, Thread, current_thread
+from time import perf_counter_ns, sleep
+from typing import Any, Callable, Deque, Dict, Self, TypeAlias, TYPE_CHECKING
+
+from .logger import _logger
+from .snapshot import SensorSnapshot
+
+if TYPE_CHECKING:
+    from .screen import Screen
+    from .sensors import OnBoardSensors
+
+E3 = 1000
+E9 = 1000000000
+
+StepFunction: TypeAlias = Callable[[SensorSnapshot | None], Any]
+
+
+class OverrunPolicy(Enum):
+    """
+    What the loop does when a step finishes after the deadline of the next one
+    """
+
+    SKIP = "skip"
+    """drop the missed periods and stay on the original time grid"""
+    CATCH_UP = "catch_up"
+    """run the missed periods back to back until the loop is on time again"""
+    DEGRADE = "degrade"
+    """stretch the period, and shrink it back once the steps are on time again"""
+
+
+def _percentile(samples: Deque[int], q: float) -> int:
+    if not samples:
+        return 0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+class LoopStats:
+    """
+    The deadline and timing statistics of a `ControlLoop`, percentiles are taken over a rolling window.
+    """
+
+    def __init__(self, window: int = 1000):
+        """
+        Args:
+            window (int): The count of the latest iterations the percentiles are taken over. Defaults to 1000.
+        """
+        self.iterations: int = 0
+        self.overruns: int = 0
+        self.skipped: int = 0
+        self.max_jitter_ns: int = 0
+        self.max_latency_ns: int = 0
+        self._jitters: Deque[int] = deque(maxlen=window)
+        self._latencies: Deque[int] = deque(maxlen=window)
+
+    def add(self, jitter_ns: int, latency_ns: int) -> None:
+        """
+        Record an iteration.
+
+        Args:
+            jitter_ns (int): How late the step started compared with its scheduled time.
+            latency_ns (int): How long the step, including the input fetch, took.
+        """
+        self.iterations += 1
+        self._jitters.append(jitter_ns)
+        self._latencies.append(latency_ns)
+        if jitter_ns > self.max_jitter_ns:
+            self.max_jitter_ns = jitter_ns
+        if latency_ns > self.max_latency_ns:
+            self.max_latency_ns = latency_ns
+
+    def jitter_percentile(self, q: float) -> int:
+        """
+        Get the q-th percentile of the start jitter in the rolling window, in nanoseconds.
+        """
+        return _percentile(self._jitters, q)
+
+    def latency_percentile(self, q: float) -> int:
+        """
+        Get the q-th percentile of the step latency in the rolling window, in nanoseconds.
+        """
+        return _percentile(self._latencies, q)
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Get the counters and the p50/p99 of the jitter and the latency, the times are in microseconds.
+        """
+        return {
+            "iterations": self.iterations,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "jitter_p50_us": self.jitter_percentile(50) / E3,
+            "jitter_p99_us": self.jitter_percentile(99) / E3,
+            "jitter_max_us": self.max_jitter_ns / E3,
+            "latency_p50_us": self.latency_percentile(50) / E3,
+            "latency_p99_us": self.latency_percentile(99) / E3,
+            "latency_max_us": self.max_latency_ns / E3,
+        }
+
+    def __str__(self) -> str:
+        return ", ".join(f"{key}: {value:.1f}" for key, value in self.summary().items())
+
+
+class ControlLoop:
+    """
+    Runs a step function at a fixed frequency.
+
+    The wait before each step sleeps for the bulk of the remaining time and spins on `perf_counter_ns` for the last
+    part, so that the steps start close to their deadlines. If sensors are given, the inputs are fetched into a
+    snapshot right before each step, and the getters of the sensors are served from it during the step.
+    """
+
+    def __init__(
+        self,
+        step: StepFunction,
+        frequency_hz: float = 100,
+        sensors: "OnBoardSensors | None" = None,
+        mpu: bool = False,
+        screen: "Screen | None" = None,
+        screen_refresh_every: int = 10,
+        policy: OverrunPolicy = OverrunPolicy.SKIP,
+        spin_threshold_us: int = 200,
+        stats_window: int = 1000,
+        min_frequency_hz: float | None = None,
+    ):
+        """
+        Initializes an instance of the ControlLoop class.
+
+        Args:
+            step (StepFunction): The function to call each period, with the snapshot of the sensors, or None if no
+                sensors are given.
+            frequency_hz (float): The target frequency. Defaults to 100.
+            sensors (OnBoardSensors, optional): The sensors to fetch before each step. Defaults to None.
+            mpu (bool): Whether to fetch the MPU data into the snapshot as well. Defaults to False.
+            screen (Screen, optional): The screen to refresh after the steps. Defaults to None.
+            screen_refresh_every (int): Refresh the screen once every this many steps. Defaults to 10.
+            policy (OverrunPolicy): What to do when a step overruns. Defaults to OverrunPolicy.SKIP.
+            spin_threshold_us (int): The last part of the wait that is spun instead of slept. Defaults to 200.
+            stats_window (int): The count of the latest iterations the percentiles are taken over. Defaults to 1000.
+            min_frequency_hz (float, optional): The lowest frequency OverrunPolicy.DEGRADE may fall to.
+                Defaults to a quarter of the target frequency.
+
+        Examples:
+            >>> loop = ControlLoop(lambda snap: controller.update(snap.adc), frequency_hz=200, sensors=sensors)
+            >>> loop.run(duration_s=10)
+            >>> print(loop.stats)
+        """
+        self._step: StepFunction = step
+        self._period_ns: int = int(E9 / frequency_hz)
+        self._base_period_ns: int = self._period_ns
+        self._max_period_ns: int = int(E9 / (min_frequency_hz or frequency_hz / 4))
+        self._sensors: "OnBoardSensors | None" = sensors
+        self._mpu: bool = mpu
+        self._screen: "Screen | None" = screen
+        self._screen_refresh_every: int = screen_refresh_every
+        self._policy: OverrunPolicy = policy
+        self._spin_threshold_ns: int = spin_threshold_us * E3
+        self._stats: LoopStats = LoopStats(stats_window)
+
+        # set while no run is active, each run replaces it with its own event
+        self._stop_event: Event = Event()
+        self._stop_event.set()
+        self._thread: Thread | None = None
+
+    @property
+    def stats(self) -> LoopStats:
+        """
+        the timing statistics of the loop
+        """
+        return self._stats
+
+    @property
+    def frequency_hz(self) -> float:
+        """
+        the current frequency of the loop, lower than the target while degraded
+        """
+        return E9 / self._period_ns
+
+    @property
+    def is_running(self) -> bool:
+        """
+        whether the loop is running, or its thread has not exited since it was stopped
+        """
+        return not self._stop_event.is_set() or (self._thread is not None and self._thread.is_alive())
+
+    def _wait_until(self, deadline_ns: int) -> None:
+        remaining = deadline_ns - perf_counter_ns()
+        if remaining > self._spin_threshold_ns:
+            sleep((remaining - self._spin_threshold_ns) / E9)
+        while perf_counter_ns() < deadline_ns:
+            pass
+
+    def _run_step(self, iteration: int) -> None:
+        sensors = self._sensors
+        if sensors is None:
+            self._step(None)
+        else:
+            with sensors.tick(self._mpu) as snapshot:
+                self._step(snapshot)
+        if self._screen is not None and iteration % self._screen_refresh_every == 0:
+            self._screen.refresh()
+
+    def run(self, iterations: int | None = None, duration_s: float | None = None) -> Self:
+        """
+        Run the loop in the calling thread, until `stop()` is called or a limit is reached.
+
+        Args:
+            iterations (int, optional): Stop after this many steps. Defaults to None.
+            duration_s (float, optional): Stop after this many seconds. Defaults to None.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self._stop_event = Event()
+        return self._loop(iterations, duration_s, self._stop_event)
+
+    def _loop(self, iterations: int | None, duration_s: float | None, stop_event: Event) -> Self:
+        stats = self._stats
+        policy = self._policy
+        on_time_streak = 0
+        iteration = 0
+        scheduled = perf_counter_ns()
+        end_time = scheduled + int(duration_s * E9) if duration_s is not None else None
+        try:
+            while not stop_event.is_set():
+                started = perf_counter_ns()
+                self._run_step(iteration)
+                finished = perf_counter_ns()
+                stats.add(started - scheduled, finished - started)
+                iteration += 1
+                if iterations is not None and iteration >= iterations:
+                    break
+                if end_time is not None and finished >= end_time:
+                    break
+
+                scheduled += self._period_ns
+                if finished <= scheduled:
+                    on_time_streak += 1
+                    if (
+                        policy is OverrunPolicy.DEGRADE
+                        and self._period_ns > self._base_period_ns
+                        and on_time_streak >= 100
+                    ):
+                        self._period_ns = max(self._base_period_ns, self._period_ns // 2)
+                        on_time_streak = 0
+                        _logger.info("Control loop recovered to %.1fHz", self.frequency_hz)
+                    self._wait_until(scheduled)
+                    continue
+
+                stats.overruns += 1
+                on_time_streak = 0
+                match policy:
+                    case OverrunPolicy.SKIP:
+                        missed = (finished - scheduled) // self._period_ns + 1
+                        stats.skipped += missed
+                        scheduled += missed * self._period_ns
+                        self._wait_until(scheduled)
+                    case OverrunPolicy.CATCH_UP:
+                        pass
+                    case OverrunPolicy.DEGRADE:
+                        if self._period_ns < self._max_period_ns:
+                            self._period_ns = min(self._max_period_ns, self._period_ns * 2)
+                            _logger.warning("Control loop degraded to %.1fHz", self.frequency_hz)
+                        scheduled = finished
+        finally:
+            stop_event.set()
+        return self
+
+    def start(self, iterations: int | None = None, duration_s: float | None = None) -> Self:
+        """
+        Run the loop in a daemon thread.
+
+        Args:
+            iterations (int, optional): Stop after this many steps. Defaults to None.
+            duration_s (float, optional): Stop after this many seconds. Defaults to None.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            _logger.warning("Control loop is already running")
+            return self
+        # each run gets its own event, so a thread that outlived its stop can not be resumed by a restart
+        self._stop_event = Event()
+        self._thread = Thread(
+            target=self._loop,
+            args=(iterations, duration_s, self._stop_event),
+            name="pyuptech-control-loop",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = None) -> Self:
+        """
+        Stop the loop after the current step, the step may call it to stop its own loop.
+
+        Args:
+            timeout (float, optional): The seconds to wait for the loop thread to exit. Defaults to None.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self._stop_event.set()
+        if (thread := self._thread) is not None:
+            if thread is not current_thread():
+                thread.join(timeout)
+            # a thread still in its step is kept, so that `start()` does not run a second one next to it
+            if not thread.is_alive():
+                self._thread = None
+        return self
@@ -0,0 +1,438 @@
+import os
+import socket
+import zlib
+from select import select
+from struct import Struct
+from time import perf_counter_ns
+from typing import Any, List, Self, Tuple, TypeAlias
+
+from .commands import (
+    CommandCanvas,
+    ScreenOp,
+    COMMAND_LAYOUTS,
+    decode_commands,
+    encode_command,
+    replay_commands,
+)
+from .logger import _logger
+from .periodic import PeriodicThread
+from .screen import ScreenDirection, _print_layout
+
+E9 = 1000000000
+
+# a unix socket path, or a (host, port) tcp address
+Address: TypeAlias = str | Tuple[str, int]
+
+# message layout, little endian without padding
+# kind, whether the middle is zlib compressed, prefix length, suffix length, middle length, then the middle
+_MESSAGE = Struct("<B?III")
+
+# replay the middle, keep the reference
+KIND_KEYFRAME = 0
+# replace the reference with the middle, replay nothing
+KIND_REFERENCE = 1
+# rebuild the frame from the reference and the middle, replay it and make it the reference
+KIND_DELTA = 2
+
+# middles shorter than this are sent as is, zlib would not pay off
+COMPRESS_ABOVE = 64
+
+
+def _common_prefix(a: bytes, b: bytes) -> int:
+    # bisect with slice comparisons, which run in C, instead of a loop over the bytes
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[:mid] == b[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def _common_suffix(a: bytes, b: bytes, limit: int) -> int:
+    len_a, len_b = len(a), len(b)
+    low, high = 0, limit
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[len_a - mid :] == b[len_b - mid :]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def encode_message(kind: int, reference: bytes, frame: bytes) -> bytes:
+    """
+    Encode a frame as the difference from a reference frame.
+
+    Args:
+        kind (int): The kind of the message, one of KIND_KEYFRAME, KIND_REFERENCE, KIND_DELTA.
+        reference (bytes): The frame the receiver holds, ignored unless the kind is KIND_DELTA.
+        frame (bytes): The frame to send.
+
+    Returns:
+        bytes: The message.
+    """
+    prefix = suffix = 0
+    if kind == KIND_DELTA:
+        prefix = _common_prefix(reference, frame)
+        suffix = _common_suffix(reference, frame, min(len(reference), len(frame)) - prefix)
+    middle = frame[prefix : len(frame) - suffix]
+    compressed = False
+    if len(middle) > COMPRESS_ABOVE and len(packed := zlib.compress(middle, 1)) < len(middle):
+        middle, compressed = packed, True
+    return _MESSAGE.pack(kind, compressed, prefix, suffix, len(middle)) + middle
+
+
+class MirrorStats:
+    """
+    The cost and the compression of the mirroring.
+    """
+
+    __slots__ = ("frames", "sent", "skipped", "raw_bytes", "sent_bytes", "mirror_ns", "frame_ns")
+
+    def __init__(self):
+        self.frames: int = 0
+        self.sent: int = 0
+        self.skipped: int = 0
+        self.raw_bytes: int = 0
+        self.sent_bytes: int = 0
+        self.mirror_ns: int = 0
+        self.frame_ns: int = 0
+
+    @property
+    def overhead(self) -> float:
+        """
+        the time spent mirroring as a fraction of the time between the refreshes
+        """
+        return self.mirror_ns / self.frame_ns if self.frame_ns else 0.0
+
+    @property
+    def compression(self) -> float:
+        """
+        the bytes sent per byte of command stream, lower is better
+        """
+        return self.sent_bytes / self.raw_bytes if self.raw_bytes else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"frames: {self.frames}, sent: {self.sent}, skipped: {self.skipped}, "
+            f"overhead: {self.overhead:.1%}, compression: {self.compression:.1%}"
+        )
+
+
+def _open_socket(address: Address) -> socket.socket:
+    if isinstance(address, str):
+        return socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    return socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+
+
+class MirrorScreen(CommandCanvas):
+    """
+    Draws on a `Screen` and mirrors every frame to the viewers connected to a socket.
+
+    Each drawing call is forwarded to the screen and recorded. On `refresh()`, the calls recorded since the last
+    frame sent are sent to the viewers as the difference from that frame, so a frame drawn like the previous one
+    costs a few bytes. The mirroring is throttled by a time budget: each refresh earns `max_overhead` of the time
+    since the previous one, and sending spends what it measured. A frame that cannot be afforded is merged into the
+    next one, so no call is lost. A viewer that connects gets the calls since the last `fill_screen()` first.
+    """
+
+    def __init__(
+        self,
+        screen: Any,
+        address: Address,
+        max_overhead: float = 0.1,
+        history_limit: int = 65536,
+        send_timeout: float = 0.05,
+    ):
+        """
+        Initializes an instance of the MirrorScreen class, listens on the address.
+
+        Args:
+            screen (Any): The `Screen` to draw on.
+            address (Address): A unix socket path, or a (host, port) tcp address.
+            max_overhead (float): The longest time spent mirroring, as a fraction of the time between the refreshes.
+                Defaults to 0.1.
+            history_limit (int): The most bytes of calls sent to the viewers that connect later, the history is
+                trimmed to its latest calls within this limit once it grows to twice the limit. Defaults to 65536.
+            send_timeout (float): The seconds after which a viewer that does not read is dropped. Defaults to 0.05.
+
+        Examples:
+            >>> screen = MirrorScreen(Screen(screen_dir=2), ("0.0.0.0", 9520), max_overhead=0.05)
+            >>> screen.fill_screen(Color.BLACK).put_string(0, 0, "hello").refresh()
+        """
+        super().__init__()
+        self._screen: Any = screen
+        self._address: Address = address
+        if isinstance(address, str) and os.path.exists(address):
+            os.unlink(address)
+        self._server: socket.socket = _open_socket(address)
+        if not isinstance(address, str):
+            self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind(address)
+        self._server.listen()
+        self._server.setblocking(False)
+        self._viewers: List[socket.socket] = []
+        self._max_overhead: float = max_overhead
+        self._history_limit: int = history_limit
+        self._send_timeout: float = send_timeout
+        self._history: bytearray = bytearray()
+        self._reference: bytes = b""
+        self._credit_ns: float = 0.0
+        self._last_refresh_ns: int | None = None
+        self._stats: MirrorStats = MirrorStats()
+        _logger.info("Mirroring the screen at [%s]", address)
+
+    @property
+    def address(self) -> Address:
+        """
+        the address the viewers connect to, with the port bound if 0 was given
+        """
+        return self._server.getsockname()
+
+    @property
+    def viewers(self) -> int:
+        """
+        the count of connected viewers
+        """
+        return len(self._viewers)
+
+    @property
+    def stats(self) -> MirrorStats:
+        """
+        the cost and the compression of the mirroring
+        """
+        return self._stats
+
+    def __getattr__(self, name: str) -> Any:
+        # the calls that draw nothing, e.g. the LEDs, go to the screen unrecorded
+        if name == "_screen":
+            raise AttributeError(name)
+        return getattr(self._screen, name)
+
+    def _record(self, op: ScreenOp, *args: Any) -> Self:
+        if op is ScreenOp.FILL_SCREEN:
+            self._history.clear()
+        start = len(self._commands)
+        super()._record(op, *args)
+        self._history += self._commands[start:]
+        if len(self._history) > 2 * self._history_limit:
+            # trimmed only once it doubles, so that the decoding of the trim is amortized over the calls
+            self._history = bytearray(_tail(bytes(self._history), self._history_limit))
+        getattr(self._screen, COMMAND_LAYOUTS[op][0])(*args)
+        return self
+
+    def print(self, display_string: str) -> Self:
+        """
+        Forward `Screen.print` as the put_string calls of its lines.
+        """
+        layout = _print_layout(
+            display_string, self._screen.font_size, self._screen.direction or ScreenDirection.HORIZONTAL
+        )
+        for y, line in layout:
+            self.put_string(0, y, line.decode())
+        return self
+
+    def refresh(self) -> Self:
+        """
+        Refresh the screen, then mirror the frame if the budget allows.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self._screen.refresh()
+        now = perf_counter_ns()
+        stats = self._stats
+        stats.frames += 1
+        if self._last_refresh_ns is not None:
+            elapsed = now - self._last_refresh_ns
+            stats.frame_ns += elapsed
+            # at most two frames of budget are saved up, so an idle period does not allow a burst
+            self._credit_ns = min(self._credit_ns + elapsed * self._max_overhead, 2 * elapsed * self._max_overhead)
+        self._last_refresh_ns = now
+
+        if self._credit_ns < 0:
+            stats.skipped += 1
+            return self
+        if self._viewers and self._commands:
+            frame = bytes(self._commands)
+            message = encode_message(KIND_DELTA, self._reference, frame)
+            self._broadcast(message)
+            stats.sent += 1
+            stats.raw_bytes += len(frame)
+            stats.sent_bytes += len(message)
+            self._reference = frame
+        if not self._viewers:
+            self._reference = b""
+        self._commands.clear()
+        self._accept()
+        cost = perf_counter_ns() - now
+        stats.mirror_ns += cost
+        self._credit_ns -= cost
+        return self
+
+    def _broadcast(self, message: bytes) -> None:
+        for viewer in tuple(self._viewers):
+            try:
+                viewer.sendall(message)
+            except OSError as e:
+                _logger.warning("Dropping a mirror viewer, %s", e)
+                self._viewers.remove(viewer)
+                viewer.close()
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                viewer, _ = self._server.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            viewer.settimeout(self._send_timeout)
+            history = bytes(self._history)
+            if len(history) > self._history_limit:
+                _logger.warning("Mirror history exceeds %s bytes, sending its tail only", self._history_limit)
+                history = _tail(history, self._history_limit)
+            try:
+                viewer.sendall(
+                    encode_message(KIND_KEYFRAME, b"", history)
+                    + encode_message(KIND_REFERENCE, b"", self._reference)
+                )
+            except OSError as e:
+                _logger.warning("Failed to greet a mirror viewer, %s", e)
+                viewer.close()
+                continue
+            self._viewers.append(viewer)
+
+    def close(self) -> None:
+        """
+        Disconnect the viewers and stop listening, the screen stays open.
+        """
+        for viewer in self._viewers:
+            viewer.close()
+        self._viewers.clear()
+        self._server.close()
+        if isinstance(self._address, str) and os.path.exists(self._address):
+            os.unlink(self._address)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _tail(history: bytes, limit: int) -> bytes:
+    # drop whole calls from the head until the rest fits
+    offset = 0
+    for op, args in decode_commands(history):
+        if len(history) - offset <= limit:
+            return history[offset:]
+        offset += len(encode_command(op, *args))
+    return b""
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = bytearray()
+    while len(chunks) < size:
+        chunk = sock.recv(size - len(chunks))
+        if not chunk:
+            raise ConnectionError("The mirror closed the connection")
+        chunks += chunk
+    return bytes(chunks)
+
+
+class MirrorViewer:
+    """
+    Receives the frames of a `MirrorScreen` and replays them onto a target with the drawing methods of `Screen`.
+    """
+
+    def __init__(self, address: Address, target: Any, timeout: float | None = 5.0):
+        """
+        Initializes an instance of the MirrorViewer class, connects to the mirror.
+
+        Args:
+            address (Address): The address of the mirror.
+            target (Any): The object to draw on, e.g. a `CommandCanvas` or a renderer of the desktop.
+            timeout (float, optional): The seconds to wait for the rest of a message. Defaults to 5.0.
+
+        Examples:
+            >>> viewer = MirrorViewer(("192.168.1.10", 9520), CommandCanvas()).start()
+        """
+        self._socket: socket.socket = _open_socket(address)
+        self._socket.connect(address)
+        self._socket.settimeout(timeout)
+        self._target: Any = target
+        self._reference: bytes = b""
+        # the poll blocks until a message arrives, so the timer does not wait in between
+        self._timer: PeriodicThread = PeriodicThread(self._replay, 0, "Mirror viewer", "pyuptech-mirror-viewer")
+        self.frames: int = 0
+
+    def _read_message(self) -> None:
+        kind, compressed, prefix, suffix, length = _MESSAGE.unpack(_recv_exact(self._socket, _MESSAGE.size))
+        middle = _recv_exact(self._socket, length) if length else b""
+        if compressed:
+            middle = zlib.decompress(middle)
+        if kind == KIND_KEYFRAME:
+            replay_commands(middle, self._target)
+        elif kind == KIND_REFERENCE:
+            self._reference = middle
+        else:
+            reference = self._reference
+            frame = reference[:prefix] + middle + reference[len(reference) - suffix :]
+            replay_commands(frame, self._target)
+            self._reference = frame
+            self.frames += 1
+
+    def poll(self, timeout: float = 0.0) -> int:
+        """
+        Replay the messages that arrived.
+
+        Args:
+            timeout (float): The seconds to wait for the first message. Defaults to 0.0.
+
+        Returns:
+            int: The count of messages replayed.
+        """
+        count = 0
+        while select([self._socket], [], [], timeout if count == 0 else 0)[0]:
+            self._read_message()
+            count += 1
+        return count
+
+    def start(self) -> Self:
+        """
+        Replay the messages in a daemon thread as they arrive.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self._timer.start()
+        return self
+
+    def stop(self, timeout: float | None = None) -> Self:
+        """
+        Stop the replaying thread.
+
+        Args:
+            timeout (float, optional): The seconds to wait for the thread to exit. Defaults to None.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self._timer.stop(timeout)
+        return self
+
+    def close(self) -> None:
+        """
+        Stop replaying and disconnect.
+        """
+        self.stop()
+        self._socket.close()
+
+    def _replay(self):
+        try:
+            self.poll(0.1)
+        except ConnectionError as e:
+            _logger.warning("Mirror viewer disconnected, %s", e)
+            self._timer.stop()
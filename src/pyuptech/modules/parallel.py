@@ -0,0 +1,114 @@
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter_ns
+from typing import Self, Tuple, TYPE_CHECKING
+
+from .constant import MPUDataPack
+from .snapshot import SensorSnapshot
+
+if TYPE_CHECKING:
+    from .sensors import OnBoardSensors
+
+
+class ParallelReadStats:
+    """
+    How much latency the parallel sweeps saved compared with reading the same subsystems back to back.
+    """
+
+    __slots__ = ("reads", "last_wall_ns", "last_serial_ns", "total_saved_ns")
+
+    def __init__(self):
+        self.reads: int = 0
+        self.last_wall_ns: int = 0
+        self.last_serial_ns: int = 0
+        self.total_saved_ns: int = 0
+
+    @property
+    def last_saved_ns(self) -> int:
+        """
+        the latency saved by the latest sweep, negative if the hand-off cost more than the overlap saved
+        """
+        return self.last_serial_ns - self.last_wall_ns
+
+    @property
+    def mean_saved_ns(self) -> float:
+        """
+        the mean latency saved per sweep
+        """
+        return self.total_saved_ns / self.reads if self.reads else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"reads: {self.reads}, last wall: {self.last_wall_ns / 1000:.1f}us, "
+            f"last serial: {self.last_serial_ns / 1000:.1f}us, mean saved: {self.mean_saved_ns / 1000:.1f}us"
+        )
+
+
+class ParallelReader:
+    """
+    Sweeps the ADC-IO channel and the MPU at the same time.
+
+    The ADC and the IO share the ADC-IO channel, and the three MPU reads share the MPU, so the sweep is split into
+    these two groups: the MPU group runs on a persistent worker thread while the calling thread reads the ADC-IO
+    group. ctypes releases the GIL during the calls, so the two groups overlap.
+    """
+
+    def __init__(self, sensors: "OnBoardSensors"):
+        """
+        Initializes an instance of the ParallelReader class, starts the worker thread lazily.
+
+        Args:
+            sensors (OnBoardSensors): The sensors to sweep.
+        """
+        self._sensors: "OnBoardSensors" = sensors
+        self._executor: ThreadPoolExecutor | None = None
+        self._stats: ParallelReadStats = ParallelReadStats()
+
+    @property
+    def stats(self) -> ParallelReadStats:
+        """
+        the latency statistics of the sweeps
+        """
+        return self._stats
+
+    def _read_mpu(self) -> Tuple[MPUDataPack, MPUDataPack, MPUDataPack, int]:
+        sensors = self._sensors
+        start = perf_counter_ns()
+        acc, gyro, atti = sensors.acc_all(), sensors.gyro_all(), sensors.atti_all()
+        return acc, gyro, atti, perf_counter_ns() - start
+
+    def read(self) -> SensorSnapshot:
+        """
+        Sweep all the sensors once.
+
+        Returns:
+            SensorSnapshot: The readings of the ADC, the IO and the MPU.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pyuptech-mpu-reader")
+        sensors = self._sensors
+        start = perf_counter_ns()
+        mpu_future = self._executor.submit(self._read_mpu)
+        adc = sensors.adc_all_channels()
+        io = sensors.io_all_channels()
+        adc_io_ns = perf_counter_ns() - start
+        acc, gyro, atti, mpu_ns = mpu_future.result()
+        wall_ns = perf_counter_ns() - start
+
+        stats = self._stats
+        stats.reads += 1
+        stats.last_wall_ns = wall_ns
+        stats.last_serial_ns = adc_io_ns + mpu_ns
+        stats.total_saved_ns += stats.last_serial_ns - wall_ns
+        return SensorSnapshot(adc, io, acc, gyro, atti, start)
+
+    def close(self) -> Self:
+        """
+        Stop the worker thread, it is started again by the next `read()`.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        return self
@@ -0,0 +1,109 @@
+import os
+from threading import Thread, Event, current_thread, get_native_id
+from time import perf_counter_ns
+from typing import Any, Callable, Self
+
+from .logger import _logger
+
+E9 = 1000000000
+
+
+class PeriodicThread:
+    """
+    Calls a function at a fixed interval in a daemon thread, the timer shared by the background workers.
+
+    The deadlines advance by the interval, when a call runs past the next deadline the schedule is realigned to the
+    current time instead of bursting to catch up. An exception raised by the function is logged, and the calls go on.
+    """
+
+    def __init__(
+        self,
+        target: Callable[[], Any],
+        interval_ns: int,
+        name: str,
+        thread_name: str,
+        niceness: int = 0,
+    ):
+        """
+        Initializes an instance of the PeriodicThread class.
+
+        Args:
+            target (Callable[[], Any]): The function to call each interval.
+            interval_ns (int): The interval between two calls, read before each wait so that it can be changed while
+                running.
+            name (str): The name of the worker in the logs, e.g. "LED animator".
+            thread_name (str): The name of the thread, e.g. "pyuptech-led-animator".
+            niceness (int): Lower the priority of the thread by this much on linux, 0 to leave it. Defaults to 0.
+        """
+        self.interval_ns: int = interval_ns
+        self._target: Callable[[], Any] = target
+        self._name: str = name
+        self._thread_name: str = thread_name
+        self._niceness: int = niceness
+        self._stop_event: Event = Event()
+        self._thread: Thread | None = None
+
+    @property
+    def is_running(self) -> bool:
+        """
+        whether the thread is alive
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> Self:
+        """
+        Start calling the function in a daemon thread, warns if the thread of the last start has not exited yet.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        if self.is_running:
+            _logger.warning("%s is already running", self._name)
+            return self
+        # each run gets its own event, so a thread that outlived its stop can not be woken up again by a restart
+        self._stop_event = Event()
+        self._thread = Thread(target=self._run, args=(self._stop_event,), name=self._thread_name, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = None) -> Self:
+        """
+        Stop the thread after the current call, the function may call it to stop its own thread.
+
+        Args:
+            timeout (float, optional): The seconds to wait for the thread to exit. Defaults to None.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self._stop_event.set()
+        if (thread := self._thread) is not None:
+            if thread is not current_thread():
+                thread.join(timeout)
+            # a thread still in its call is kept, so that `is_running` holds and `start()` does not run a second one
+            if not thread.is_alive():
+                self._thread = None
+        return self
+
+    def _run(self, stop_event: Event):
+        if self._niceness:
+            try:
+                # on linux the priority of a single thread is set through its native id
+                os.setpriority(os.PRIO_PROCESS, get_native_id(), os.getpriority(os.PRIO_PROCESS, 0) + self._niceness)
+            except (AttributeError, OSError) as e:
+                _logger.debug("Failed to lower the priority of the %s, %s", self._name, e)
+        target = self._target
+        wait = stop_event.wait
+        deadline = perf_counter_ns()
+        while True:
+            try:
+                target()
+            except Exception as e:
+                _logger.error("%s failed, %s", self._name, e)
+            deadline += self.interval_ns
+            now = perf_counter_ns()
+            if deadline < now:
+                # behind schedule, realign instead of bursting
+                deadline = now
+            if wait((deadline - now) / E9):
+                return
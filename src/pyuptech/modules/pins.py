@@ -1,4 +1,4 @@
-from typing import Sequence, Callable, TypeAlias, SupportsIndex
+from typing import Sequence, Callable, TypeAlias, SupportsIndex, Any, Tuple
 
 PinSetter: TypeAlias = Callable[[int], None]
 PinGetter: TypeAlias = Callable[[], int]
@@ -82,3 +82,193 @@ def multiple_pin_mode_setter_constructor(
             indexed_mode_setter(pin, mode)
 
     return set_pin_mode
+
+
+MaskGetter: TypeAlias = Callable[[], int]
+MaskSetter: TypeAlias = Callable[[int], Any]
+
+
+class Pin:
+    """
+    A single io pin with its mask and shift precomputed.
+
+    The pin can be used alone, or it can be used to pick its level out of a mask that was read elsewhere.
+    """
+
+    __slots__ = ("index", "mask", "shift", "_mask_getter", "_mask_setter", "_levels_getter")
+
+    def __init__(
+        self,
+        index: int,
+        mask_getter: MaskGetter | None = None,
+        mask_setter: MaskSetter | None = None,
+        levels_getter: MaskGetter | None = None,
+    ):
+        """
+
+        Args:
+            index: the index of the io pin, 0~7
+            mask_getter: the function that returns the level mask of all the pins, e.g. `OnBoardSensors.io_all_channels`
+            mask_setter: the function that sets the level mask of all the pins, e.g. `OnBoardSensors.set_all_io_levels`
+            levels_getter: the function that returns the output levels the other pins keep on a write, e.g.
+                `OnBoardSensors.io_output_levels`, the mask getter is read before each write if None
+        """
+        if not 0 <= index < 8:
+            raise ValueError(f"Pin index must be between 0 and 7, got {index}")
+        self.index: int = index
+        self.shift: int = index
+        self.mask: int = 1 << index
+        self._mask_getter: MaskGetter | None = mask_getter
+        self._mask_setter: MaskSetter | None = mask_setter
+        self._levels_getter: MaskGetter | None = levels_getter or mask_getter
+
+    def __repr__(self) -> str:
+        return f"Pin({self.index})"
+
+    def level_of(self, io_mask: int) -> int:
+        """
+        Pick the level of this pin out of an io mask.
+
+        Args:
+            io_mask: the level mask of all the pins
+
+        Returns:
+            the level of this pin, 1 for high, 0 for low
+        """
+        return (io_mask >> self.shift) & 1
+
+    def get(self) -> int:
+        """
+        Read the level of this pin with the mask getter.
+
+        Returns:
+            the level of this pin, 1 for high, 0 for low
+        """
+        return (self._mask_getter() >> self.shift) & 1
+
+    def set(self, level: int) -> None:
+        """
+        Set the level of this pin, the other pins keep the levels returned by the levels getter.
+
+        Args:
+            level: the level to set, 1 for high, 0 for low
+
+        Raises:
+            ValueError: if the pin has no mask setter, i.e. it is an input pin
+        """
+        if self._mask_setter is None:
+            raise ValueError(f"{self!r} has no mask setter, an input pin can not be set")
+        current = self._levels_getter()
+        self._mask_setter(current | self.mask if level else current & ~self.mask)
+
+
+class PinGroup:
+    """
+    A group of io pins that are read with a single mask read and written with a single mask write.
+
+    On a write the pins outside the group keep the levels returned by the levels getter. The groups made by
+    `OnBoardSensors.pin_group` take them from the output level shadow of the sensors, which every level setter
+    updates, so a masked write costs a single `adc_io_SetAll` and does not revert the pins written elsewhere.
+
+    Examples:
+        >>> group = PinGroup([0, 2, 5], sensors.io_all_channels, sensors.set_all_io_levels)
+        >>> left, middle, right = group.read()
+        >>> group.write([1, 0, 1])
+    """
+
+    __slots__ = ("pins", "mask", "_shifts", "_mask_getter", "_mask_setter", "_levels_getter")
+
+    def __init__(
+        self,
+        pins: Sequence[int | Pin],
+        mask_getter: MaskGetter,
+        mask_setter: MaskSetter | None = None,
+        levels_getter: MaskGetter | None = None,
+    ):
+        """
+
+        Args:
+            pins: the pins of the group, either indexes or Pin objects, the order defines the order of the levels
+            mask_getter: the function that returns the level mask of all the pins, e.g. `OnBoardSensors.io_all_channels`
+            mask_setter: the function that sets the level mask of all the pins, e.g. `OnBoardSensors.set_all_io_levels`
+            levels_getter: the function that returns the output levels the other pins keep on a write, e.g.
+                `OnBoardSensors.io_output_levels`, the mask getter is read before each write if None
+        """
+        self.pins: Tuple[Pin, ...] = tuple(
+            pin if isinstance(pin, Pin) else Pin(pin, mask_getter, mask_setter, levels_getter)
+            for pin in pins
+        )
+        self.mask: int = 0
+        for pin in self.pins:
+            self.mask |= pin.mask
+        self._shifts: Tuple[int, ...] = tuple(pin.shift for pin in self.pins)
+        self._mask_getter: MaskGetter = mask_getter
+        self._mask_setter: MaskSetter | None = mask_setter
+        self._levels_getter: MaskGetter = levels_getter or mask_getter
+
+    def __repr__(self) -> str:
+        return f"PinGroup({[pin.index for pin in self.pins]})"
+
+    def __len__(self) -> int:
+        return len(self.pins)
+
+    def levels_of(self, io_mask: int) -> Tuple[int, ...]:
+        """
+        Pick the levels of the pins out of an io mask.
+
+        Args:
+            io_mask: the level mask of all the pins
+
+        Returns:
+            the levels of the pins, in the order of the group
+        """
+        return tuple((io_mask >> shift) & 1 for shift in self._shifts)
+
+    def read(self) -> Tuple[int, ...]:
+        """
+        Read the levels of all the pins with a single call to the mask getter.
+
+        Returns:
+            the levels of the pins, in the order of the group
+        """
+        io_mask = self._mask_getter()
+        return tuple((io_mask >> shift) & 1 for shift in self._shifts)
+
+    def read_mask(self) -> int:
+        """
+        Read the levels of all the pins with a single call to the mask getter.
+
+        Returns:
+            the io mask with the bits not belonging to the group cleared
+        """
+        return self._mask_getter() & self.mask
+
+    def write(self, levels: Sequence[int]) -> None:
+        """
+        Set the levels of all the pins with a single call to the mask setter.
+
+        Args:
+            levels: the levels of the pins, in the order of the group
+        """
+        if len(levels) != len(self._shifts):
+            raise ValueError(f"Expected {len(self._shifts)} levels, got {len(levels)}")
+        bits = 0
+        for shift, level in zip(self._shifts, levels):
+            if level:
+                bits |= 1 << shift
+        self.write_mask(bits)
+
+    def write_mask(self, bits: int) -> None:
+        """
+        Set the levels of all the pins with a single call to the mask setter, the pins outside the group keep the
+        levels returned by the levels getter.
+
+        Args:
+            bits: the io mask to apply, the bits not belonging to the group are ignored
+
+        Raises:
+            ValueError: if the group has no mask setter, i.e. it is a group of input pins
+        """
+        if self._mask_setter is None:
+            raise ValueError(f"{self!r} has no mask setter, input pins can not be set")
+        self._mask_setter((self._levels_getter() & ~self.mask) | (bits & self.mask))
@@ -0,0 +1,208 @@
+from operator import itemgetter
+from typing import Any, Callable, List, Self, Sequence, Tuple
+
+from .screen import Color
+
+
+class Sparkline:
+    """
+    A sweeping plot of one or more series inside a rectangle of the screen.
+
+    The samples are kept in a ring buffer of one column per sample. uGUI cannot scroll a region, so instead of
+    shifting the plot, the write cursor sweeps across it like an oscilloscope: each new sample erases and draws only
+    its own column, and clears the column ahead of it as a gap marking the oldest data. The whole plot is redrawn
+    only when the autoscaled range changes, which the hysteresis keeps rare.
+    """
+
+    def __init__(
+        self,
+        screen: Any,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        colors: Sequence[Color | int] = (Color.GREEN,),
+        background: Color | int = Color.BLACK,
+        y_range: Tuple[float, float] | None = None,
+        margin: float = 0.1,
+        shrink_below: float = 0.5,
+    ):
+        """
+        Initializes an instance of the Sparkline class.
+
+        Args:
+            screen (Any): The `Screen`, or any object with the same drawing methods, e.g. a `CommandCanvas`.
+            x (int): The X coordinate of the top-left corner.
+            y (int): The Y coordinate of the top-left corner.
+            width (int): The width in pixels, which is also the count of samples shown.
+            height (int): The height in pixels.
+            colors (Sequence[Color | int]): The color of each series, one per series. Defaults to a single green one.
+            background (Color | int): The background color. Defaults to Color.BLACK.
+            y_range (Tuple[float, float], optional): The fixed (bottom, top) values, autoscale if None. Defaults to None.
+            margin (float): The headroom added on both sides when the range is fitted, as a fraction of the data span.
+                Defaults to 0.1.
+            shrink_below (float): The range shrinks back onto the data once a whole sweep spans less than this
+                fraction of it, it grows at once whenever a sample falls outside. Defaults to 0.5.
+
+        Examples:
+            >>> plot = Sparkline(screen, 0, 32, 128, 32, colors=(Color.RED, Color.BLUE))
+            >>> plot.bind(sensors.adc_all_channels, (0, 1))
+            >>> plot.sample()
+        """
+        if width < 2 or height < 2:
+            raise ValueError(f"The plot must be at least 2x2 pixels, got {width}x{height}")
+        if not colors:
+            raise ValueError("At least one series is required")
+        self._screen: Any = screen
+        self._x: int = x
+        self._y: int = y
+        self._width: int = width
+        self._height: int = height
+        self._colors: Tuple[int, ...] = tuple(colors)
+        self._background: int = background
+        self._autoscale: bool = y_range is None
+        self._low, self._high = y_range if y_range is not None else (0.0, 1.0)
+        self._margin: float = margin
+        self._shrink_below: float = shrink_below
+        self._samples: List[List[float | None]] = [[None] * width for _ in self._colors]
+        self._cursor: int = 0
+        self._source: Callable[[], Sequence[float]] | None = None
+        self.columns_drawn: int = 0
+        self.full_redraws: int = 0
+
+    @property
+    def y_range(self) -> Tuple[float, float]:
+        """
+        the values at the bottom and the top of the plot
+        """
+        return self._low, self._high
+
+    @property
+    def series(self) -> int:
+        """
+        the count of series plotted
+        """
+        return len(self._colors)
+
+    def bind(self, source: Callable[[], Sequence[float]], indices: Sequence[int] | None = None) -> Self:
+        """
+        Bind the plot to a getter, e.g. of `OnBoardSensors`, for `sample()`.
+
+        Args:
+            source (Callable[[], Sequence[float]]): The getter returning the readings.
+            indices (Sequence[int], optional): The indices of the readings to plot, one per series, the first readings
+                if None. Defaults to None.
+
+        Returns:
+            Self: The instance of the class.
+
+        Examples:
+            >>> plot.bind(sensors.atti_all, (2,))  # the yaw
+        """
+        if indices is None:
+            indices = range(self.series)
+        if len(indices) != self.series:
+            raise ValueError(f"Expected {self.series} indices, one per series, got {len(indices)}")
+        pick = itemgetter(*indices)
+        if len(indices) == 1:
+            self._source = lambda: (pick(source()),)
+        else:
+            self._source = lambda: pick(source())
+        return self
+
+    def sample(self) -> Self:
+        """
+        Read the bound getter and push the readings.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        return self.push(*self._source())
+
+    def push(self, *values: float) -> Self:
+        """
+        Append a sample of every series and draw its column.
+
+        Args:
+            *values (float): The value of each series.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        if len(values) != self.series:
+            raise ValueError(f"Expected {self.series} values, one per series, got {len(values)}")
+        cursor = self._cursor
+        for samples, value in zip(self._samples, values):
+            samples[cursor] = value
+        self._cursor = (cursor + 1) % self._width
+
+        if self._autoscale and self._rescale(values):
+            return self.redraw()
+        self._draw_column(cursor)
+        self._erase_column(self._cursor)
+        return self
+
+    def redraw(self) -> Self:
+        """
+        Clear the plot and draw every column.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self.full_redraws += 1
+        x, y = self._x, self._y
+        self._screen.fill_frame(x, y, x + self._width - 1, y + self._height - 1, self._background)
+        for column in range(self._width):
+            if column != self._cursor:
+                self._draw_column(column, erase=False)
+        return self
+
+    def _rescale(self, values: Sequence[float]) -> bool:
+        low, high = self._low, self._high
+        if self.columns_drawn == 0 and self.full_redraws == 0:
+            # fit onto the first sample
+            return self._fit()
+        if min(values) < low or max(values) > high:
+            return self._fit()
+        if self._cursor == 0:
+            # once per sweep, shrink if the data has settled into a small part of the range
+            data_low, data_high = self._data_span()
+            if data_high - data_low < self._shrink_below * (high - low):
+                return self._fit()
+        return False
+
+    def _data_span(self) -> Tuple[float, float]:
+        present = [value for samples in self._samples for value in samples if value is not None]
+        return min(present), max(present)
+
+    def _fit(self) -> bool:
+        data_low, data_high = self._data_span()
+        padding = (data_high - data_low) * self._margin if data_high > data_low else 1.0
+        self._low, self._high = data_low - padding, data_high + padding
+        return True
+
+    def _to_row(self, value: float) -> int:
+        bottom = self._y + self._height - 1
+        row = bottom - round((value - self._low) * (self._height - 1) / (self._high - self._low))
+        return min(max(row, self._y), bottom)
+
+    def _erase_column(self, column: int) -> None:
+        x = self._x + column
+        self._screen.draw_line(x, self._y, x, self._y + self._height - 1, self._background)
+
+    def _draw_column(self, column: int, erase: bool = True) -> None:
+        if erase:
+            self._erase_column(column)
+        screen = self._screen
+        x = self._x + column
+        # the previous column is connected unless it is the gap ahead of the cursor
+        previous = column - 1 if column and column - 1 != self._cursor else None
+        for samples, color in zip(self._samples, self._colors):
+            if (value := samples[column]) is None:
+                continue
+            row = self._to_row(value)
+            if previous is not None and (last := samples[previous]) is not None:
+                screen.draw_line(x - 1, self._to_row(last), x, row, color)
+            else:
+                screen.draw_pixel(x, row, color)
+        self.columns_drawn += 1
@@ -0,0 +1,248 @@
+import json
+import tomllib
+from itertools import chain
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, Iterator, List, Literal, Mapping, NamedTuple, Self, Sequence, Tuple
+
+from .logger import _logger
+from .screen import FontSize, ScreenDirection
+from .sensors import DEFAULT_GYRO_FSR, DEFAULT_ACC_FSR
+
+E6 = 1000000
+
+GYRO_FSRS = (250, 500, 1000, 2000)
+ACC_FSRS = (2, 4, 8, 16)
+
+IO_CHANNELS = 8
+_IO_MASK = (1 << IO_CHANNELS) - 1
+
+
+class ProfileStep(NamedTuple):
+    """
+    A call needed to bring the board to a profile.
+    """
+
+    target: Literal["sensors", "screen"]
+    method: str
+    args: Tuple
+
+
+def _bits(value: int | str | None) -> int | None:
+    # json has no binary literals, so "0b11110000" is accepted as well
+    if value is None:
+        return None
+    value = int(value, 0) if isinstance(value, str) else int(value)
+    if not 0 <= value <= _IO_MASK:
+        raise ValueError(f"An IO bit field must fit in {IO_CHANNELS} bits, got {value:#x}")
+    return value
+
+
+class BoardProfile:
+    """
+    The desired state of the board: the IO modes and levels, the MPU full scale ranges, the screen and the LEDs.
+
+    Applying a profile compares it with the current state first, read from the hardware where it is cheap (the IO
+    modes and levels) and from the caches of `OnBoardSensors` and `Screen` otherwise, and only issues the calls that
+    change something. A field left as None is not touched.
+    """
+
+    def __init__(
+        self,
+        open_adc_io: bool = False,
+        io_modes: int | None = None,
+        io_levels: int | None = None,
+        open_mpu: bool = False,
+        gyro_fsr: int | None = None,
+        acc_fsr: int | None = None,
+        screen_direction: int | None = None,
+        font_size: FontSize | int | str | None = None,
+        leds: Sequence[int] | None = None,
+    ):
+        """
+        Initializes an instance of the BoardProfile class.
+
+        Args:
+            open_adc_io (bool): Whether the adc-io plug should be open. Defaults to False.
+            io_modes (int, optional): The mode of each IO, bit i for IO i, 1 for output. Defaults to None.
+            io_levels (int, optional): The level of each output IO, bit i for IO i. Defaults to None.
+            open_mpu (bool): Whether the MPU6500 should be initialized. Defaults to False.
+            gyro_fsr (int, optional): The gyroscope full scale range, one of 250, 500, 1000, 2000. Defaults to None.
+            acc_fsr (int, optional): The accelerometer full scale range, one of 2, 4, 8, 16. Defaults to None.
+            screen_direction (int, optional): The direction the LCD should be opened in, 1 or 2. Defaults to None.
+            font_size (FontSize | int | str, optional): The font of the LCD, or its value or name, e.g. "FONT_8X12".
+                Defaults to None.
+            leds (Sequence[int], optional): The colors of the two LEDs. Defaults to None.
+
+        Examples:
+            >>> profile = BoardProfile(open_adc_io=True, io_modes=0b11110000, io_levels=0, open_mpu=True, gyro_fsr=500)
+            >>> profile.apply(sensors, screen)
+        """
+        if gyro_fsr is not None and gyro_fsr not in GYRO_FSRS:
+            raise ValueError(f"Gyro FSR must be one of {GYRO_FSRS}, got {gyro_fsr}")
+        if acc_fsr is not None and acc_fsr not in ACC_FSRS:
+            raise ValueError(f"Accel FSR must be one of {ACC_FSRS}, got {acc_fsr}")
+        if leds is not None and len(leds) != 2:
+            raise ValueError(f"Expected the colors of 2 LEDs, got {len(leds)}")
+        self.open_adc_io: bool = open_adc_io
+        self.io_modes: int | None = _bits(io_modes)
+        self.io_levels: int | None = _bits(io_levels)
+        self.open_mpu: bool = open_mpu
+        self.gyro_fsr: int | None = gyro_fsr
+        self.acc_fsr: int | None = acc_fsr
+        self.screen_direction: ScreenDirection | None = (
+            ScreenDirection(screen_direction) if screen_direction is not None else None
+        )
+        if isinstance(font_size, str):
+            if font_size not in FontSize.__members__:
+                raise ValueError(f"Unknown font size {font_size!r}")
+            font_size = FontSize[font_size]
+        self.font_size: FontSize | None = FontSize(font_size) if font_size is not None else None
+        self.leds: Tuple[int, int] | None = (int(leds[0]), int(leds[1])) if leds is not None else None
+
+    @classmethod
+    def from_dict(cls, profile: Mapping[str, Any]) -> Self:
+        """
+        Create a profile from a dict, a missing section or key is left untouched.
+
+        Args:
+            profile: {"io": {"open": true, "modes": "0b11110000", "levels": 0},
+                      "mpu": {"open": true, "gyro_fsr": 2000, "acc_fsr": 8},
+                      "screen": {"direction": 2, "font_size": "FONT_8X12", "leds": [16711680, 0]}}
+                the adc-io plug and the MPU are opened if their section is present, unless "open" is false
+        """
+        io = profile.get("io")
+        mpu = profile.get("mpu")
+        screen = profile.get("screen", {})
+        return cls(
+            open_adc_io=io is not None and io.get("open", True),
+            io_modes=(io or {}).get("modes"),
+            io_levels=(io or {}).get("levels"),
+            open_mpu=mpu is not None and mpu.get("open", True),
+            gyro_fsr=(mpu or {}).get("gyro_fsr"),
+            acc_fsr=(mpu or {}).get("acc_fsr"),
+            screen_direction=screen.get("direction"),
+            font_size=screen.get("font_size"),
+            leds=screen.get("leds"),
+        )
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> Self:
+        """
+        Load a profile from a .json or a .toml file, in the layout of `from_dict`.
+
+        Args:
+            path: the path of the file
+        """
+        path = Path(path)
+        if path.suffix == ".toml":
+            with path.open("rb") as f:
+                return cls.from_dict(tomllib.load(f))
+        with path.open("r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def plan(self, sensors: Any = None, screen: Any = None) -> List[ProfileStep]:
+        """
+        The calls that applying the profile would make, without making them.
+
+        The IO state of a plug that is not open yet is unknown, so all the IO fields are planned then.
+
+        Args:
+            sensors (Any): The `OnBoardSensors`, needed if the profile has IO or MPU fields. Defaults to None.
+            screen (Any): The `Screen`, needed if the profile has screen or LED fields. Defaults to None.
+
+        Returns:
+            List[ProfileStep]: The calls, in order.
+        """
+        return list(self._steps(sensors, screen, False))
+
+    def apply(self, sensors: Any = None, screen: Any = None) -> List[ProfileStep]:
+        """
+        Bring the board to the profile, with only the calls that change something.
+
+        Args:
+            sensors (Any): The `OnBoardSensors`, needed if the profile has IO or MPU fields. Defaults to None.
+            screen (Any): The `Screen`, needed if the profile has screen or LED fields. Defaults to None.
+
+        Returns:
+            List[ProfileStep]: The calls made, in order.
+        """
+        started = perf_counter_ns()
+        steps = list(self._steps(sensors, screen, True))
+        _logger.info("Board profile applied with %s calls in %.1fms", len(steps), (perf_counter_ns() - started) / E6)
+        return steps
+
+    def _steps(self, sensors: Any, screen: Any, execute: bool) -> Iterator[ProfileStep]:
+        uses_sensors = self.open_adc_io or self.open_mpu or self.gyro_fsr is not None or self.acc_fsr is not None
+        uses_sensors = uses_sensors or self.io_modes is not None or self.io_levels is not None
+        uses_screen = self.screen_direction is not None or self.font_size is not None or self.leds is not None
+        for target, used, given in (("sensors", uses_sensors, sensors), ("screen", uses_screen, screen)):
+            if used and given is None:
+                raise ValueError(f"The profile sets the {target}, but no {target} was given")
+        targets = {"sensors": sensors, "screen": screen}
+        # each step runs before the next one is planned, so the IO state is read after the plug is opened
+        for step in chain(
+            self._sensor_steps(sensors, execute) if uses_sensors else (),
+            self._screen_steps(screen) if uses_screen else (),
+        ):
+            if execute:
+                getattr(targets[step.target], step.method)(*step.args)
+            yield step
+
+    def _sensor_steps(self, sensors: Any, execute: bool) -> Iterator[ProfileStep]:
+        opened = sensors.adc_io_opened
+        if self.open_adc_io and not opened:
+            yield ProfileStep("sensors", "adc_io_open", ())
+            # the open may fail, the IO state is only read if the plug is open after it
+            opened = execute and sensors.adc_io_opened
+        if self.io_modes is not None or self.io_levels is not None:
+            yield from self._io_steps(sensors, opened)
+
+        mpu_opened = sensors.mpu_opened
+        gyro_fsr, acc_fsr = sensors.gyro_fsr, sensors.acc_fsr
+        if self.open_mpu and not mpu_opened:
+            yield ProfileStep("sensors", "MPU6500_Open", ())
+            # the initialization resets the ranges
+            gyro_fsr, acc_fsr = DEFAULT_GYRO_FSR, DEFAULT_ACC_FSR
+        if self.gyro_fsr is not None and self.gyro_fsr != gyro_fsr:
+            yield ProfileStep("sensors", "mpu_set_gyro_fsr", (self.gyro_fsr,))
+        if self.acc_fsr is not None and self.acc_fsr != acc_fsr:
+            yield ProfileStep("sensors", "mpu_set_accel_fsr", (self.acc_fsr,))
+
+    def _io_steps(self, sensors: Any, known: bool) -> Iterator[ProfileStep]:
+        modes = sensors.get_all_io_mode() if known else None
+        changed_modes = False
+        if self.io_modes is not None and self.io_modes != modes:
+            changed_modes = True
+            if modes is None and self.io_modes in (0, _IO_MASK):
+                yield ProfileStep("sensors", "set_all_io_mode", (self.io_modes & 1,))
+            else:
+                differing = _IO_MASK if modes is None else self.io_modes ^ modes
+                for index in range(IO_CHANNELS):
+                    if differing >> index & 1:
+                        yield ProfileStep("sensors", "set_io_mode", (index, self.io_modes >> index & 1))
+        if self.io_levels is None:
+            return
+        if not known or changed_modes:
+            yield ProfileStep("sensors", "set_all_io_levels", (self.io_levels,))
+            return
+        outputs = modes if self.io_modes is None else self.io_modes
+        # only the levels of the outputs are driven, the inputs read whatever is wired to them
+        if (sensors.io_all_channels() ^ self.io_levels) & outputs:
+            yield ProfileStep("sensors", "set_all_io_levels", (self.io_levels,))
+
+    def _screen_steps(self, screen: Any) -> Iterator[ProfileStep]:
+        if self.screen_direction is not None and screen.direction != self.screen_direction:
+            yield ProfileStep("screen", "open", (self.screen_direction.value,))
+        if self.font_size is not None and screen.font_size != self.font_size:
+            yield ProfileStep("screen", "set_font_size", (self.font_size,))
+        if self.leds is None:
+            return
+        first, second = self.leds
+        shown_first, shown_second = screen.led_colors
+        if shown_first != first and shown_second != second:
+            yield ProfileStep("screen", "set_all_leds_single", (first, second))
+        elif shown_first != first:
+            yield ProfileStep("screen", "set_led_color", (0, first))
+        elif shown_second != second:
+            yield ProfileStep("screen", "set_led_color", (1, second))
@@ -1,9 +1,14 @@
 from enum import Enum, IntEnum
-from typing import Literal, Self, Tuple
+from functools import lru_cache
+from threading import RLock
+from typing import Dict, List, Literal, Self, Tuple
 
 from .constant import LIB_FILE_PATH
 from .loader import load_lib
+from .locks import LCD_LOCK, ADC_IO_LOCK
 from .logger import _logger
+from .sprite import Sprite
+from .text import layout_text
 
 
 class ScreenDirection(IntEnum):
@@ -22,10 +27,7 @@ class ScreenDirection(IntEnum):
         :return: An integer representing the width of the screen.
         :rtype: int
         """
-        return {
-            ScreenDirection.VERTICAL: 64,
-            ScreenDirection.HORIZONTAL: 128,
-        }[self]
+        return _SCREEN_SIZES[self][0]
 
     @property
     def height(self) -> int:
@@ -35,10 +37,7 @@ class ScreenDirection(IntEnum):
         :return: An integer representing the height of the screen.
         :rtype: int
         """
-        return {
-            ScreenDirection.VERTICAL: 128,
-            ScreenDirection.HORIZONTAL: 64,
-        }[self]
+        return _SCREEN_SIZES[self][1]
 
 
 class FontSize(Enum):
@@ -70,23 +69,7 @@ class FontSize(Enum):
         :return: An integer representing the row height of the current font size.
         :rtype: int
         """
-        return {
-            FontSize.FONT_4X6: 6,
-            FontSize.FONT_5X8: 8,
-            FontSize.FONT_5X12: 12,
-            FontSize.FONT_6X8: 8,
-            FontSize.FONT_6X10: 10,
-            FontSize.FONT_7X12: 12,
-            FontSize.FONT_8X8: 8,
-            FontSize.FONT_8X12: 12,
-            FontSize.FONT_8X14: 14,
-            FontSize.FONT_10X16: 16,
-            FontSize.FONT_12X16: 16,
-            FontSize.FONT_12X20: 20,
-            FontSize.FONT_16X26: 26,
-            FontSize.FONT_22X36: 36,
-            FontSize.FONT_24X40: 40,
-        }[self]
+        return _FONT_METRICS[self][1]
 
     @property
     def column_width(self) -> int:
@@ -96,23 +79,34 @@ class FontSize(Enum):
         :return: An integer representing the column width of the current font size.
         :rtype: int
         """
-        return {
-            FontSize.FONT_4X6: 4,
-            FontSize.FONT_5X8: 5,
-            FontSize.FONT_5X12: 5,
-            FontSize.FONT_6X8: 6,
-            FontSize.FONT_6X10: 6,
-            FontSize.FONT_7X12: 7,
-            FontSize.FONT_8X8: 8,
-            FontSize.FONT_8X12: 8,
-            FontSize.FONT_8X14: 8,
-            FontSize.FONT_10X16: 10,
-            FontSize.FONT_12X16: 12,
-            FontSize.FONT_12X20: 12,
-            FontSize.FONT_16X26: 16,
-            FontSize.FONT_22X36: 22,
-            FontSize.FONT_24X40: 24,
-        }[self]
+        return _FONT_METRICS[self][0]
+
+
+# the metrics are looked up on every layout, so they are built once instead of on each access
+# direction => (width, height) in pixels
+_SCREEN_SIZES: Dict[ScreenDirection, Tuple[int, int]] = {
+    ScreenDirection.VERTICAL: (64, 128),
+    ScreenDirection.HORIZONTAL: (128, 64),
+}
+
+# font => (column width, row height) in pixels
+_FONT_METRICS: Dict[FontSize, Tuple[int, int]] = {
+    FontSize.FONT_4X6: (4, 6),
+    FontSize.FONT_5X8: (5, 8),
+    FontSize.FONT_5X12: (5, 12),
+    FontSize.FONT_6X8: (6, 8),
+    FontSize.FONT_6X10: (6, 10),
+    FontSize.FONT_7X12: (7, 12),
+    FontSize.FONT_8X8: (8, 8),
+    FontSize.FONT_8X12: (8, 12),
+    FontSize.FONT_8X14: (8, 14),
+    FontSize.FONT_10X16: (10, 16),
+    FontSize.FONT_12X16: (12, 16),
+    FontSize.FONT_12X20: (12, 20),
+    FontSize.FONT_16X26: (16, 26),
+    FontSize.FONT_22X36: (22, 36),
+    FontSize.FONT_24X40: (24, 40),
+}
 
 
 class Color(IntEnum):
@@ -173,6 +167,14 @@ class Color(IntEnum):
     DARKRED = new_color(139, 0, 0)
 
 
+@lru_cache(maxsize=128)
+def _print_layout(text: str, font_size: FontSize, direction: ScreenDirection) -> Tuple[Tuple[int, bytes], ...]:
+    column_width, row_height = _FONT_METRICS[font_size]
+    width, height = _SCREEN_SIZES[direction]
+    lines = layout_text(text, width // column_width, height // row_height)
+    return tuple((row * row_height, line.encode()) for row, line in enumerate(lines))
+
+
 __lib__ = load_lib(LIB_FILE_PATH)
 
 
@@ -182,6 +184,14 @@ class Screen:
 
     This class represents an LCD screen and provides methods to manipulate it.
     Each method returns self to enable chainable calls.
+
+    Thread safety:
+        each drawing call is guarded by `LCD_LOCK`, the LED calls by `ADC_IO_LOCK` of `modules.locks`.
+        Hold `Screen.lock` around a sequence of calls that depends on the drawing state, e.g. the colors.
+
+    LEDs:
+        the color each LED shows is kept in `led_colors`, and a LED call only issues `adc_led_set` for a LED whose
+        color changes, so that setting a held color does not keep the ADC-IO channel busy.
     """
 
     def __init__(self, screen_dir: Literal[1, 2] | int = None):
@@ -197,9 +207,48 @@ class Screen:
         self._screen_size: Tuple[int, int] = (0, 0)
         self._font_size: FontSize = FontSize.FONT_12X20
         self._screen_dir: ScreenDirection = ScreenDirection(screen_dir) if screen_dir else None
+        self._led_colors: List[int | None] = [None, None]
         if screen_dir is not None:
             self.open(direction=screen_dir).fill_screen(Color.BLACK).refresh()
 
+    @property
+    def lock(self) -> RLock:
+        """
+        the reentrant lock guarding the LCD, hold it to make a sequence of drawing calls atomic
+
+        Examples:
+            >>> with screen.lock:
+            ...     screen.set_fore_color(Color.RED).put_string(0, 0, "ALERT")
+        """
+        return LCD_LOCK
+
+    @property
+    def font_size(self) -> FontSize:
+        """
+        the font set by the latest `set_font_size()`
+        """
+        return self._font_size
+
+    @property
+    def direction(self) -> ScreenDirection | None:
+        """
+        the displaying direction the LCD was opened with, None if it is not opened
+        """
+        return self._screen_dir
+
+    @property
+    def led_colors(self) -> Tuple[int | None, int | None]:
+        """
+        the colors set by the latest LED calls of this instance, None for a LED not set yet
+        """
+        return tuple(self._led_colors)  # type: ignore
+
+    def _set_led(self, index: int, color: Color | int) -> None:
+        # called with ADC_IO_LOCK held, so that the shadow and the LED agree
+        if self._led_colors[index] != color:
+            __lib__.adc_led_set(index, color)
+            self._led_colors[index] = color
+
     def open(self, direction: Literal[1, 2] | int = 2) -> Self:
         """
         Open the LCD and set the displaying direction.
@@ -211,8 +260,9 @@ class Screen:
           Self for chainable calls.
         """
 
-        _logger.info(f"Open LCD with direction: {direction}")
-        __lib__.lcd_open(direction)
+        _logger.info("Open LCD with direction: %s", direction)
+        with LCD_LOCK:
+            __lib__.lcd_open(direction)
         self._screen_dir = ScreenDirection(direction)
         return self
 
@@ -224,7 +274,8 @@ class Screen:
           Self for chainable calls.
         """
         _logger.info("Closing LCD")
-        __lib__.lcd_close()
+        with LCD_LOCK:
+            __lib__.lcd_close()
         return self
 
     def refresh(self) -> Self:
@@ -234,7 +285,8 @@ class Screen:
         Returns:
           Self for chainable calls.
         """
-        __lib__.LCD_Refresh()
+        with LCD_LOCK:
+            __lib__.LCD_Refresh()
         return self
 
     def set_font_size(self, font_size: FontSize) -> Self:
@@ -248,7 +300,8 @@ class Screen:
           Self for chainable calls.
         """
         self._font_size = font_size
-        __lib__.LCD_SetFont(font_size.value)
+        with LCD_LOCK:
+            __lib__.LCD_SetFont(font_size.value)
         return self
 
     def set_fore_color(self, color: Color | int) -> Self:
@@ -261,7 +314,8 @@ class Screen:
         Returns:
           Self for chainable calls.
         """
-        __lib__.UG_SetForecolor(color)
+        with LCD_LOCK:
+            __lib__.UG_SetForecolor(color)
         return self
 
     def set_back_color(self, color: Color | int) -> Self:
@@ -274,7 +328,8 @@ class Screen:
         Returns:
           Self for chainable calls.
         """
-        __lib__.UG_SetBackcolor(color)
+        with LCD_LOCK:
+            __lib__.UG_SetBackcolor(color)
         return self
 
     def set_led_color(self, index: Literal[0, 1] | int, color: Color | int) -> Self:
@@ -288,7 +343,8 @@ class Screen:
         Returns:
             Self: The instance of the class to allow for method chaining.
         """
-        __lib__.adc_led_set(index, color)
+        with ADC_IO_LOCK:
+            self._set_led(index, color)
         return self
 
     def set_led_0(self, color: Color | int) -> Self:
@@ -301,7 +357,8 @@ class Screen:
         Returns:
             Self: The instance of the class to allow for method chaining.
         """
-        __lib__.adc_led_set(0, color)
+        with ADC_IO_LOCK:
+            self._set_led(0, color)
         return self
 
     def set_led_1(self, color: Color | int) -> Self:
@@ -314,7 +371,8 @@ class Screen:
         Returns:
             Self: The instance of the class to allow for method chaining.
         """
-        __lib__.adc_led_set(1, color)
+        with ADC_IO_LOCK:
+            self._set_led(1, color)
         return self
 
     def set_all_leds_same(self, color: Color | int) -> Self:
@@ -327,8 +385,9 @@ class Screen:
         Returns:
             Self: The instance of the class to allow for method chaining.
         """
-        __lib__.adc_led_set(0, color)
-        __lib__.adc_led_set(1, color)
+        with ADC_IO_LOCK:
+            self._set_led(0, color)
+            self._set_led(1, color)
         return self
 
     def set_all_leds_single(self, first: Color | int, second: Color | int) -> Self:
@@ -342,8 +401,9 @@ class Screen:
         Returns:
             Self: The instance of the class to allow for method chaining.
         """
-        __lib__.adc_led_set(0, first)
-        __lib__.adc_led_set(1, second)
+        with ADC_IO_LOCK:
+            self._set_led(0, first)
+            self._set_led(1, second)
         return self
 
     def set_all_leds_off(self) -> Self:
@@ -355,8 +415,9 @@ class Screen:
         Returns:
             Self: The instance of the class to allow for method chaining.
         """
-        __lib__.adc_led_set(0, 0)
-        __lib__.adc_led_set(1, 0)
+        with ADC_IO_LOCK:
+            self._set_led(0, 0)
+            self._set_led(1, 0)
         return self
 
     def fill_screen(self, color: Color | int) -> Self:
@@ -369,7 +430,8 @@ class Screen:
         Returns:
           Self for chainable calls.
         """
-        __lib__.UG_FillScreen(color)
+        with LCD_LOCK:
+            __lib__.UG_FillScreen(color)
         return self
 
     def put_string(self, x: int, y: int, display_string: str) -> Self:
@@ -384,21 +446,27 @@ class Screen:
         Returns:
           Self for chainable calls.
         """
-        __lib__.UG_PutString(x, y, display_string.encode())
+        with LCD_LOCK:
+            __lib__.UG_PutString(x, y, display_string.encode())
         return self
 
     def print(self, display_string: str) -> Self:
         """
         Print a string to the LCD, automatically handling line breaks based on screen width.
 
+        The string is wrapped to the width of the screen in the current font, the lines below the screen are dropped.
+        The layouts are cached, so printing the same string again skips the wrapping.
+
         Args:
           display_string (str): The string to display on the LCD.
 
         Returns:
           Self for chainable calls.
         """
-
-        __lib__.UG_PutString(0, 0, display_string.encode())
+        lines = _print_layout(display_string, self._font_size, self._screen_dir or ScreenDirection.HORIZONTAL)
+        with LCD_LOCK:
+            for y, line in lines:
+                __lib__.UG_PutString(0, y, line)
 
         return self
 
@@ -418,7 +486,8 @@ class Screen:
         Returns:
           Self for chainable calls.
         """
-        __lib__.UG_FillFrame(x1, y1, x2, y2, color)
+        with LCD_LOCK:
+            __lib__.UG_FillFrame(x1, y1, x2, y2, color)
         return self
 
     def fill_round_frame(
@@ -438,7 +507,8 @@ class Screen:
         Returns:
           Self for chainable calls.
         """
-        __lib__.UG_FillRoundFrame(x1, y1, x2, y2, r, color)
+        with LCD_LOCK:
+            __lib__.UG_FillRoundFrame(x1, y1, x2, y2, r, color)
         return self
 
     def fill_circle(self, x0: int, y0: int, r: int, color: Color | int) -> Self:
@@ -454,7 +524,8 @@ class Screen:
         Returns:
           Self for chainable calls.
         """
-        __lib__.UG_FillCircle(x0, y0, r, color)
+        with LCD_LOCK:
+            __lib__.UG_FillCircle(x0, y0, r, color)
         return self
 
     def draw_mesh(self, x1: int, y1: int, x2: int, y2: int, color: Color | int) -> Self:
@@ -471,7 +542,8 @@ class Screen:
         Returns:
           Self for chainable calls.
         """
-        __lib__.UG_DrawMesh(x1, y1, x2, y2, color)
+        with LCD_LOCK:
+            __lib__.UG_DrawMesh(x1, y1, x2, y2, color)
         return self
 
     def draw_frame(
@@ -490,7 +562,8 @@ class Screen:
         Returns:
           Self for chainable calls.
         """
-        __lib__.UG_DrawFrame(x1, y1, x2, y2, color)
+        with LCD_LOCK:
+            __lib__.UG_DrawFrame(x1, y1, x2, y2, color)
         return self
 
     def draw_round_frame(
@@ -510,7 +583,8 @@ class Screen:
         Returns:
           Self for chainable calls.
         """
-        __lib__.UG_DrawRoundFrame(x1, y1, x2, y2, r, color)
+        with LCD_LOCK:
+            __lib__.UG_DrawRoundFrame(x1, y1, x2, y2, r, color)
         return self
 
     def draw_pixel(self, x0: int, y0: int, color: Color | int) -> Self:
@@ -525,7 +599,8 @@ class Screen:
         Returns:
           Self for chainable calls.
         """
-        __lib__.UG_DrawPixel(x0, y0, color)
+        with LCD_LOCK:
+            __lib__.UG_DrawPixel(x0, y0, color)
         return self
 
     def draw_circle(self, x0: int, y0: int, r: int, color: Color | int) -> Self:
@@ -541,7 +616,8 @@ class Screen:
         Returns:
           Self for chainable calls.
         """
-        __lib__.UG_DrawCircle(x0, y0, r, color)
+        with LCD_LOCK:
+            __lib__.UG_DrawCircle(x0, y0, r, color)
         return self
 
     def draw_arc(self, x0: int, y0: int, r: int, s: int, color: Color | int) -> Self:
@@ -558,7 +634,8 @@ class Screen:
         Returns:
           Self for chainable calls.
         """
-        __lib__.UG_DrawArc(x0, y0, r, s, color)
+        with LCD_LOCK:
+            __lib__.UG_DrawArc(x0, y0, r, s, color)
         return self
 
     def draw_line(self, x1: int, y1: int, x2: int, y2: int, color: Color | int) -> Self:
@@ -575,7 +652,32 @@ class Screen:
         Returns:
           Self for chainable calls.
         """
-        __lib__.UG_DrawLine(x1, y1, x2, y2, color)
+        with LCD_LOCK:
+            __lib__.UG_DrawLine(x1, y1, x2, y2, color)
+        return self
+
+    def blit(self, sprite: Sprite, x: int, y: int) -> Self:
+        """
+        Draw a sprite with its top-left corner at the specified coordinates.
+
+        All the calls of the sprite are issued under a single hold of the lock, the transparent pixels are not drawn.
+
+        Args:
+          sprite (Sprite): The converted image to draw.
+          x (int): The X coordinate of the top-left corner.
+          y (int): The Y coordinate of the top-left corner.
+
+        Returns:
+          Self for chainable calls.
+        """
+        fill_frame, draw_line, draw_pixel = __lib__.UG_FillFrame, __lib__.UG_DrawLine, __lib__.UG_DrawPixel
+        with LCD_LOCK:
+            for x1, y1, x2, y2, color in sprite.frames:
+                fill_frame(x + x1, y + y1, x + x2, y + y2, color)
+            for x1, y1, x2, y2, color in sprite.lines:
+                draw_line(x + x1, y + y1, x + x2, y + y2, color)
+            for x0, y0, color in sprite.pixels:
+                draw_pixel(x + x0, y + y0, color)
         return self
 
 
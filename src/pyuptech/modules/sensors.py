@@ -9,15 +9,40 @@ from ctypes import (
     c_float,
     c_uint8,
 )
+from contextlib import contextmanager
+from math import pi
+from pathlib import Path
+from queue import Queue
+from threading import local
 from time import perf_counter_ns
-from typing import Self, Literal, Any, Callable, Tuple, TypeAlias
-
-from .constant import LIB_FILE_PATH, BinaryIO
+from typing import Self, Literal, Any, Callable, Sequence, Iterator, List, Mapping, Tuple
+
+from .buffers import OutBuffer, fill_buffer
+from .calibration import ADCCalibration, CalibratedADCDataPack
+from .comparator import ComparatorBank
+from .constant import LIB_FILE_PATH, BinaryIO, ADCDataPack, MPUDataPack
+from .debounce import IODebouncer
+from .events import IOEventDispatcher
+from .parallel import ParallelReader, ParallelReadStats
+from .pins import PinGroup, Pin
+from .snapshot import SensorSnapshot
+from .watchdog import BoundedReader
 from .loader import load_lib
+from .locks import ADC_IO_LOCK, MPU_LOCK
 from .logger import _logger
 
 E6 = 1000000
 
+STANDARD_GRAVITY = 9.80665
+DEG2RAD = pi / 180
+
+# the full scale ranges set by mpu6500_dmp_init
+DEFAULT_GYRO_FSR = 2000
+DEFAULT_ACC_FSR = 8
+
+# mpu6500_Get_Gyro and mpu6500_Get_Accel return degree/s and g, divided by the sensitivities mpu6500_dmp_init reads at
+# the default ranges, so a range set afterward scales the readings by fsr / default
+
 """
 Only For IO, mode and level
 OUTPUT = 1
@@ -30,9 +55,6 @@ ADCArrayType: Callable = c_uint16 * 10  # type: ignore
 # on 32bit machine, this will create a C array of 3 floats with bit-width of 4 bytes
 MPUArrayType: Callable = c_float * 3  # type: ignore
 
-ADCDataPack: TypeAlias = Tuple[int, int, int, int, int, int, int, int, int, int]
-MPUDataPack: TypeAlias = Tuple[float, float, float]
-
 __TECHSTAR_LIB__: CDLL = load_lib(LIB_FILE_PATH)
 
 
@@ -40,6 +62,35 @@ __TECHSTAR_LIB__: CDLL = load_lib(LIB_FILE_PATH)
 _WORD = c_uint16
 
 
+def _scale_in_place(buffer: OutBuffer, scale: float) -> OutBuffer:
+    for index in range(3):
+        buffer[index] *= scale
+    return buffer
+
+
+class _SensorBuffers(local):
+    """
+    The ctypes output buffers of the calling thread, so that threads never share a buffer
+    """
+
+    def __init__(self):
+        self.adc: Array = ADCArrayType()
+        self.accel: Array = MPUArrayType()
+        self.gyro: Array = MPUArrayType()
+        self.atti: Array = MPUArrayType()
+        # the raw frame the calibrated channels are converted from
+        self.adc_frame: List[int] = [0] * 10
+
+
+class _TickState(local):
+    """
+    The snapshot served by the active `tick()` block of the calling thread, None outside of one
+    """
+
+    def __init__(self):
+        self.snapshot: SensorSnapshot | None = None
+
+
 class OnBoardSensors:
     """
     provides sealed methods accessing to the IOs and builtin sensors
@@ -49,6 +100,10 @@ class OnBoardSensors:
     ADC: 9 for normal use, 1 for power voltage measurement(the last element in the seq)
     IO: all the 8 are for normal use
     MPU: all the 3 are for normal use
+
+    Thread safety:
+        every hardware call is guarded by the lock of its subsystem in `modules.locks`, and the output buffers are
+        per thread, so ADC/IO reads and MPU reads from different threads overlap instead of serializing.
     """
 
     def __init__(self, adc_min_sample_interval_ms: int = 5):
@@ -67,16 +122,37 @@ class OnBoardSensors:
             >>> on_board = OnBoardSensors().adc_io_open().set_all_io_mode(0).set_all_io_levels(1).MPU6500_Open()
         """
 
-        self._adc_cache: ADCDataPack = (0,) * 10
-        self._adc_all: Array = ADCArrayType()
-        self._accel_all: Array = MPUArrayType()
-        self._gyro_all: Array = MPUArrayType()
-        self._atti_all: Array = MPUArrayType()
+        self._adc_cache: ADCDataPack | None = (0,) * 10
+        self._buffers: _SensorBuffers = _SensorBuffers()
+        # the latest sampled frame, the cache tuple is only built from it for the callers without an out buffer
+        self._adc_frame: Array = self._buffers.adc
+        # the buffers of the constructing thread
+        self._adc_all: Array = self._buffers.adc
+        self._accel_all: Array = self._buffers.accel
+        self._gyro_all: Array = self._buffers.gyro
+        self._atti_all: Array = self._buffers.atti
 
         self.__adc_last_sample_timestamp: int = perf_counter_ns()
 
         self.__adc_min_sample_interval_ns: int = adc_min_sample_interval_ms * E6
 
+        self._tick_state: _TickState = _TickState()
+        self._parallel_reader: ParallelReader | None = None
+
+        self._adc_calibration: ADCCalibration | None = None
+        self._adc_calibrated_source: ADCDataPack | None = None
+        self._adc_calibrated_cache: CalibratedADCDataPack | None = None
+
+        self._adc_io_opened: bool = False
+        self._mpu_opened: bool = False
+        # the levels last written to the IOs, None until written by this instance
+        self._io_levels: int | None = None
+
+        self._gyro_fsr: int = DEFAULT_GYRO_FSR
+        self._acc_fsr: int = DEFAULT_ACC_FSR
+        self._gyro_scale: float = DEG2RAD
+        self._acc_scale: float = STANDARD_GRAVITY
+
     @property
     def last_sample_timestamp_ms(self) -> int:
         return int(self.__adc_last_sample_timestamp / E6)
@@ -97,15 +173,33 @@ class OnBoardSensors:
     def adc_min_sample_interval_ms(self, value: int):
         self.__adc_min_sample_interval_ns = value * E6
 
+    @property
+    def adc_io_opened(self) -> bool:
+        """
+        whether the adc-io plug was opened by this instance, and not closed since
+        """
+        return self._adc_io_opened
+
+    @property
+    def mpu_opened(self) -> bool:
+        """
+        whether the MPU6500 was initialized by this instance
+        """
+        return self._mpu_opened
+
     def adc_io_open(self) -> Self:
         """
         open the adc-io plug
         """
         _logger.info("Initializing ADC-IO")
-        if (open_times := __TECHSTAR_LIB__.adc_io_open()) == -1:
+        with ADC_IO_LOCK:
+            open_times = __TECHSTAR_LIB__.adc_io_open()
+        if open_times == -1:
             _logger.error("Failed to open ADC-IO. Do check if the channel is opened by calling 'adc_io_open()' and the libuptech.so being loaded properly")
         else:
-            _logger.debug(f"ADC-IO open {open_times} times")
+            _logger.debug("ADC-IO open %s times", open_times)
+            self._adc_io_opened = True
+            self._io_levels = None
         return self
 
     def adc_io_close(self) -> Self:
@@ -113,34 +207,120 @@ class OnBoardSensors:
         close the adc-io plug
         """
         _logger.info("Closing ADC-IO")
-        if __TECHSTAR_LIB__.adc_io_close() == -1:
+        with ADC_IO_LOCK:
+            result = __TECHSTAR_LIB__.adc_io_close()
+        if result == -1:
             _logger.error("Failed to close ADC-IO. Do check if the channel is opened by calling 'adc_io_open()' and the libuptech.so being loaded properly")
             return
         _logger.debug("ADC-IO closed")
+        self._adc_io_opened = False
+        self._io_levels = None
         return self
 
-    def adc_all_channels(self) -> ADCDataPack:
+    def adc_all_channels(self, out: OutBuffer | None = None) -> ADCDataPack | OutBuffer:
         """
         Get all the ADC channels. Length = 10
 
+        Args:
+            out (OutBuffer, optional): A buffer of at least 10 elements to fill in place instead of returning a new
+                tuple, e.g. a list, an array.array, a numpy array or a ctypes array. Defaults to None.
+
         Returns:
-            ADCDataPack: An array containing the values of all the ADC channels.
+            ADCDataPack | OutBuffer: An array containing the values of all the ADC channels, out if given.
+        """
+
+        if (snapshot := self._tick_state.snapshot) is not None:
+            return snapshot.adc_all_channels(out)
+        with ADC_IO_LOCK:
+            can_update_time = (
+                self.__adc_last_sample_timestamp + self.__adc_min_sample_interval_ns
+            )
+            if can_update_time <= (current := perf_counter_ns()):
+                self.__adc_last_sample_timestamp = current
+                buffer = self._buffers.adc
+                if __TECHSTAR_LIB__.ADC_GetAll(buffer):
+                    _logger.error("Failed to get all ADC channels. Do check if the channel is opened by calling 'adc_io_open()' and the libuptech.so being loaded properly")
+                self._adc_frame = buffer
+                self._adc_cache = None
+            if out is not None:
+                return fill_buffer(out, self._adc_frame)
+            if self._adc_cache is None:
+                self._adc_cache = tuple(self._adc_frame)
+            return self._adc_cache  # type: ignore
+
+    @property
+    def adc_calibration(self) -> ADCCalibration | None:
+        """
+        the calibration used by `adc_calibrated_channels()`, None if not set
         """
+        return self._adc_calibration
 
-        can_update_time = (
-            self.__adc_last_sample_timestamp + self.__adc_min_sample_interval_ns
-        )
-        if can_update_time > (current := perf_counter_ns()):
+    def set_adc_calibration(self, calibration: ADCCalibration | str | Path | None) -> Self:
+        """
+        Set the calibration used by `adc_calibrated_channels()`.
 
-            return self._adc_cache
-        self.__adc_last_sample_timestamp = current
-        if __TECHSTAR_LIB__.ADC_GetAll(self._adc_all):
-            _logger.error("Failed to get all ADC channels. Do check if the channel is opened by calling 'adc_io_open()' and the libuptech.so being loaded properly")
-        self._adc_cache = tuple(self._adc_all)
-        return self._adc_cache  # type: ignore
+        Args:
+            calibration (ADCCalibration | str | Path | None): The calibration, or the path of a .json/.toml
+                calibration file to load, None to remove the calibration.
 
-    @staticmethod
-    def io_all_channels() -> int:
+        Returns:
+            Self: The instance of the class.
+        """
+        if isinstance(calibration, (str, Path)):
+            _logger.info("Loading ADC calibration from [%s]", calibration)
+            calibration = ADCCalibration.from_file(calibration)
+        self._adc_calibration = calibration
+        self._adc_calibrated_source = None
+        return self
+
+    def adc_calibrated_channels(self, out: OutBuffer | None = None) -> CalibratedADCDataPack | OutBuffer:
+        """
+        Get all the ADC channels converted by the calibration. Length = 10
+
+        The conversion is redone only when the raw frame changes, a frame served from the sampling cache
+        costs no conversion.
+
+        Args:
+            out (OutBuffer, optional): A buffer of at least 10 elements to fill in place instead of returning a new
+                tuple. The frame is converted on each call then. Defaults to None.
+
+        Returns:
+            CalibratedADCDataPack | OutBuffer: The converted values of all the ADC channels, out if given.
+
+        Raises:
+            RuntimeError: If no calibration is set.
+        """
+        if self._adc_calibration is None:
+            raise RuntimeError("No ADC calibration is set, call 'set_adc_calibration()' first")
+        if out is not None:
+            return self._adc_calibration.convert(self.adc_all_channels(out=self._buffers.adc_frame), out)
+        raw = self.adc_all_channels()
+        if raw is not self._adc_calibrated_source:
+            self._adc_calibrated_cache = self._adc_calibration.convert(raw)
+            self._adc_calibrated_source = raw
+        return self._adc_calibrated_cache
+
+    def adc_comparator_bank(
+        self, thresholds: Mapping[int, Tuple[int, int]], inverted: int = 0
+    ) -> ComparatorBank:
+        """
+        Create a hysteresis comparator bank that samples the ADC frames of this instance.
+
+        Args:
+            thresholds (Mapping[int, Tuple[int, int]]): The (low, high) thresholds by ADC channel index.
+            inverted (int): The mask of the channels that are active low. Defaults to 0.
+
+        Returns:
+            ComparatorBank: The bank, call `sample()` once per loop and read `mask` anywhere.
+
+        Examples:
+            >>> gray = sensors.adc_comparator_bank({i: (1800, 2200) for i in range(9)})
+            >>> gray.on_change(lambda mask, changed, ts: print(f"{mask:010b}"))
+            >>> line_bits = gray.sample()
+        """
+        return ComparatorBank(thresholds, self.adc_all_channels, inverted)
+
+    def io_all_channels(self) -> int:
         """
         get all io plug input levels
 
@@ -150,10 +330,12 @@ class OnBoardSensors:
             0b10000000 => 第io7为高电平
             0b00000001 => 第io0为高电平
         """
-        return __TECHSTAR_LIB__.adc_io_InputGetAll()
+        if (snapshot := self._tick_state.snapshot) is not None:
+            return snapshot.io
+        with ADC_IO_LOCK:
+            return __TECHSTAR_LIB__.adc_io_InputGetAll()
 
-    @staticmethod
-    def get_io_level(index: int) -> int:
+    def get_io_level(self, index: int) -> int:
         """
         Get the level of the specified IO index.
 
@@ -166,7 +348,76 @@ class OnBoardSensors:
         Note:
             ONLY work in OUTPUT MODE
         """
-        return (__TECHSTAR_LIB__.adc_io_InputGetAll() >> index) & 1
+        if (snapshot := self._tick_state.snapshot) is not None:
+            return (snapshot.io >> index) & 1
+        with ADC_IO_LOCK:
+            return (__TECHSTAR_LIB__.adc_io_InputGetAll() >> index) & 1
+
+    def io_event_dispatcher(
+        self, poll_interval_ms: float = 5, queue: Queue | None = None
+    ) -> IOEventDispatcher:
+        """
+        Create an edge event dispatcher that polls the io mask of this instance.
+
+        Args:
+            poll_interval_ms (float): The interval between two polls in the background thread. Defaults to 5.
+            queue (Queue, optional): The queue that receives every io event. Defaults to None.
+
+        Returns:
+            IOEventDispatcher: The dispatcher, call `start()` to poll in background or `poll()` in your own loop.
+
+        Examples:
+            >>> events = sensors.io_event_dispatcher().on(3, IOEdge.FALLING, lambda e: print(e.pin)).start()
+        """
+        return IOEventDispatcher(self.io_all_channels, poll_interval_ms, queue)
+
+    def io_debouncer(self, windows: int | Sequence[int] = 4) -> IODebouncer:
+        """
+        Create a debouncer that samples the io mask of this instance.
+
+        Args:
+            windows (int | Sequence[int]): The count of consecutive samples a change must hold before it is accepted,
+                a single int for all the pins, or one for each pin. Defaults to 4.
+
+        Returns:
+            IODebouncer: The debouncer, call `sample()` once per loop and read `mask` anywhere.
+
+        Examples:
+            >>> debouncer = sensors.io_debouncer(windows=[4, 4, 4, 4, 8, 8, 8, 8])
+            >>> events = IOEventDispatcher(debouncer.io_all_channels)
+        """
+        return IODebouncer(self.io_all_channels, windows)
+
+    def pin_group(self, *pins: int | Pin) -> PinGroup:
+        """
+        Create a group of io pins that reads all its levels with one `adc_io_InputGetAll` and writes all its levels
+        with one `adc_io_SetAll`.
+
+        Args:
+            *pins (int | Pin): The pins of the group, the order defines the order of the levels.
+
+        Returns:
+            PinGroup: The group bound to this instance.
+
+        Examples:
+            >>> edges = sensors.pin_group(0, 1, 2, 3, 4, 5)
+            >>> fl, fr, rl, rr, gray_l, gray_r = edges.read()
+        """
+        return PinGroup(pins, self.io_all_channels, self.set_all_io_levels, self.io_output_levels)
+
+    def io_output_levels(self) -> int:
+        """
+        Get the levels last written to the IOs by this instance, the masked writes of the pins build on them.
+
+        The levels are kept by `set_all_io_levels` and `flip_io_level`, they are read with `io_all_channels` only if
+        none was written since the plug was opened.
+
+        Returns:
+            int: The level mask, bit i for IO i.
+        """
+        if (levels := self._io_levels) is None:
+            levels = self._io_levels = self.io_all_channels() & 0xFF
+        return levels
 
     def set_all_io_levels(self, levels: int) -> Self:
         """
@@ -186,7 +437,11 @@ class OnBoardSensors:
             levels = 0b0000 0001 => 第io0为高电平,其余为低电平
             levels = 0b1000 0000 => 第io7为高电平，其余为低电平
         """
-        if __TECHSTAR_LIB__.adc_io_SetAll(c_uint(levels)):
+        with ADC_IO_LOCK:
+            result = __TECHSTAR_LIB__.adc_io_SetAll(c_uint(levels))
+            # the levels are unknown again if the write failed
+            self._io_levels = None if result else levels & 0xFF
+        if result:
             _logger.error("Failed to set all IO level. Do check if the channel is opened by calling 'adc_io_open()' and the libuptech.so being loaded properly")
         return self
 
@@ -202,8 +457,14 @@ class OnBoardSensors:
         Notes:
             ONLY work in OUTPUT MODE
         """
-        if __TECHSTAR_LIB__.adc_io_Set(c_uint(index)) == -1:
-            _logger.error(f"Failed to flip IO level, index: {index}. Do check if the channel is opened by calling 'adc_io_open()' and the libuptech.so being loaded properly")
+        with ADC_IO_LOCK:
+            result = __TECHSTAR_LIB__.adc_io_Set(c_uint(index))
+            if result == -1:
+                self._io_levels = None
+            elif self._io_levels is not None:
+                self._io_levels ^= 1 << index
+        if result == -1:
+            _logger.error("Failed to flip IO level, index: %d. Do check if the channel is opened by calling 'adc_io_open()' and the libuptech.so being loaded properly", index)
         return self
 
     @staticmethod
@@ -218,7 +479,9 @@ class OnBoardSensors:
             0b00000001 => 第io0为输入模式，可用于外接传感器
         """
         buffer = c_uint8()
-        if __TECHSTAR_LIB__.adc_io_ModeGetAll(byref(buffer)) != 0:
+        with ADC_IO_LOCK:
+            result = __TECHSTAR_LIB__.adc_io_ModeGetAll(byref(buffer))
+        if result != 0:
             _logger.error("Failed to get all IO mode. Do check if the channel is opened by calling 'adc_io_open()' and the libuptech.so being loaded properly")
         return buffer.value
 
@@ -241,8 +504,10 @@ class OnBoardSensors:
             The function returns the instance of the class.
         """
         mode_set = __TECHSTAR_LIB__.adc_io_ModeSet
-        if any(mode_set(c_uint(index), c_int(mode)) for index in range(8)):
-            _logger.error(f"Failed to set all IO mode to {mode}. Do check if the channel is opened by calling 'adc_io_open()' and the libuptech.so being loaded properly")
+        with ADC_IO_LOCK:
+            failed = any(mode_set(c_uint(index), c_int(mode)) for index in range(8))
+        if failed:
+            _logger.error("Failed to set all IO mode to %d. Do check if the channel is opened by calling 'adc_io_open()' and the libuptech.so being loaded properly", mode)
         return self
 
     def set_io_mode(
@@ -266,10 +531,124 @@ class OnBoardSensors:
             If the `adc_io_ModeSet` method returns a truthy value, an error message is logged.
             The function returns the instance of the class.
         """
-        if __TECHSTAR_LIB__.adc_io_ModeSet(c_uint(index), c_int(mode)):
-            _logger.error(f"Failed to set IO mode, index: {index}, mode: {mode}. Do check if the channel is opened by calling 'adc_io_open()' and the libuptech.so being loaded properly")
+        with ADC_IO_LOCK:
+            result = __TECHSTAR_LIB__.adc_io_ModeSet(c_uint(index), c_int(mode))
+        if result:
+            _logger.error("Failed to set IO mode, index: %d, mode: %d. Do check if the channel is opened by calling 'adc_io_open()' and the libuptech.so being loaded properly", index, mode)
         return self
 
+    def take_snapshot(self, mpu: bool = False) -> SensorSnapshot:
+        """
+        Fetch the ADC, IO and optionally the MPU readings once.
+
+        Args:
+            mpu (bool): Whether to fetch the acceleration, gyroscope and attitude data as well. Defaults to False.
+
+        Returns:
+            SensorSnapshot: The readings, which implement the read side of the OnBoardSensors API.
+        """
+        timestamp = perf_counter_ns()
+        if mpu:
+            return SensorSnapshot(
+                self.adc_all_channels(),
+                self.io_all_channels(),
+                self.acc_all(),
+                self.gyro_all(),
+                self.atti_all(),
+                timestamp,
+            )
+        return SensorSnapshot(
+            self.adc_all_channels(), self.io_all_channels(), timestamp_ns=timestamp
+        )
+
+    def read_all_parallel(self) -> SensorSnapshot:
+        """
+        Sweep the ADC, the IO and the MPU with the ADC-IO reads and the MPU reads overlapped.
+
+        The MPU reads run on a persistent worker thread while the calling thread reads the ADC and the IO,
+        see `parallel_read_stats` for the latency saved compared with a serial sweep.
+
+        Returns:
+            SensorSnapshot: The readings of all the sensors.
+        """
+        if self._parallel_reader is None:
+            self._parallel_reader = ParallelReader(self)
+        return self._parallel_reader.read()
+
+    @property
+    def parallel_read_stats(self) -> ParallelReadStats | None:
+        """
+        the latency statistics of `read_all_parallel()`, None if it has never been called
+        """
+        return self._parallel_reader.stats if self._parallel_reader is not None else None
+
+    def bounded_reader(self, budget_ms: float = 5, budgets_ms: Mapping[str, float] | None = None) -> BoundedReader:
+        """
+        Create a reader that bounds the latency of each getter of this instance.
+
+        Args:
+            budget_ms (float): The default budget of every call. Defaults to 5.
+            budgets_ms (Mapping[str, float], optional): The budgets of specific calls, by getter name. Defaults to None.
+
+        Returns:
+            BoundedReader: The reader, its getters return the last good value marked stale once the budget runs out.
+
+        Examples:
+            >>> reader = sensors.bounded_reader(budget_ms=3, budgets_ms={"atti_all": 1})
+            >>> adc = reader.adc_all_channels()
+            >>> print(adc.stale, reader.timeouts["adc_all_channels"])
+        """
+        return BoundedReader(self, budget_ms, budgets_ms)
+
+    @contextmanager
+    def tick(self, mpu: bool = False) -> Iterator[SensorSnapshot]:
+        """
+        Fetch the sensors once, and serve the getters of this instance from that snapshot inside the block.
+
+        Within the block `adc_all_channels()`, `io_all_channels()`, `get_io_level()` and, if mpu is True,
+        `acc_all()`, `gyro_all()` and `atti_all()` return the snapshot readings without touching the hardware,
+        including getters bound before the block, e.g. the ones held by a PinGroup.
+
+        The snapshot is per thread: other threads using this instance keep reading the hardware. A nested tick
+        reuses the outer snapshot, except that a nested tick asking for the MPU data of an outer tick without it
+        fetches them into a merged snapshot, timestamped at that fetch, for the nested block only.
+
+        Args:
+            mpu (bool): Whether to fetch the MPU data into the snapshot as well. Defaults to False.
+
+        Yields:
+            SensorSnapshot: The snapshot of this tick.
+
+        Examples:
+            >>> with sensors.tick(mpu=True) as snap:
+            ...     left = sensors.get_io_level(0)
+            ...     right = sensors.get_io_level(1)  # served from the same io mask as left
+        """
+        state = self._tick_state
+        outer = state.snapshot
+        if outer is not None and (outer.has_mpu or not mpu):
+            yield outer
+            return
+        if outer is None:
+            snapshot = self.take_snapshot(mpu)
+        else:
+            # the MPU getters still read the hardware, the outer snapshot has no MPU data
+            snapshot = SensorSnapshot(
+                outer.adc, outer.io, self.acc_all(), self.gyro_all(), self.atti_all(), perf_counter_ns()
+            )
+        state.snapshot = snapshot
+        try:
+            yield snapshot
+        finally:
+            state.snapshot = outer
+
+    @property
+    def tick_snapshot(self) -> SensorSnapshot | None:
+        """
+        the snapshot of the active `tick()` block of the calling thread, None outside of one
+        """
+        return self._tick_state.snapshot
+
     # <editor-fold desc="MPU section">
     def MPU6500_Open(self) -> Self:
         """
@@ -280,55 +659,85 @@ class OnBoardSensors:
             sampling rate: 1kHz
         """
         _logger.info("Initializing MPU6500...")
-        if __TECHSTAR_LIB__.mpu6500_dmp_init():
+        with MPU_LOCK:
+            result = __TECHSTAR_LIB__.mpu6500_dmp_init()
+        if result:
             _logger.warning("Failed to initialize MPU6500. Do check if the channel is opened by calling 'adc_io_open()' and the libuptech.so being loaded properly")
             return self
         _logger.info("MPU6500 initialized")
+        self._mpu_opened = True
+        self._cache_gyro_fsr(DEFAULT_GYRO_FSR)._cache_acc_fsr(DEFAULT_ACC_FSR)
         return self
 
-    def acc_all(self) -> MPUDataPack:
+    def acc_all(self, out: OutBuffer | None = None) -> MPUDataPack | OutBuffer:
         """
         Retrieves the acceleration data from the MPU6500 sensor.
 
+        Args:
+            out (OutBuffer, optional): A buffer of at least 3 elements to fill in place instead of returning a new
+                tuple, e.g. a list, an array.array, a numpy array or a ctypes array. Defaults to None.
+
         Returns:
-            MPUDataPack: An array containing the acceleration data.
+            MPUDataPack | OutBuffer: An array containing the acceleration data in g, out if given.
         Notes:
+            the unit only holds at the default range of ±8g, `acc_si()` corrects for the cached range
             length = 3
             [0] ==> axis X
             [1] ==> axis Y
             [2] ==> axis Z
         """
-        __TECHSTAR_LIB__.mpu6500_Get_Accel(
-            self._accel_all
-        )  # this function return a C pointer to the self._accel_all
-        return tuple(self._accel_all)  # type: ignore
+        if (snapshot := self._tick_state.snapshot) is not None and snapshot.has_mpu:
+            return snapshot.acc_all(out)
+        buffer = self._buffers.accel
+        with MPU_LOCK:
+            __TECHSTAR_LIB__.mpu6500_Get_Accel(
+                buffer
+            )  # this function return a C pointer to the buffer
+        if out is not None:
+            return fill_buffer(out, buffer)
+        return tuple(buffer)  # type: ignore
 
-    def gyro_all(self) -> MPUDataPack:
+    def gyro_all(self, out: OutBuffer | None = None) -> MPUDataPack | OutBuffer:
         """
         Retrieves the gyroscope data from the MPU6500 sensor.
 
+        Args:
+            out (OutBuffer, optional): A buffer of at least 3 elements to fill in place instead of returning a new
+                tuple, e.g. a list, an array.array, a numpy array or a ctypes array. Defaults to None.
+
         Returns:
-            MPUDataPack: An array containing the gyroscope data.
+            MPUDataPack | OutBuffer: An array containing the gyroscope data in degree/s, out if given.
 
         Notes:
+            the unit only holds at the default range of ±2000 degree/s, `gyro_si()` corrects for the cached range
             length = 3
             [0] ==> axis X
             [1] ==> axis Y
             [2] ==> axis Z
         """
 
-        __TECHSTAR_LIB__.mpu6500_Get_Gyro(
-            self._gyro_all
-        )  # this function return a C pointer to the self._gyro_all
+        if (snapshot := self._tick_state.snapshot) is not None and snapshot.has_mpu:
+            return snapshot.gyro_all(out)
+        buffer = self._buffers.gyro
+        with MPU_LOCK:
+            __TECHSTAR_LIB__.mpu6500_Get_Gyro(
+                buffer
+            )  # this function return a C pointer to the buffer
 
-        return tuple(self._gyro_all)  # type: ignore
+        if out is not None:
+            return fill_buffer(out, buffer)
+        return tuple(buffer)  # type: ignore
 
-    def atti_all(self) -> MPUDataPack:
+    def atti_all(self, out: OutBuffer | None = None) -> MPUDataPack | OutBuffer:
         """
         Retrieves the attitude data from the MPU6500 sensor.
 
+        Args:
+            out (OutBuffer, optional): A buffer of at least 3 elements to fill in place instead of returning a new
+                tuple, e.g. a list, an array.array, a numpy array or a ctypes array. Defaults to None.
+
         Returns:
-            MPUDataPack: An array containing the attitude data.
+            MPUDataPack | OutBuffer: An array containing the attitude data, out if given.
 
         Notes:
             length = 3
@@ -336,11 +745,17 @@ class OnBoardSensors:
             [1] ==> Roll |axis Y
             [2] ==> Yaw  |axis Z
         """
-        __TECHSTAR_LIB__.mpu6500_Get_Attitude(
-            self._atti_all
-        )  # this function return a C pointer to the self._atti_all
+        if (snapshot := self._tick_state.snapshot) is not None and snapshot.has_mpu:
+            return snapshot.atti_all(out)
+        buffer = self._buffers.atti
+        with MPU_LOCK:
+            __TECHSTAR_LIB__.mpu6500_Get_Attitude(
+                buffer
+            )  # this function return a C pointer to the buffer
 
-        return tuple(self._atti_all)  # type: ignore
+        if out is not None:
+            return fill_buffer(out, buffer)
+        return tuple(buffer)  # type: ignore
 
     @staticmethod
     def get_handle(attr_name: str) -> Any:
@@ -370,7 +785,8 @@ class OnBoardSensors:
         """
 
         # Calls the technology library function to obtain the gyroscope's FSR, storing the result in fsr_value
-        __TECHSTAR_LIB__.mpu_get_gyro_fsr(byref(fsr_value := _WORD()))
+        with MPU_LOCK:
+            __TECHSTAR_LIB__.mpu_get_gyro_fsr(byref(fsr_value := _WORD()))
         return fsr_value.value
 
     @staticmethod
@@ -385,7 +801,8 @@ class OnBoardSensors:
         """
 
         # Request the accelerometer full-scale range value
-        __TECHSTAR_LIB__.mpu_get_accel_fsr(byref(fsr_value := c_byte()))
+        with MPU_LOCK:
+            __TECHSTAR_LIB__.mpu_get_accel_fsr(byref(fsr_value := c_byte()))
         # Return the obtained accelerometer full-scale range value
         return fsr_value.value
 
@@ -401,8 +818,12 @@ class OnBoardSensors:
         """
 
         # Call the underlying library function to set the gyroscope's full-scale range
-        __TECHSTAR_LIB__.mpu_set_gyro_fsr(c_uint(fsr))
-        return self
+        with MPU_LOCK:
+            result = __TECHSTAR_LIB__.mpu_set_gyro_fsr(c_uint(fsr))
+        if result:
+            _logger.error("Failed to set gyro FSR to %d. Do check if the MPU6500 is initialized by calling 'MPU6500_Open()'", fsr)
+            return self
+        return self._cache_gyro_fsr(fsr)
 
     def mpu_set_accel_fsr(self, fsr: Literal[2, 4, 8, 16] | int) -> Self:
         """
@@ -415,9 +836,103 @@ class OnBoardSensors:
             Self: Returns the object itself to support method chaining.
         """
 
-        __TECHSTAR_LIB__.mpu_set_accel_fsr(
-            c_int(fsr)
-        )  # Invokes the library function to set the accelerometer's FSR
+        # Invokes the library function to set the accelerometer's FSR
+        with MPU_LOCK:
+            result = __TECHSTAR_LIB__.mpu_set_accel_fsr(c_int(fsr))
+        if result:
+            _logger.error("Failed to set accel FSR to %d. Do check if the MPU6500 is initialized by calling 'MPU6500_Open()'", fsr)
+            return self
+        return self._cache_acc_fsr(fsr)
+
+    def _cache_gyro_fsr(self, fsr: int) -> Self:
+        self._gyro_fsr = fsr
+        self._gyro_scale = fsr / DEFAULT_GYRO_FSR * DEG2RAD
         return self
 
+    def _cache_acc_fsr(self, fsr: int) -> Self:
+        self._acc_fsr = fsr
+        self._acc_scale = fsr / DEFAULT_ACC_FSR * STANDARD_GRAVITY
+        return self
+
+    @property
+    def gyro_fsr(self) -> int:
+        """
+        the cached gyroscope full scale range in degree/s, kept up to date by `mpu_set_gyro_fsr`, no library call
+        """
+        return self._gyro_fsr
+
+    @property
+    def acc_fsr(self) -> int:
+        """
+        the cached accelerometer full scale range in g, kept up to date by `mpu_set_accel_fsr`, no library call
+        """
+        return self._acc_fsr
+
+    def sync_mpu_fsr(self) -> Self:
+        """
+        Query the full scale ranges from the MPU once and refresh the cached values and scale factors.
+
+        Only needed if the ranges were changed without `mpu_set_gyro_fsr`/`mpu_set_accel_fsr`, e.g. via `get_handle`.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        return self._cache_gyro_fsr(self.get_gyro_fsr())._cache_acc_fsr(self.get_acc_fsr())
+
+    def gyro_si(self, out: OutBuffer | None = None) -> MPUDataPack | OutBuffer:
+        """
+        Retrieves the gyroscope data converted to rad/s with the cached full scale range.
+
+        Args:
+            out (OutBuffer, optional): A buffer of floats, at least 3 elements, to fill in place. Defaults to None.
+
+        Returns:
+            MPUDataPack | OutBuffer: The angular velocity around axis X, Y, Z in rad/s, out if given.
+        """
+        scale = self._gyro_scale
+        if out is not None:
+            return _scale_in_place(self.gyro_all(out=out), scale)
+        x, y, z = self.gyro_all()
+        return x * scale, y * scale, z * scale
+
+    def acc_si(self, out: OutBuffer | None = None) -> MPUDataPack | OutBuffer:
+        """
+        Retrieves the acceleration data converted to m/s² with the cached full scale range.
+
+        Args:
+            out (OutBuffer, optional): A buffer of floats, at least 3 elements, to fill in place. Defaults to None.
+
+        Returns:
+            MPUDataPack | OutBuffer: The acceleration along axis X, Y, Z in m/s², out if given.
+        """
+        scale = self._acc_scale
+        if out is not None:
+            return _scale_in_place(self.acc_all(out=out), scale)
+        x, y, z = self.acc_all()
+        return x * scale, y * scale, z * scale
+
+    def imu_si(
+        self, out: Tuple[OutBuffer, OutBuffer] | None = None
+    ) -> Tuple[MPUDataPack, MPUDataPack] | Tuple[OutBuffer, OutBuffer]:
+        """
+        Retrieves the gyroscope and the acceleration data converted to SI units in one go,
+        no full scale range is queried from the library.
+
+        Args:
+            out (Tuple[OutBuffer, OutBuffer], optional): The buffers of the gyroscope and the acceleration data to
+                fill in place, returned as they are. Defaults to None.
+
+        Returns:
+            Tuple[MPUDataPack, MPUDataPack]: The angular velocity in rad/s, and the acceleration in m/s².
+        """
+        g_scale = self._gyro_scale
+        a_scale = self._acc_scale
+        if out is not None:
+            _scale_in_place(self.gyro_all(out=out[0]), g_scale)
+            _scale_in_place(self.acc_all(out=out[1]), a_scale)
+            return out
+        gx, gy, gz = self.gyro_all()
+        ax, ay, az = self.acc_all()
+        return (gx * g_scale, gy * g_scale, gz * g_scale), (ax * a_scale, ay * a_scale, az * a_scale)
+
     # </editor-fold>
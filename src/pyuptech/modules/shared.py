@@ -0,0 +1,403 @@
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from struct import Struct
+from time import perf_counter_ns, sleep
+from typing import Self, Tuple, TYPE_CHECKING
+
+from .constant import ADCDataPack, MPUDataPack
+from .logger import _logger
+from .periodic import PeriodicThread
+from .snapshot import SensorSnapshot
+
+if TYPE_CHECKING:
+    from .sensors import OnBoardSensors
+
+E6 = 1000000
+
+DEFAULT_SHM_NAME = "pyuptech_sensors"
+
+# segment layout, little endian without padding
+# [0, 4)   seq, odd while the publisher is writing
+# [8, 74)  frame: timestamp_ns, 10 adc, io, has_mpu, 3 acc, 3 gyro, 3 atti
+_SEQ = Struct("<I")
+_FRAME = Struct("<q10HB?9f")
+_ADC = Struct("<10H")
+_IO = Struct("<B")
+_MPU = Struct("<?9f")
+
+_SEQ_OFFSET = 0
+_FRAME_OFFSET = 8
+_ADC_OFFSET = _FRAME_OFFSET + 8
+_IO_OFFSET = _ADC_OFFSET + _ADC.size
+_MPU_OFFSET = _IO_OFFSET + _IO.size
+
+SHM_SIZE = _FRAME_OFFSET + _FRAME.size
+
+# a seqlock reader spins this many times on a write in progress before yielding the CPU to the writer
+SEQLOCK_SPINS = 64
+# and gives up after this long, e.g. on a writer killed in the middle of a write
+DEFAULT_SEQLOCK_TIMEOUT_MS = 100
+
+# the segments created by this process
+_CREATED_NAMES = set()
+
+
+def create_shared_memory(name: str, size: int) -> SharedMemory:
+    """
+    Create a shared memory segment owned by this process.
+
+    Args:
+        name (str): The name of the segment.
+        size (int): The size of the segment in bytes.
+
+    Returns:
+        SharedMemory: The segment, unlinked by its owner with `release_shared_memory`.
+    """
+    shm = SharedMemory(name=name, create=True, size=size)
+    _CREATED_NAMES.add(shm.name)
+    return shm
+
+
+def attach_shared_memory(name: str) -> SharedMemory:
+    """
+    Attach to a shared memory segment owned by another process, or by this process.
+
+    Args:
+        name (str): The name of the segment.
+
+    Returns:
+        SharedMemory: The segment, which will not be unlinked when this process exits.
+
+    Raises:
+        FileNotFoundError: If the segment has not been created yet.
+    """
+    shm = SharedMemory(name=name)
+    if shm.name not in _CREATED_NAMES:
+        # the owner unlinks the segment, do not let the tracker of this process unlink it at exit
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore
+    return shm
+
+
+def release_shared_memory(shm: SharedMemory) -> None:
+    """
+    Close and unlink a shared memory segment created by `create_shared_memory`.
+
+    Args:
+        shm (SharedMemory): The segment to release.
+    """
+    shm.close()
+    shm.unlink()
+    _CREATED_NAMES.discard(shm.name)
+
+
+def wait_for_writer(name: str, started_ns: int, timeout_ns: int) -> int:
+    """
+    Yield the CPU to the writer of a seqlock, once a reader has spun `SEQLOCK_SPINS` times on it.
+
+    Args:
+        name (str): The name of the shared memory segment, for the error message.
+        started_ns (int): The time of the first wait of this read, 0 for the first wait.
+        timeout_ns (int): How long the reader waits for the writer, in nanoseconds.
+
+    Returns:
+        int: The time of the first wait, to be passed back on the next wait of the same read.
+
+    Raises:
+        TimeoutError: If the writer has not finished within the timeout.
+    """
+    now = perf_counter_ns()
+    if not started_ns:
+        started_ns = now
+    elif now - started_ns >= timeout_ns:
+        raise TimeoutError(
+            f"The writer of shared memory [{name}] has not finished within {timeout_ns / E6:.0f}ms, "
+            "it may have died in the middle of a write"
+        )
+    sleep(0)
+    return started_ns
+
+
+class SensorPublisher:
+    """
+    Owns an `OnBoardSensors` and publishes its readings into a shared memory segment.
+
+    Each frame is written under a seqlock, the sequence number is odd while the frame is being written,
+    so that the subscribers in the other processes never see a torn frame.
+    """
+
+    def __init__(
+        self,
+        sensors: "OnBoardSensors",
+        name: str = DEFAULT_SHM_NAME,
+        mpu: bool = True,
+    ):
+        """
+        Initializes an instance of the SensorPublisher class, creates the shared memory segment.
+
+        Args:
+            sensors (OnBoardSensors): The sensors to publish, the only instance that touches the hardware.
+            name (str): The name of the shared memory segment. Defaults to "pyuptech_sensors".
+            mpu (bool): Whether to publish the MPU data as well. Defaults to True.
+
+        Examples:
+            >>> publisher = SensorPublisher(OnBoardSensors().adc_io_open().MPU6500_Open()).start(interval_ms=5)
+        """
+        self._sensors: "OnBoardSensors" = sensors
+        self._mpu: bool = mpu
+        self._shm: SharedMemory = create_shared_memory(name, SHM_SIZE)
+        self._buf = self._shm.buf
+        self._seq: int = 0
+        _SEQ.pack_into(self._buf, _SEQ_OFFSET, self._seq)
+
+        self._timer: PeriodicThread = PeriodicThread(self.publish, 0, "Sensor publisher", "pyuptech-sensor-publisher")
+        _logger.info("Sensor publisher created at shared memory [%s]", name)
+
+    @property
+    def name(self) -> str:
+        """
+        the name of the shared memory segment
+        """
+        return self._shm.name
+
+    @property
+    def generation(self) -> int:
+        """
+        the count of the frames published
+        """
+        return self._seq >> 1
+
+    def write(self, snapshot: SensorSnapshot) -> Self:
+        """
+        Write a snapshot into the shared memory segment.
+
+        Args:
+            snapshot (SensorSnapshot): The readings to publish.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        buf = self._buf
+        seq = (self._seq + 1) & 0xFFFFFFFF
+        _SEQ.pack_into(buf, _SEQ_OFFSET, seq)
+        if snapshot.has_mpu:
+            _FRAME.pack_into(
+                buf,
+                _FRAME_OFFSET,
+                snapshot.timestamp_ns,
+                *snapshot.adc,
+                snapshot.io,
+                True,
+                *snapshot.acc,
+                *snapshot.gyro,
+                *snapshot.atti,
+            )
+        else:
+            _FRAME.pack_into(
+                buf,
+                _FRAME_OFFSET,
+                snapshot.timestamp_ns,
+                *snapshot.adc,
+                snapshot.io,
+                False,
+                *(0.0,) * 9,
+            )
+        # a seq of 0 tells the subscribers that no frame has been published yet, so it is skipped on wrap-around
+        self._seq = (seq + 1) & 0xFFFFFFFF or 2
+        _SEQ.pack_into(buf, _SEQ_OFFSET, self._seq)
+        return self
+
+    def publish(self) -> Self:
+        """
+        Fetch the sensors once and publish the readings.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        return self.write(self._sensors.take_snapshot(self._mpu))
+
+    def start(self, interval_ms: float = 5) -> Self:
+        """
+        Publish at a fixed interval in a daemon thread.
+
+        Args:
+            interval_ms (float): The interval between two frames. Defaults to 5.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        if not self._timer.is_running:
+            self._timer.interval_ns = int(interval_ms * E6)
+        self._timer.start()
+        return self
+
+    def stop(self, timeout: float | None = None) -> Self:
+        """
+        Stop the publishing thread.
+
+        Args:
+            timeout (float, optional): The seconds to wait for the thread to exit. Defaults to None.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self._timer.stop(timeout)
+        return self
+
+    def close(self) -> None:
+        """
+        Stop publishing, then close and unlink the shared memory segment.
+        """
+        self.stop()
+        self._buf = None
+        release_shared_memory(self._shm)
+        _logger.info("Sensor publisher at shared memory [%s] closed", self._shm.name)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class SensorSubscriber:
+    """
+    Reads the frames published by a `SensorPublisher` in another process.
+
+    Implements the read side of the `OnBoardSensors` API, every getter unpacks straight from the shared memory,
+    no IPC round-trip is made. Every getter returns None before the first frame is published, and the MPU getters
+    also return None for the frames published without the MPU.
+    """
+
+    def __init__(self, name: str = DEFAULT_SHM_NAME, timeout_ms: float = DEFAULT_SEQLOCK_TIMEOUT_MS):
+        """
+        Initializes an instance of the SensorSubscriber class, attaches to the shared memory segment.
+
+        Args:
+            name (str): The name of the shared memory segment. Defaults to "pyuptech_sensors".
+            timeout_ms (float): How long a read waits for a frame being written before raising TimeoutError.
+                Defaults to DEFAULT_SEQLOCK_TIMEOUT_MS.
+
+        Raises:
+            FileNotFoundError: If no publisher has created the segment yet.
+
+        Examples:
+            >>> sensors = SensorSubscriber()
+            >>> sensors.adc_all_channels()
+        """
+        self._shm: SharedMemory = attach_shared_memory(name)
+        self._buf = self._shm.buf
+        self._timeout_ns: int = int(timeout_ms * E6)
+
+    @property
+    def name(self) -> str:
+        """
+        the name of the shared memory segment
+        """
+        return self._shm.name
+
+    @property
+    def generation(self) -> int:
+        """
+        the count of the frames published so far, can be used to tell whether a new frame has arrived
+        """
+        return _SEQ.unpack_from(self._buf, _SEQ_OFFSET)[0] >> 1
+
+    def _read(self, struct: Struct, offset: int) -> Tuple | None:
+        buf = self._buf
+        unpack_seq = _SEQ.unpack_from
+        tries = started = 0
+        while True:
+            seq = unpack_seq(buf, _SEQ_OFFSET)[0]
+            if not seq:
+                return None
+            if not seq & 1:
+                data = struct.unpack_from(buf, offset)
+                if unpack_seq(buf, _SEQ_OFFSET)[0] == seq:
+                    return data
+            tries += 1
+            if tries >= SEQLOCK_SPINS:
+                started = wait_for_writer(self._shm.name, started, self._timeout_ns)
+
+    def snapshot(self) -> SensorSnapshot | None:
+        """
+        Read the latest frame as a whole.
+
+        Returns:
+            SensorSnapshot | None: The readings of the latest frame, the MPU fields are None if the publisher skips the
+                MPU. None if no frame has been published yet.
+        """
+        if (frame := self._read(_FRAME, _FRAME_OFFSET)) is None:
+            return None
+        timestamp, *values = frame
+        adc, io, has_mpu = tuple(values[:10]), values[10], values[11]
+        if not has_mpu:
+            return SensorSnapshot(adc, io, timestamp_ns=timestamp)  # type: ignore
+        mpu = values[12:]
+        return SensorSnapshot(
+            adc, io, tuple(mpu[0:3]), tuple(mpu[3:6]), tuple(mpu[6:9]), timestamp  # type: ignore
+        )
+
+    @property
+    def timestamp_ns(self) -> int | None:
+        """
+        the perf_counter_ns timestamp of the latest frame, taken in the publisher process, None before the first frame
+        """
+        frame = self._read(_FRAME, _FRAME_OFFSET)
+        return None if frame is None else frame[0]
+
+    def adc_all_channels(self) -> ADCDataPack | None:
+        """
+        Get all the ADC channels of the latest frame. Length = 10, None before the first frame
+        """
+        return self._read(_ADC, _ADC_OFFSET)  # type: ignore
+
+    def io_all_channels(self) -> int | None:
+        """
+        Get all the io input levels of the latest frame, each bit represents a channel, 1 for high, 0 for low.
+        None before the first frame
+        """
+        io = self._read(_IO, _IO_OFFSET)
+        return None if io is None else io[0]
+
+    def get_io_level(self, index: int) -> int | None:
+        """
+        Get the level of the specified io index of the latest frame, None before the first frame
+        """
+        io = self._read(_IO, _IO_OFFSET)
+        return None if io is None else (io[0] >> index) & 1
+
+    def _read_mpu(self, start: int) -> MPUDataPack | None:
+        mpu = self._read(_MPU, _MPU_OFFSET)
+        # index 0 is the has_mpu flag of the frame
+        return mpu[start : start + 3] if mpu is not None and mpu[0] else None  # type: ignore
+
+    def acc_all(self) -> MPUDataPack | None:
+        """
+        Get the acceleration data of the latest frame, None before the first frame or if the frame skips the MPU.
+        """
+        return self._read_mpu(1)
+
+    def gyro_all(self) -> MPUDataPack | None:
+        """
+        Get the gyroscope data of the latest frame, None before the first frame or if the frame skips the MPU.
+        """
+        return self._read_mpu(4)
+
+    def atti_all(self) -> MPUDataPack | None:
+        """
+        Get the attitude data of the latest frame, None before the first frame or if the frame skips the MPU.
+        """
+        return self._read_mpu(7)
+
+    def close(self) -> None:
+        """
+        Detach from the shared memory segment, the segment itself is left to the publisher.
+        """
+        self._buf = None
+        self._shm.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,86 @@
+from .buffers import OutBuffer, fill_buffer
+from .constant import ADCDataPack, MPUDataPack
+
+
+class SensorSnapshot:
+    """
+    The sensor readings fetched once at the beginning of a control tick.
+
+    Implements the read side of the `OnBoardSensors` API, so that all the readings of a tick agree with each other.
+    The MPU fields are None if the MPU was not fetched.
+    """
+
+    __slots__ = ("adc", "io", "acc", "gyro", "atti", "timestamp_ns")
+
+    def __init__(
+        self,
+        adc: ADCDataPack,
+        io: int,
+        acc: MPUDataPack | None = None,
+        gyro: MPUDataPack | None = None,
+        atti: MPUDataPack | None = None,
+        timestamp_ns: int = 0,
+    ):
+        self.adc: ADCDataPack = adc
+        self.io: int = io
+        self.acc: MPUDataPack | None = acc
+        self.gyro: MPUDataPack | None = gyro
+        self.atti: MPUDataPack | None = atti
+        self.timestamp_ns: int = timestamp_ns
+
+    def __repr__(self) -> str:
+        return (
+            f"SensorSnapshot(adc={self.adc}, io={self.io:08b}, acc={self.acc}, "
+            f"gyro={self.gyro}, atti={self.atti}, timestamp_ns={self.timestamp_ns})"
+        )
+
+    @property
+    def has_mpu(self) -> bool:
+        """
+        whether the MPU readings were fetched into this snapshot
+        """
+        return self.acc is not None
+
+    def adc_all_channels(self, out: OutBuffer | None = None) -> ADCDataPack | OutBuffer:
+        """
+        Get all the ADC channels of the snapshot. Length = 10, filled into out if given.
+        """
+        if out is not None:
+            return fill_buffer(out, self.adc)
+        return self.adc
+
+    def io_all_channels(self) -> int:
+        """
+        Get all the io input levels of the snapshot, each bit represents a channel, 1 for high, 0 for low
+        """
+        return self.io
+
+    def get_io_level(self, index: int) -> int:
+        """
+        Get the level of the specified io index of the snapshot.
+        """
+        return (self.io >> index) & 1
+
+    def acc_all(self, out: OutBuffer | None = None) -> MPUDataPack | OutBuffer:
+        """
+        Get the acceleration data of the snapshot, filled into out if given.
+        """
+        if out is not None:
+            return fill_buffer(out, self.acc)
+        return self.acc
+
+    def gyro_all(self, out: OutBuffer | None = None) -> MPUDataPack | OutBuffer:
+        """
+        Get the gyroscope data of the snapshot, filled into out if given.
+        """
+        if out is not None:
+            return fill_buffer(out, self.gyro)
+        return self.gyro
+
+    def atti_all(self, out: OutBuffer | None = None) -> MPUDataPack | OutBuffer:
+        """
+        Get the attitude data of the snapshot, filled into out if given.
+        """
+        if out is not None:
+            return fill_buffer(out, self.atti)
+        return self.atti
@@ -0,0 +1,264 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Self, Sequence, Tuple, TypeAlias
+
+# (x1, y1, x2, y2, color), relative to the origin of the sprite, both corners inclusive
+Rect: TypeAlias = Tuple[int, int, int, int, int]
+
+
+class Sprite:
+    """
+    An image converted once into the fewest drawing calls that reproduce it.
+
+    The pixels of each row are merged into runs of the same color, and the runs repeated at the same columns in
+    consecutive rows are merged into rectangles. Blitting then costs one `UG_FillFrame` per rectangle, one
+    `UG_DrawLine` per single row run and one `UG_DrawPixel` per lone pixel, instead of one call per pixel.
+    The pixels of the transparent color key are skipped, so whatever is behind them stays on the screen.
+    """
+
+    __slots__ = ("width", "height", "frames", "lines", "pixels")
+
+    def __init__(self, rows: Sequence[Sequence[int]], transparent: int | None = None):
+        """
+        Convert an image into a sprite.
+
+        Args:
+            rows (Sequence[Sequence[int]]): The 24-bit rgb colors of the pixels, row by row, all rows of the same width.
+            transparent (int, optional): The color key that is not drawn. Defaults to None.
+
+        Examples:
+            >>> arrow = Sprite([[0, Color.RED, 0], [Color.RED] * 3], transparent=0)
+            >>> screen.blit(arrow, 60, 30)
+        """
+        self.height: int = len(rows)
+        self.width: int = len(rows[0]) if rows else 0
+        frames: List[Rect] = []
+        lines: List[Rect] = []
+        pixels: List[Tuple[int, int, int]] = []
+
+        # (x1, x2, color) => the row the run started at, for the runs still growing downwards
+        growing: Dict[Tuple[int, int, int], int] = {}
+        for y, row in enumerate(rows):
+            if len(row) != self.width:
+                raise ValueError(f"All rows must be {self.width} pixels wide, row {y} is {len(row)} pixels wide")
+            still_growing: Dict[Tuple[int, int, int], int] = {}
+            for run in _row_runs(row, transparent):
+                still_growing[run] = growing.pop(run, y)
+            for run, top in growing.items():
+                _emit(run, top, y - 1, frames, lines, pixels)
+            growing = still_growing
+        for run, top in growing.items():
+            _emit(run, top, self.height - 1, frames, lines, pixels)
+
+        self.frames: Tuple[Rect, ...] = tuple(frames)
+        self.lines: Tuple[Rect, ...] = tuple(lines)
+        self.pixels: Tuple[Tuple[int, int, int], ...] = tuple(pixels)
+
+    @classmethod
+    def from_rgb888(
+        cls, data: bytes | bytearray | memoryview, width: int, height: int, transparent: int | None = None
+    ) -> Self:
+        """
+        Convert packed 8-bit rgb pixels into a sprite, e.g. the `tobytes()` of a Pillow image in the "RGB" mode.
+
+        Args:
+            data (bytes): The pixels, 3 bytes per pixel, row by row.
+            width (int): The width of the image.
+            height (int): The height of the image.
+            transparent (int, optional): The color key that is not drawn. Defaults to None.
+
+        Returns:
+            Sprite: The converted image.
+        """
+        if len(data) != width * height * 3:
+            raise ValueError(f"Expected {width * height * 3} bytes for a {width}x{height} image, got {len(data)}")
+        stride = width * 3
+        rows = [
+            [
+                int.from_bytes(data[offset : offset + 3], "big")
+                for offset in range(row_start, row_start + stride, 3)
+            ]
+            for row_start in range(0, height * stride, stride)
+        ]
+        return cls(rows, transparent)
+
+    @classmethod
+    def from_bitmap(
+        cls, rows: Sequence[int | str], width: int, color: int, background: int | None = None
+    ) -> Self:
+        """
+        Convert a monochrome bitmap into a sprite.
+
+        Args:
+            rows (Sequence[int | str]): Each row as an int, the most significant of the `width` bits being the leftmost
+                pixel, or as a string, "#" or "1" for a set pixel.
+            width (int): The width of the bitmap.
+            color (int): The color of the set pixels.
+            background (int, optional): The color of the clear pixels, they are transparent if None. Defaults to None.
+
+        Returns:
+            Sprite: The converted bitmap.
+
+        Examples:
+            >>> heart = Sprite.from_bitmap([".#.#.", "#####", ".###.", "..#.."], 5, Color.RED)
+        """
+        clear = -1 if background is None else background
+        converted = []
+        for row in rows:
+            if isinstance(row, str):
+                row = int("".join("1" if char in "#1" else "0" for char in row.ljust(width, ".")), 2)
+            converted.append([color if row >> (width - 1 - x) & 1 else clear for x in range(width)])
+        return cls(converted, None if background is not None else -1)
+
+    @property
+    def calls(self) -> int:
+        """
+        the count of drawing calls a blit costs
+        """
+        return len(self.frames) + len(self.lines) + len(self.pixels)
+
+    def draw(self, target: Any, x: int, y: int) -> Any:
+        """
+        Draw the sprite with the drawing methods of a `Screen`-like object, e.g. a `CommandCanvas`.
+
+        Args:
+            target (Any): The object to draw on.
+            x (int): The X coordinate of the top-left corner.
+            y (int): The Y coordinate of the top-left corner.
+
+        Returns:
+            Any: The target.
+        """
+        for x1, y1, x2, y2, color in self.frames:
+            target.fill_frame(x + x1, y + y1, x + x2, y + y2, color)
+        for x1, y1, x2, y2, color in self.lines:
+            target.draw_line(x + x1, y + y1, x + x2, y + y2, color)
+        for x0, y0, color in self.pixels:
+            target.draw_pixel(x + x0, y + y0, color)
+        return target
+
+
+def _row_runs(row: Sequence[int], transparent: int | None) -> List[Tuple[int, int, int]]:
+    runs = []
+    start = 0
+    width = len(row)
+    while start < width:
+        color = row[start]
+        end = start
+        while end + 1 < width and row[end + 1] == color:
+            end += 1
+        if color != transparent:
+            runs.append((start, end, int(color)))
+        start = end + 1
+    return runs
+
+
+def _emit(
+    run: Tuple[int, int, int],
+    top: int,
+    bottom: int,
+    frames: List[Rect],
+    lines: List[Rect],
+    pixels: List[Tuple[int, int, int]],
+) -> None:
+    x1, x2, color = run
+    if top != bottom:
+        if x1 == x2:
+            lines.append((x1, top, x2, bottom, color))
+        else:
+            frames.append((x1, top, x2, bottom, color))
+    elif x1 != x2:
+        lines.append((x1, top, x2, bottom, color))
+    else:
+        pixels.append((x1, top, color))
+
+
+class SpriteCache:
+    """
+    Keeps the converted sprites, evicting the least recently used ones beyond the capacity.
+    """
+
+    def __init__(self, capacity: int = 32):
+        """
+        Initializes an instance of the SpriteCache class.
+
+        Args:
+            capacity (int): The count of sprites kept. Defaults to 32.
+
+        Examples:
+            >>> cache = SpriteCache(capacity=8)
+            >>> logo = cache.get_or_convert("logo", lambda: Sprite.from_rgb888(raw, 32, 32, transparent=0))
+        """
+        if capacity < 1:
+            raise ValueError(f"Capacity must be at least 1, got {capacity}")
+        self._capacity: int = capacity
+        self._sprites: OrderedDict[Hashable, Sprite] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def __len__(self) -> int:
+        return len(self._sprites)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._sprites
+
+    def get(self, key: Hashable) -> Sprite | None:
+        """
+        Get a cached sprite.
+
+        Args:
+            key (Hashable): The key of the sprite.
+
+        Returns:
+            Sprite | None: The sprite, None if it is not cached.
+        """
+        if (sprite := self._sprites.get(key)) is None:
+            self.misses += 1
+            return None
+        self._sprites.move_to_end(key)
+        self.hits += 1
+        return sprite
+
+    def put(self, key: Hashable, sprite: Sprite) -> Self:
+        """
+        Cache a sprite, evicting the least recently used one if the cache is full.
+
+        Args:
+            key (Hashable): The key of the sprite.
+            sprite (Sprite): The sprite.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self._sprites[key] = sprite
+        self._sprites.move_to_end(key)
+        while len(self._sprites) > self._capacity:
+            self._sprites.popitem(last=False)
+            self.evictions += 1
+        return self
+
+    def get_or_convert(self, key: Hashable, converter: Callable[[], Sprite]) -> Sprite:
+        """
+        Get a cached sprite, converting and caching it on a miss.
+
+        Args:
+            key (Hashable): The key of the sprite.
+            converter (Callable[[], Sprite]): Called on a miss to convert the image.
+
+        Returns:
+            Sprite: The sprite.
+        """
+        if (sprite := self.get(key)) is None:
+            sprite = converter()
+            self.put(key, sprite)
+        return sprite
+
+    def clear(self) -> Self:
+        """
+        Drop all the cached sprites.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self._sprites.clear()
+        return self
@@ -0,0 +1,39 @@
+from functools import lru_cache
+from textwrap import TextWrapper
+from typing import Tuple
+
+
+@lru_cache(maxsize=256)
+def layout_text(text: str, columns: int, rows: int | None = None) -> Tuple[str, ...]:
+    """
+    Break a text into the lines of a monospaced text area.
+
+    The paragraphs separated by "\\n" are wrapped at the spaces, words longer than a line are split, and the lines
+    beyond the area are dropped. The layouts are cached, so drawing the same text again costs a lookup.
+
+    Args:
+        text (str): The text to lay out.
+        columns (int): The count of characters per line.
+        rows (int, optional): The count of lines kept, all of them if None. Defaults to None.
+
+    Returns:
+        Tuple[str, ...]: The lines.
+
+    Examples:
+        >>> layout_text("hello pyuptech world", 10)
+        ('hello', 'pyuptech', 'world')
+    """
+    if columns < 1:
+        raise ValueError(f"At least one column is required, got {columns}")
+    wrapper = _wrapper(columns)
+    lines = []
+    for paragraph in text.split("\n"):
+        lines.extend(wrapper.wrap(paragraph) or ("",))
+        if rows is not None and len(lines) >= rows:
+            return tuple(lines[:rows])
+    return tuple(lines)
+
+
+@lru_cache(maxsize=32)
+def _wrapper(columns: int) -> TextWrapper:
+    return TextWrapper(columns, expand_tabs=True, tabsize=4, replace_whitespace=False, break_on_hyphens=False)
@@ -0,0 +1,396 @@
+from pathlib import Path
+from struct import Struct
+from time import perf_counter_ns, sleep
+from typing import Any, Dict, Iterator, Self, Tuple
+
+from .commands import CommandCanvas, ScreenOp, COMMAND_LAYOUTS, decode_command
+from .logger import _logger
+from .screen import FontSize, ScreenDirection, _print_layout
+
+E3 = 1000
+E9 = 1000000000
+
+TRACE_MAGIC = b"PUTR"
+TRACE_VERSION = 1
+
+# file layout, little endian without padding
+# magic, version, then for each call: the microseconds since the previous call, the nanoseconds the call took
+# on the recorded screen, and the call encoded by `encode_command`
+_TRACE_HEADER = Struct("<4sB")
+_ENTRY = Struct("<II")
+_U32_MAX = 0xFFFFFFFF
+
+_STATE_OPS = frozenset((ScreenOp.SET_FONT_SIZE, ScreenOp.SET_FORE_COLOR, ScreenOp.SET_BACK_COLOR))
+
+# the font a `Screen` starts with, until the trace sets one
+_INITIAL_FONT = FontSize.FONT_12X20
+
+# the (x1, y1, x2, y2) corners of the area a drawing call covers, both inclusive
+Area = Tuple[int, int, int, int]
+
+
+def _call_area(op: ScreenOp, args: Tuple, font: FontSize) -> Area:
+    if op is ScreenOp.PUT_STRING:
+        x, y, text = args
+        lines = text.split("\n")
+        width = max(len(line) for line in lines) * font.column_width
+        return x, y, x + width - 1, y + len(lines) * font.row_height - 1
+    if op in (ScreenOp.FILL_CIRCLE, ScreenOp.DRAW_CIRCLE, ScreenOp.DRAW_ARC):
+        x, y, r = args[:3]
+        return x - r, y - r, x + r, y + r
+    if op is ScreenOp.DRAW_PIXEL:
+        x, y = args[:2]
+        return x, y, x, y
+    # the frames, the mesh and the line span their two corners
+    x1, y1, x2, y2 = args[:4]
+    return min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)
+
+
+def _overlap(a: Area, b: Area) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+class ScreenTrace:
+    """
+    A recorded stream of `Screen` calls with their timing.
+    """
+
+    def __init__(self, data: bytes | bytearray = b""):
+        """
+        Initializes an instance of the ScreenTrace class.
+
+        Args:
+            data (bytes): The entries of the trace, without the file header. Defaults to empty.
+        """
+        self._data: bytearray = bytearray(data)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __iter__(self) -> Iterator[Tuple[int, int, ScreenOp, Tuple]]:
+        """
+        Yields:
+            Tuple[int, int, ScreenOp, Tuple]: The microseconds since the previous call, the nanoseconds the call took
+                when recorded, the opcode and the arguments of each call.
+        """
+        data = self._data
+        offset = 0
+        end = len(data)
+        while offset < end:
+            delta_us, cost_ns = _ENTRY.unpack_from(data, offset)
+            op, args, offset = decode_command(data, offset + _ENTRY.size)
+            yield delta_us, cost_ns, op, args
+
+    @property
+    def size(self) -> int:
+        """
+        the size of the trace in bytes, without the file header
+        """
+        return len(self._data)
+
+    def append(self, delta_us: int, cost_ns: int, command: bytes) -> Self:
+        """
+        Append an encoded call.
+
+        Args:
+            delta_us (int): The microseconds since the previous call.
+            cost_ns (int): The nanoseconds the call took.
+            command (bytes): The call encoded by `encode_command`.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self._data += _ENTRY.pack(min(delta_us, _U32_MAX), min(cost_ns, _U32_MAX)) + command
+        return self
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the trace with its file header.
+        """
+        return _TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION) + self._data
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Self:
+        """
+        Deserialize a trace serialized by `to_bytes()`.
+
+        Args:
+            data (bytes): The serialized trace.
+
+        Returns:
+            ScreenTrace: The trace.
+        """
+        magic, version = _TRACE_HEADER.unpack_from(data)
+        if magic != TRACE_MAGIC:
+            raise ValueError(f"Not a screen trace, the magic is {magic!r}")
+        if version != TRACE_VERSION:
+            raise ValueError(f"Unsupported screen trace version {version}, expected {TRACE_VERSION}")
+        return cls(data[_TRACE_HEADER.size :])
+
+    def save(self, path: str | Path) -> Self:
+        """
+        Write the trace to a file.
+
+        Args:
+            path (str | Path): The path of the file.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        Path(path).write_bytes(self.to_bytes())
+        return self
+
+    @classmethod
+    def load(cls, path: str | Path) -> Self:
+        """
+        Read a trace written by `save()`.
+
+        Args:
+            path (str | Path): The path of the file.
+
+        Returns:
+            ScreenTrace: The trace.
+        """
+        return cls.from_bytes(Path(path).read_bytes())
+
+    def analyze(self) -> "TraceReport":
+        """
+        Summarize the trace with the costs measured when it was recorded.
+
+        Returns:
+            TraceReport: The cost of each primitive and the redundant draws.
+        """
+        report = TraceReport()
+        for delta_us, cost_ns, op, args in self:
+            report.add(delta_us, op, args, cost_ns)
+        return report
+
+    def replay(self, target: Any, realtime: bool = False, speed: float = 1.0) -> "TraceReport":
+        """
+        Apply the calls to a `Screen`, or any object with the same drawing methods, and measure them there.
+
+        Args:
+            target (Any): The object to draw on.
+            realtime (bool): Whether to keep the recorded pace between the calls. Defaults to False.
+            speed (float): The factor of the pace if realtime, 2.0 replays twice as fast. Defaults to 1.0.
+
+        Returns:
+            TraceReport: The cost of each primitive on the target, and the redundant draws.
+        """
+        report = TraceReport()
+        due_ns = perf_counter_ns()
+        for delta_us, _, op, args in self:
+            if realtime:
+                due_ns += int(delta_us * E3 / speed)
+                if (remaining := due_ns - perf_counter_ns()) > 0:
+                    sleep(remaining / E9)
+            method = getattr(target, COMMAND_LAYOUTS[op][0])
+            started = perf_counter_ns()
+            method(*args)
+            report.add(delta_us, op, args, perf_counter_ns() - started)
+        return report
+
+
+class PrimitiveCost:
+    """
+    The cost of the calls of one primitive.
+    """
+
+    __slots__ = ("count", "total_ns", "max_ns")
+
+    def __init__(self):
+        self.count: int = 0
+        self.total_ns: int = 0
+        self.max_ns: int = 0
+
+    @property
+    def mean_ns(self) -> float:
+        """
+        the mean cost of a call, in nanoseconds
+        """
+        return self.total_ns / self.count if self.count else 0.0
+
+
+class TraceReport:
+    """
+    The cost of each primitive of a trace, and the calls that changed nothing on the screen.
+
+    A drawing call is redundant if it repeats the latest call of its kind at the same position, in any earlier
+    frame, and nothing was drawn over the area of that call since, e.g. a label redrawn every frame with the same
+    text. `fill_screen()` clears the screen, so no call repeats one drawn before it. A call setting a font or a color
+    that is already set is redundant as well. A frame is redundant if it issues exactly the calls of the previous
+    frame.
+    """
+
+    def __init__(self):
+        self.calls: int = 0
+        self.frames: int = 0
+        self.duration_us: int = 0
+        self.costs: Dict[ScreenOp, PrimitiveCost] = {}
+        self.redundant_draws: int = 0
+        self.redundant_state_changes: int = 0
+        self.redundant_frames: int = 0
+        self._state: Dict[ScreenOp, Any] = {}
+        # (op, position) => (the rest of the call and the state it was drawn with, its area), for the calls still
+        # intact on the screen
+        self._drawn: Dict[Tuple[ScreenOp, Tuple], Tuple[Tuple, Area]] = {}
+        self._frame: list = []
+        self._previous_frame: list | None = None
+
+    @property
+    def total_ns(self) -> int:
+        """
+        the total cost of the calls, in nanoseconds
+        """
+        return sum(cost.total_ns for cost in self.costs.values())
+
+    def add(self, delta_us: int, op: ScreenOp, args: Tuple, cost_ns: int) -> Self:
+        """
+        Account a call.
+
+        Args:
+            delta_us (int): The microseconds since the previous call.
+            op (ScreenOp): The opcode.
+            args (Tuple): The arguments.
+            cost_ns (int): The nanoseconds the call took.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self.calls += 1
+        self.duration_us += delta_us
+        if (cost := self.costs.get(op)) is None:
+            cost = self.costs[op] = PrimitiveCost()
+        cost.count += 1
+        cost.total_ns += cost_ns
+        if cost_ns > cost.max_ns:
+            cost.max_ns = cost_ns
+
+        if op is ScreenOp.REFRESH:
+            self.frames += 1
+            if self._frame == self._previous_frame:
+                self.redundant_frames += 1
+            self._previous_frame = self._frame
+            self._frame = []
+            return self
+        self._frame.append((op, args))
+        if op in _STATE_OPS:
+            if self._state.get(op) == args:
+                self.redundant_state_changes += 1
+            self._state[op] = args
+        elif op is ScreenOp.FILL_SCREEN:
+            self._drawn.clear()
+        else:
+            self._account_draw(op, args)
+        return self
+
+    def _account_draw(self, op: ScreenOp, args: Tuple) -> None:
+        state = self._state
+        if op is ScreenOp.PUT_STRING:
+            font_args = state.get(ScreenOp.SET_FONT_SIZE)
+            font = FontSize(font_args[0]) if font_args else _INITIAL_FONT
+            # a string is drawn with the current colors and font
+            key = op, args[:2]
+            value = args[2], state.get(ScreenOp.SET_FORE_COLOR), state.get(ScreenOp.SET_BACK_COLOR), font
+        else:
+            font = _INITIAL_FONT
+            key, value = (op, args[:-1]), args[-1:]
+        drawn = self._drawn
+        if (previous := drawn.get(key)) is not None and previous[0] == value:
+            self.redundant_draws += 1
+            return
+        area = _call_area(op, args, font)
+        # the calls drawn over are no longer intact
+        for other_key, (_, other_area) in tuple(drawn.items()):
+            if _overlap(area, other_area):
+                del drawn[other_key]
+        drawn[key] = value, area
+
+    def __str__(self) -> str:
+        lines = [
+            f"calls: {self.calls}, frames: {self.frames}, duration: {self.duration_us / E3:.1f}ms, "
+            f"cost: {self.total_ns / E3:.1f}us",
+            f"redundant draws: {self.redundant_draws}, redundant state changes: {self.redundant_state_changes}, "
+            f"redundant frames: {self.redundant_frames}",
+        ]
+        for op, cost in sorted(self.costs.items(), key=lambda item: -item[1].total_ns):
+            lines.append(
+                f"{COMMAND_LAYOUTS[op][0]:<18}{cost.count:>8} calls{cost.total_ns / E3:>12.1f}us"
+                f"{cost.mean_ns / E3:>10.2f}us mean{cost.max_ns / E3:>10.2f}us max"
+            )
+        return "\n".join(lines)
+
+
+class ScreenRecorder(CommandCanvas):
+    """
+    Draws on a `Screen` and records every call into a `ScreenTrace`, with the time between the calls and the time
+    each of them took.
+    """
+
+    def __init__(self, screen: Any):
+        """
+        Initializes an instance of the ScreenRecorder class.
+
+        Args:
+            screen (Any): The `Screen` to draw on, or any object with the same drawing methods.
+
+        Examples:
+            >>> recorder = ScreenRecorder(Screen(screen_dir=2))
+            >>> recorder.fill_screen(Color.BLACK).put_string(0, 0, "hello").refresh()
+            >>> recorder.trace.save("ui.trace")
+            >>> print(ScreenTrace.load("ui.trace").replay(CommandCanvas()))
+        """
+        super().__init__()
+        self._screen: Any = screen
+        self._trace: ScreenTrace = ScreenTrace()
+        self._last_call_ns: int | None = None
+
+    @property
+    def trace(self) -> ScreenTrace:
+        """
+        the trace recorded so far
+        """
+        return self._trace
+
+    def __getattr__(self, name: str) -> Any:
+        # the calls that draw nothing, e.g. the LEDs, go to the screen unrecorded
+        if name == "_screen":
+            raise AttributeError(name)
+        return getattr(self._screen, name)
+
+    def _record(self, op: ScreenOp, *args: Any) -> Self:
+        start = len(self._commands)
+        super()._record(op, *args)
+        command = bytes(self._commands[start:])
+        self._commands.clear()
+        method = getattr(self._screen, COMMAND_LAYOUTS[op][0])
+        started = perf_counter_ns()
+        method(*args)
+        cost = perf_counter_ns() - started
+        delta_us = 0 if self._last_call_ns is None else (started - self._last_call_ns) // E3
+        self._last_call_ns = started
+        self._trace.append(delta_us, cost, command)
+        return self
+
+    def print(self, display_string: str) -> Self:
+        """
+        Record `Screen.print` as the put_string calls of its lines.
+        """
+        layout = _print_layout(
+            display_string, self._screen.font_size, self._screen.direction or ScreenDirection.HORIZONTAL
+        )
+        for y, line in layout:
+            self.put_string(0, y, line.decode())
+        return self
+
+    def restart(self) -> Self:
+        """
+        Drop the trace recorded so far and start a new one.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        _logger.debug("Dropping a screen trace of %s bytes", self._trace.size)
+        self._trace = ScreenTrace()
+        self._last_call_ns = None
+        return self
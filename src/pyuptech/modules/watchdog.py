@@ -0,0 +1,178 @@
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from time import perf_counter_ns
+from typing import Any, Dict, Mapping, NamedTuple, Self, Tuple, TYPE_CHECKING
+
+from .logger import _logger
+
+if TYPE_CHECKING:
+    from .sensors import OnBoardSensors
+
+E3 = 1000
+
+# the bounded getters, by the hardware channel they go through
+BOUNDED_CALLS: Dict[str, str] = {
+    "adc_all_channels": "adc-io",
+    "io_all_channels": "adc-io",
+    "acc_all": "mpu",
+    "gyro_all": "mpu",
+    "atti_all": "mpu",
+}
+
+
+class Reading(NamedTuple):
+    """
+    The result of a bounded read
+    """
+
+    value: Any
+    """the fresh value, or the last good one if stale, None if no read has ever succeeded"""
+    stale: bool
+    """whether the read missed its budget or failed, and the value is the last good one"""
+    timestamp_ns: int
+    """the perf_counter_ns timestamp at which the value was obtained, 0 if never"""
+
+
+class BoundedReader:
+    """
+    Reads the sensors with a latency budget per call.
+
+    Each hardware fetch runs on a watchdog worker of its channel. If it does not finish within the budget,
+    the last good value is returned marked stale, and the fetch left in flight is picked up by the next read
+    instead of queueing another one behind it. A blocked call cannot be cancelled, it keeps its worker until
+    the lib returns.
+    """
+
+    def __init__(
+        self,
+        sensors: "OnBoardSensors",
+        budget_ms: float = 5,
+        budgets_ms: Mapping[str, float] | None = None,
+    ):
+        """
+        Initializes an instance of the BoundedReader class, starts the workers lazily.
+
+        Args:
+            sensors (OnBoardSensors): The sensors to read.
+            budget_ms (float): The default budget of every call. Defaults to 5.
+            budgets_ms (Mapping[str, float], optional): The budgets of specific calls, by getter name,
+                e.g. {"atti_all": 2}. Defaults to None.
+
+        Examples:
+            >>> reader = BoundedReader(sensors, budget_ms=3)
+            >>> atti = reader.atti_all()
+            >>> yaw = atti.value[2] if atti.value is not None else 0.0
+        """
+        budgets = {name: budget_ms for name in BOUNDED_CALLS}
+        for name, budget in (budgets_ms or {}).items():
+            if name not in BOUNDED_CALLS:
+                raise ValueError(f"Unsupported call {name}, must be one of {list(BOUNDED_CALLS)}")
+            budgets[name] = budget
+        self._sensors: "OnBoardSensors" = sensors
+        self._budgets_s: Dict[str, float] = {name: budget / E3 for name, budget in budgets.items()}
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._in_flight: Dict[str, Future] = {}
+        self._last_good: Dict[str, Tuple[Any, int]] = {name: (None, 0) for name in BOUNDED_CALLS}
+        self._timeouts: Dict[str, int] = {name: 0 for name in BOUNDED_CALLS}
+        self._failures: Dict[str, int] = {name: 0 for name in BOUNDED_CALLS}
+
+    @property
+    def timeouts(self) -> Dict[str, int]:
+        """
+        the count of the reads that missed their budget, by getter name
+        """
+        return dict(self._timeouts)
+
+    @property
+    def failures(self) -> Dict[str, int]:
+        """
+        the count of the reads that raised, by getter name
+        """
+        return dict(self._failures)
+
+    def _executor(self, channel: str) -> ThreadPoolExecutor:
+        if (executor := self._executors.get(channel)) is None:
+            executor = self._executors[channel] = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"pyuptech-watchdog-{channel}"
+            )
+        return executor
+
+    def _absorb(self, name: str, future: Future) -> None:
+        if future.exception() is None:
+            self._last_good[name] = (future.result(), perf_counter_ns())
+
+    def read(self, name: str) -> Reading:
+        """
+        Call a getter of the sensors within its budget.
+
+        Args:
+            name (str): The name of the getter, one of the keys of `BOUNDED_CALLS`.
+
+        Returns:
+            Reading: The fresh value, or the last good value marked stale.
+        """
+        future = self._in_flight.pop(name, None)
+        if future is not None and future.done():
+            # the fetch that missed the previous budget has finished meanwhile
+            self._absorb(name, future)
+            future = None
+        if future is None:
+            future = self._executor(BOUNDED_CALLS[name]).submit(getattr(self._sensors, name))
+        try:
+            value = future.result(timeout=self._budgets_s[name])
+        except FutureTimeoutError:
+            self._in_flight[name] = future
+            self._timeouts[name] += 1
+            _logger.warning("%s exceeded its budget of %.1fms, serving stale value", name, self._budgets_s[name] * E3)
+            value, timestamp = self._last_good[name]
+            return Reading(value, True, timestamp)
+        except Exception as e:
+            self._failures[name] += 1
+            _logger.error("%s failed, serving stale value, %s", name, e)
+            value, timestamp = self._last_good[name]
+            return Reading(value, True, timestamp)
+        timestamp = perf_counter_ns()
+        self._last_good[name] = (value, timestamp)
+        return Reading(value, False, timestamp)
+
+    def adc_all_channels(self) -> Reading:
+        """
+        Get all the ADC channels within the budget.
+        """
+        return self.read("adc_all_channels")
+
+    def io_all_channels(self) -> Reading:
+        """
+        Get all the io input levels within the budget.
+        """
+        return self.read("io_all_channels")
+
+    def acc_all(self) -> Reading:
+        """
+        Get the acceleration data within the budget.
+        """
+        return self.read("acc_all")
+
+    def gyro_all(self) -> Reading:
+        """
+        Get the gyroscope data within the budget.
+        """
+        return self.read("gyro_all")
+
+    def atti_all(self) -> Reading:
+        """
+        Get the attitude data within the budget.
+        """
+        return self.read("atti_all")
+
+    def close(self) -> Self:
+        """
+        Stop the workers without waiting for the calls in flight.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._executors.clear()
+        self._in_flight.clear()
+        return self
@@ -0,0 +1,473 @@
+from typing import Any, Callable, Dict, List, Self, Tuple
+
+from .commands import CommandCanvas, replay_commands
+from .screen import Color, FontSize
+
+ValueGetter = Callable[[], Any]
+
+# the value of a widget that has not been rendered since its chrome was drawn
+_UNSET = object()
+
+
+class Widget:
+    """
+    A retained element of the screen: static chrome drawn once per page show, and a bound value redrawn on change.
+
+    The chrome is recorded once into a command stream and replayed on every show. The value is only redrawn when it
+    differs from the one on the screen, and each widget redraws as little of itself as its kind allows.
+    """
+
+    def __init__(self, x: int, y: int, width: int, height: int):
+        self.x: int = x
+        self.y: int = y
+        self.width: int = width
+        self.height: int = height
+        self._getter: ValueGetter | None = None
+        self._shown: Any = _UNSET
+        self._chrome: bytes | None = None
+
+    @property
+    def bounds(self) -> Tuple[int, int, int, int]:
+        """
+        the (x1, y1, x2, y2) corners of the area of the widget, both inclusive
+        """
+        return self.x, self.y, self.x + self.width - 1, self.y + self.height - 1
+
+    @property
+    def chrome(self) -> bytes:
+        """
+        the command stream drawing the static part of the widget, recorded on the first access
+        """
+        if self._chrome is None:
+            self._chrome = self.draw_chrome(CommandCanvas()).commands
+        return self._chrome
+
+    def bind(self, getter: ValueGetter) -> Self:
+        """
+        Bind the value of the widget to a getter, polled by `Page.update()`.
+
+        Args:
+            getter (ValueGetter): The function returning the value.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self._getter = getter
+        return self
+
+    def invalidate(self) -> Self:
+        """
+        Forget the value on the screen, the next render draws it whatever it is.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self._shown = _UNSET
+        return self
+
+    def render(self, screen: Any, value: Any) -> bool:
+        """
+        Draw the value if it differs from the one on the screen.
+
+        Args:
+            screen (Any): The `Screen`, or any object with the same drawing methods.
+            value (Any): The value to show.
+
+        Returns:
+            bool: Whether anything was drawn.
+        """
+        if value == self._shown:
+            return False
+        self.draw_value(screen, self._shown, value)
+        self._shown = value
+        return True
+
+    def poll(self, screen: Any) -> bool:
+        """
+        Render the value of the bound getter, a widget without a getter draws nothing.
+
+        Args:
+            screen (Any): The `Screen`, or any object with the same drawing methods.
+
+        Returns:
+            bool: Whether anything was drawn.
+        """
+        if self._getter is None:
+            return False
+        return self.render(screen, self._getter())
+
+    def draw_chrome(self, canvas: CommandCanvas) -> CommandCanvas:
+        """
+        Draw the static part, the subclasses override it.
+        """
+        return canvas
+
+    def draw_value(self, screen: Any, old: Any, new: Any) -> None:
+        """
+        Draw a new value over the old one, `_UNSET` if the chrome was just drawn, the subclasses override it.
+        """
+
+
+class Label(Widget):
+    """
+    A static text.
+    """
+
+    def __init__(
+        self,
+        x: int,
+        y: int,
+        text: str,
+        font_size: FontSize = FontSize.FONT_6X8,
+        fore_color: Color | int = Color.WHITE,
+        back_color: Color | int = Color.BLACK,
+    ):
+        super().__init__(x, y, len(text) * font_size.column_width, font_size.row_height)
+        self.text: str = text
+        self.font_size: FontSize = font_size
+        self.fore_color: int = fore_color
+        self.back_color: int = back_color
+
+    def draw_chrome(self, canvas: CommandCanvas) -> CommandCanvas:
+        return (
+            canvas.set_font_size(self.font_size)
+            .set_fore_color(self.fore_color)
+            .set_back_color(self.back_color)
+            .put_string(self.x, self.y, self.text)
+        )
+
+
+class ValueField(Label):
+    """
+    A caption followed by a formatted value, only the characters of the value that changed are redrawn.
+    """
+
+    def __init__(
+        self,
+        x: int,
+        y: int,
+        caption: str,
+        chars: int,
+        fmt: str = "{}",
+        font_size: FontSize = FontSize.FONT_6X8,
+        fore_color: Color | int = Color.WHITE,
+        back_color: Color | int = Color.BLACK,
+    ):
+        """
+        Initializes an instance of the ValueField class.
+
+        Args:
+            x (int): The X coordinate of the top-left corner.
+            y (int): The Y coordinate of the top-left corner.
+            caption (str): The static text before the value.
+            chars (int): The count of characters reserved for the value, longer values are cut.
+            fmt (str): The format of the value. Defaults to "{}".
+            font_size (FontSize): The font. Defaults to FontSize.FONT_6X8.
+            fore_color (Color | int): The color of the text. Defaults to Color.WHITE.
+            back_color (Color | int): The color of the background. Defaults to Color.BLACK.
+
+        Examples:
+            >>> yaw = ValueField(0, 0, "yaw:", 7, "{:7.1f}").bind(lambda: sensors.atti_all()[2])
+        """
+        super().__init__(x, y, caption, font_size, fore_color, back_color)
+        self.width += chars * font_size.column_width
+        self.chars: int = chars
+        self.fmt: str = fmt
+        self._value_x: int = x + len(caption) * font_size.column_width
+
+    def render(self, screen: Any, value: Any) -> bool:
+        # compare the formatted text, values that format the same are not redrawn
+        return super().render(screen, self.fmt.format(value)[: self.chars].ljust(self.chars))
+
+    def draw_value(self, screen: Any, old: str | object, new: str) -> None:
+        start = 0
+        if old is not _UNSET:
+            while old[start] == new[start]:
+                start += 1
+        end = self.chars
+        if old is not _UNSET:
+            while old[end - 1] == new[end - 1]:
+                end -= 1
+        (
+            screen.set_font_size(self.font_size)
+            .set_fore_color(self.fore_color)
+            .set_back_color(self.back_color)
+            .put_string(self._value_x + start * self.font_size.column_width, self.y, new[start:end])
+        )
+
+
+class BarGauge(Widget):
+    """
+    A horizontal bar, a change of the value only fills the strip between the old and the new ends of the bar.
+    """
+
+    def __init__(
+        self,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        low: float,
+        high: float,
+        color: Color | int = Color.GREEN,
+        back_color: Color | int = Color.BLACK,
+        frame_color: Color | int = Color.WHITE,
+    ):
+        """
+        Initializes an instance of the BarGauge class.
+
+        Args:
+            x (int): The X coordinate of the top-left corner of the frame.
+            y (int): The Y coordinate of the top-left corner of the frame.
+            width (int): The width of the frame, at least 3 pixels.
+            height (int): The height of the frame, at least 3 pixels.
+            low (float): The value of an empty bar.
+            high (float): The value of a full bar.
+            color (Color | int): The color of the bar. Defaults to Color.GREEN.
+            back_color (Color | int): The color of the empty part. Defaults to Color.BLACK.
+            frame_color (Color | int): The color of the frame. Defaults to Color.WHITE.
+
+        Examples:
+            >>> gauge = BarGauge(0, 56, 128, 8, 0, 4095).bind(lambda: sensors.adc_all_channels()[0])
+        """
+        if width < 3 or height < 3:
+            raise ValueError(f"The gauge must be at least 3x3 pixels, got {width}x{height}")
+        if low >= high:
+            raise ValueError(f"The low end must be below the high one, got {low} and {high}")
+        super().__init__(x, y, width, height)
+        self.low: float = low
+        self.high: float = high
+        self.color: int = color
+        self.back_color: int = back_color
+        self.frame_color: int = frame_color
+        self._inner: int = width - 2
+
+    def render(self, screen: Any, value: float) -> bool:
+        # compare the filled length, values that fill the same pixels are not redrawn
+        ratio = (value - self.low) / (self.high - self.low)
+        return super().render(screen, round(min(max(ratio, 0.0), 1.0) * self._inner))
+
+    def draw_chrome(self, canvas: CommandCanvas) -> CommandCanvas:
+        x1, y1, x2, y2 = self.bounds
+        return canvas.draw_frame(x1, y1, x2, y2, self.frame_color).fill_frame(
+            x1 + 1, y1 + 1, x2 - 1, y2 - 1, self.back_color
+        )
+
+    def draw_value(self, screen: Any, old: int | object, new: int) -> None:
+        old = 0 if old is _UNSET else old
+        left = self.x + 1
+        top, bottom = self.y + 1, self.y + self.height - 2
+        if new > old:
+            screen.fill_frame(left + old, top, left + new - 1, bottom, self.color)
+        elif new < old:
+            screen.fill_frame(left + new, top, left + old - 1, bottom, self.back_color)
+
+
+class IndicatorRow(Widget):
+    """
+    A row of square lamps showing the bits of a mask, e.g. the io levels, only the lamps that flipped are redrawn.
+    """
+
+    def __init__(
+        self,
+        x: int,
+        y: int,
+        bits: int = 8,
+        size: int = 7,
+        spacing: int = 2,
+        on_color: Color | int = Color.GREEN,
+        off_color: Color | int = Color.BLACK,
+        frame_color: Color | int = Color.GRAY,
+    ):
+        """
+        Initializes an instance of the IndicatorRow class.
+
+        Args:
+            x (int): The X coordinate of the top-left corner.
+            y (int): The Y coordinate of the top-left corner.
+            bits (int): The count of lamps, lamp i shows bit i from the left. Defaults to 8.
+            size (int): The side of each lamp, frame included, at least 3 pixels. Defaults to 7.
+            spacing (int): The gap between two lamps. Defaults to 2.
+            on_color (Color | int): The color of a set bit. Defaults to Color.GREEN.
+            off_color (Color | int): The color of a clear bit. Defaults to Color.BLACK.
+            frame_color (Color | int): The color of the frames. Defaults to Color.GRAY.
+
+        Examples:
+            >>> io_row = IndicatorRow(0, 40).bind(sensors.io_all_channels)
+        """
+        if size < 3:
+            raise ValueError(f"The lamps must be at least 3 pixels wide, got {size}")
+        super().__init__(x, y, bits * size + (bits - 1) * spacing, size)
+        self.bits: int = bits
+        self.size: int = size
+        self.on_color: int = on_color
+        self.off_color: int = off_color
+        self.frame_color: int = frame_color
+        self._lefts: Tuple[int, ...] = tuple(x + index * (size + spacing) for index in range(bits))
+
+    def render(self, screen: Any, value: int) -> bool:
+        return super().render(screen, value & ((1 << self.bits) - 1))
+
+    def draw_chrome(self, canvas: CommandCanvas) -> CommandCanvas:
+        bottom = self.y + self.size - 1
+        for left in self._lefts:
+            canvas.draw_frame(left, self.y, left + self.size - 1, bottom, self.frame_color)
+            canvas.fill_frame(left + 1, self.y + 1, left + self.size - 2, bottom - 1, self.off_color)
+        return canvas
+
+    def draw_value(self, screen: Any, old: int | object, new: int) -> None:
+        changed = new ^ (0 if old is _UNSET else old)
+        top, bottom = self.y + 1, self.y + self.size - 2
+        while changed:
+            bit = changed & -changed
+            index = bit.bit_length() - 1
+            left = self._lefts[index]
+            color = self.on_color if new & bit else self.off_color
+            screen.fill_frame(left + 1, top, left + self.size - 2, bottom, color)
+            changed ^= bit
+
+
+class Page:
+    """
+    A set of widgets shown together.
+    """
+
+    def __init__(self, *widgets: Widget):
+        self.widgets: List[Widget] = list(widgets)
+
+    def add(self, widget: Widget) -> Self:
+        """
+        Add a widget to the page.
+
+        Args:
+            widget (Widget): The widget.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self.widgets.append(widget)
+        return self
+
+    def draw(self, screen: Any) -> Self:
+        """
+        Draw the chrome of every widget, and the values of the bound ones.
+
+        Args:
+            screen (Any): The `Screen`, or any object with the same drawing methods.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        for widget in self.widgets:
+            replay_commands(widget.chrome, screen)
+            widget.invalidate().poll(screen)
+        return self
+
+    def erase(self, screen: Any, color: Color | int) -> Self:
+        """
+        Fill the area of every widget.
+
+        Args:
+            screen (Any): The `Screen`, or any object with the same drawing methods.
+            color (Color | int): The fill color.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        for widget in self.widgets:
+            screen.fill_frame(*widget.bounds, color)
+        return self
+
+    def update(self, screen: Any) -> int:
+        """
+        Render the bound values that changed.
+
+        Args:
+            screen (Any): The `Screen`, or any object with the same drawing methods.
+
+        Returns:
+            int: The count of widgets redrawn.
+        """
+        return sum(widget.poll(screen) for widget in self.widgets)
+
+
+class PageContainer:
+    """
+    Switches between pages of widgets on a screen.
+
+    A switch erases the areas of the widgets of the leaving page instead of the whole screen, then draws the chrome
+    of the entering page from its recorded command streams.
+    """
+
+    def __init__(self, screen: Any, background: Color | int = Color.BLACK):
+        """
+        Initializes an instance of the PageContainer class.
+
+        Args:
+            screen (Any): The `Screen`, or any object with the same drawing methods, e.g. a `CommandCanvas`.
+            background (Color | int): The color the areas of a leaving page are erased with. Defaults to Color.BLACK.
+
+        Examples:
+            >>> pages = PageContainer(screen)
+            >>> pages.add("adc", Page(ValueField(0, 0, "adc0:", 4).bind(lambda: sensors.adc_all_channels()[0])))
+            >>> pages.add("io", Page(IndicatorRow(0, 0).bind(sensors.io_all_channels)))
+            >>> pages.show("adc")
+            >>> pages.update()
+            >>> screen.refresh()
+        """
+        self._screen: Any = screen
+        self._background: int = background
+        self._pages: Dict[str, Page] = {}
+        self._current: str | None = None
+
+    @property
+    def current(self) -> str | None:
+        """
+        the name of the page shown, None if no page is shown
+        """
+        return self._current
+
+    def add(self, name: str, page: Page) -> Self:
+        """
+        Add a page.
+
+        Args:
+            name (str): The name of the page.
+            page (Page): The page.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self._pages[name] = page
+        return self
+
+    def show(self, name: str) -> Self:
+        """
+        Switch to a page.
+
+        Args:
+            name (str): The name of the page.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        if name not in self._pages:
+            raise KeyError(f"Unknown page {name}, must be one of {list(self._pages)}")
+        if self._current == name:
+            return self
+        if self._current is not None:
+            self._pages[self._current].erase(self._screen, self._background)
+        self._pages[name].draw(self._screen)
+        self._current = name
+        return self
+
+    def update(self) -> int:
+        """
+        Render the bound values of the shown page that changed.
+
+        Returns:
+            int: The count of widgets redrawn.
+        """
+        if self._current is None:
+            return 0
+        return self._pages[self._current].update(self._screen)
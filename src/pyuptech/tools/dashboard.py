@@ -0,0 +1,338 @@
+import sys
+from functools import lru_cache
+from typing import Callable, Dict, List, Literal, Self, Sequence, TextIO, Tuple, TypeAlias
+
+from ..modules.periodic import PeriodicThread
+from ..modules.sensors import OnBoardSensors
+
+E9 = 1000000000
+
+# the widths of the value cells, wider values are shown as "#"
+ADC_WIDTH = 5
+IO_WIDTH = 1
+MPU_WIDTH = 10
+
+# stands in for the value cells while terminaltables lays the table out, it is one column wide
+_SLOT_CHAR = "\x1f"
+
+Section: TypeAlias = Literal["adc", "io", "mpu"]
+Labels: TypeAlias = Tuple[Tuple[int, str], ...]
+
+
+class TableTemplate:
+    """
+    A `DoubleTable` laid out once, with blank value cells at known positions.
+
+    The text of the table is built a single time, later values are written into their cells by position, instead of
+    laying the whole table out again.
+    """
+
+    def __init__(self, rows: Sequence[Sequence[str | int]]):
+        """
+        Initializes an instance of the TableTemplate class.
+
+        Args:
+            rows (Sequence[Sequence[str | int]]): The cells of the table, a str is a fixed text, an int is a value cell
+                of that width.
+
+        Examples:
+            >>> template = TableTemplate([["ADC Name", "ADC0"], ["ADC Data", 5]])
+            >>> print(template.fill(["1024"]))
+        """
+        from terminaltables import DoubleTable
+        from terminaltables.width_and_alignment import visible_width
+
+        widths = [cell for row in rows for cell in row if isinstance(cell, int)]
+        table = DoubleTable([[_SLOT_CHAR * cell if isinstance(cell, int) else cell for cell in row] for row in rows])
+        table.inner_row_border = True
+        lines = table.table.split("\n")
+        slots: List[Tuple[int, int, int, int]] = []
+        for line_index, line in enumerate(lines):
+            start = 0
+            while (index := line.find(_SLOT_CHAR, start)) != -1:
+                width = widths[len(slots)]
+                # the cells are found in the order they were given, row by row
+                slots.append((line_index, index, visible_width(line[:index]), width))
+                start = index + width
+        self.lines: List[str] = [line.replace(_SLOT_CHAR, " ") for line in lines]
+        self.slots: List[Tuple[int, int, int, int]] = slots
+        """the line, the character index, the terminal column and the width of each value cell"""
+
+    @property
+    def text(self) -> str:
+        """
+        the table with blank value cells
+        """
+        return "\n".join(self.lines)
+
+    def fill(self, values: Sequence[str]) -> str:
+        """
+        The table with the values in their cells.
+
+        Args:
+            values (Sequence[str]): The text of each value cell, in the order they were given.
+
+        Returns:
+            str: The table.
+        """
+        lines = list(self.lines)
+        for (line_index, index, _, width), value in zip(self.slots, values):
+            line = lines[line_index]
+            lines[line_index] = line[:index] + fit_cell(value, width) + line[index + width :]
+        return "\n".join(lines)
+
+
+def fit_cell(value: str, width: int) -> str:
+    """
+    Right align a value in a cell, a value that does not fit is shown as "#".
+    """
+    return value.rjust(width) if len(value) <= width else "#" * width
+
+
+def labels_key(labels: Dict[int, str] | None) -> Labels:
+    """
+    The channel names in the hashable form taken by `adc_rows` and `io_rows`, sorted by index.
+    """
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+def layout_table(rows: Sequence[Sequence[str | int]], values: Sequence[str]) -> str:
+    """
+    Lay a `DoubleTable` out around the values, every column as wide as its widest cell.
+
+    Unlike a `TableTemplate`, no value is cut to a fixed width, at the cost of laying the whole table out each call.
+
+    Args:
+        rows (Sequence[Sequence[str | int]]): The cells of the table in the form taken by `TableTemplate`.
+        values (Sequence[str]): The text of each value cell, in the order they were given.
+
+    Returns:
+        str: The table.
+    """
+    from terminaltables import DoubleTable
+
+    cells = iter(values)
+    table = DoubleTable([[next(cells) if isinstance(cell, int) else cell for cell in row] for row in rows])
+    table.inner_row_border = True
+    return table.table
+
+
+def adc_rows(count: int, labels: Labels = ()) -> List[List[str | int]]:
+    """
+    The cells of the ADC table.
+
+    Args:
+        count (int): The count of ADC channels.
+        labels (Labels): The (index, name) pairs of the renamed channels. Defaults to none.
+    """
+    names = dict(labels)
+    return [
+        ["ADC Name"] + [names.get(i, f"ADC{i}") for i in range(count)],
+        ["ADC Data"] + [ADC_WIDTH] * count,
+    ]
+
+
+def io_rows(labels: Labels = ()) -> List[List[str | int]]:
+    """
+    The cells of the IO table.
+
+    Args:
+        labels (Labels): The (index, name) pairs of the renamed channels. Defaults to none.
+    """
+    names = dict(labels)
+    return [
+        ["IO Name"] + [names.get(i, f"IO{i}") for i in range(8)],
+        ["IO Data"] + [IO_WIDTH] * 8,
+        ["IO Mode"] + [IO_WIDTH] * 8,
+    ]
+
+
+def mpu_rows() -> List[List[str | int]]:
+    """
+    The cells of the MPU table.
+    """
+    return [["ACC", "Value", "GYRO", "Value", "ATTI", "Value"]] + [
+        [acc, MPU_WIDTH, gyro, MPU_WIDTH, atti, MPU_WIDTH]
+        for acc, gyro, atti in zip(("X_ACC", "Y_ACC", "Z_ACC"), ("X_GYRO", "Y_GYRO", "Z_GYRO"), ("Pitch", "Roll", "Yaw"))
+    ]
+
+
+@lru_cache(maxsize=None)
+def adc_template(count: int, labels: Labels = ()) -> TableTemplate:
+    """
+    The template of the ADC table.
+
+    Args:
+        count (int): The count of ADC channels.
+        labels (Labels): The (index, name) pairs of the renamed channels. Defaults to none.
+    """
+    return TableTemplate(adc_rows(count, labels))
+
+
+@lru_cache(maxsize=None)
+def io_template(labels: Labels = ()) -> TableTemplate:
+    """
+    The template of the IO table.
+
+    Args:
+        labels (Labels): The (index, name) pairs of the renamed channels. Defaults to none.
+    """
+    return TableTemplate(io_rows(labels))
+
+
+@lru_cache(maxsize=None)
+def mpu_template() -> TableTemplate:
+    """
+    The template of the MPU table.
+    """
+    return TableTemplate(mpu_rows())
+
+
+def adc_values(sensors: OnBoardSensors) -> List[str]:
+    """
+    The value cells of the ADC table.
+    """
+    return [str(value) for value in sensors.adc_all_channels()]
+
+
+def io_values(sensors: OnBoardSensors) -> List[str]:
+    """
+    The value cells of the IO table.
+    """
+    levels = sensors.io_all_channels()
+    modes = sensors.get_all_io_mode()
+    return [str(levels >> i & 1) for i in range(8)] + [str(modes >> i & 1) for i in range(8)]
+
+
+def mpu_values(sensors: OnBoardSensors) -> List[str]:
+    """
+    The value cells of the MPU table, each of the three packs is read once.
+    """
+    acc, gyro, atti = sensors.acc_all(), sensors.gyro_all(), sensors.atti_all()
+    return [f"{value:.2f}" for axis in zip(acc, gyro, atti) for value in axis]
+
+
+class TerminalDashboard:
+    """
+    A live view of the sensors in a terminal, e.g. over SSH.
+
+    The tables are laid out once. The first frame writes them whole, every later frame only moves the cursor to the
+    value cells whose text changed and overwrites them, all in a single write to the stream. The frames are drawn by
+    a daemon thread at a set rate, off the control thread.
+    """
+
+    def __init__(
+        self,
+        sensors: OnBoardSensors,
+        sections: Sequence[Section] = ("adc", "io", "mpu"),
+        frequency_hz: float = 10,
+        stream: TextIO | None = None,
+        adc_labels: Dict[int, str] | None = None,
+        io_labels: Dict[int, str] | None = None,
+    ):
+        """
+        Initializes an instance of the TerminalDashboard class.
+
+        Args:
+            sensors (OnBoardSensors): The sensors to show.
+            sections (Sequence[Section]): The tables to show, from top to bottom. Defaults to all of them.
+            frequency_hz (float): The rate of the frames. Defaults to 10.
+            stream (TextIO, optional): The terminal to write to, sys.stdout if None. Defaults to None.
+            adc_labels (Dict[int, str], optional): The names of the ADC channels. Defaults to None.
+            io_labels (Dict[int, str], optional): The names of the IO channels. Defaults to None.
+
+        Examples:
+            >>> dashboard = TerminalDashboard(OnBoardSensors().adc_io_open().MPU6500_Open()).start()
+            >>> ...
+            >>> dashboard.stop()
+        """
+        self._sensors: OnBoardSensors = sensors
+        self._stream: TextIO = stream or sys.stdout
+        readers: List[Tuple[TableTemplate, Callable[[OnBoardSensors], List[str]]]] = []
+        for section in sections:
+            match section:
+                case "adc":
+                    count = len(sensors.adc_all_channels())
+                    readers.append((adc_template(count, labels_key(adc_labels)), adc_values))
+                case "io":
+                    readers.append((io_template(labels_key(io_labels)), io_values))
+                case "mpu":
+                    readers.append((mpu_template(), mpu_values))
+                case _:
+                    raise ValueError(f"Unknown dashboard section {section!r}, expected 'adc', 'io' or 'mpu'")
+        self._readers = readers
+        lines: List[str] = []
+        # the 1-based terminal row and column, and the width of every value cell, in reading order
+        cells: List[Tuple[int, int, int]] = []
+        for template, _ in readers:
+            top = len(lines)
+            lines.extend(template.lines)
+            lines.append("")
+            cells.extend((top + line + 1, column + 1, width) for line, _, column, width in template.slots)
+        self._layout: str = "\n".join(lines)
+        self._cells: List[Tuple[int, int, int]] = cells
+        self._shown: List[str] | None = None
+        self._timer: PeriodicThread = PeriodicThread(
+            self.refresh, int(E9 / frequency_hz), "Terminal dashboard", "pyuptech-dashboard"
+        )
+        self.frames: int = 0
+        self.cells_written: int = 0
+        self.bytes_written: int = 0
+
+    def refresh(self) -> Self:
+        """
+        Read the sensors and draw a frame, the thread calls it at the set rate.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        values: List[str] = []
+        for _, reader in self._readers:
+            values.extend(reader(self._sensors))
+        parts: List[str] = []
+        if self._shown is None:
+            # hide the cursor and draw the layout once
+            parts.append(f"\x1b[?25l\x1b[2J\x1b[H{self._layout}")
+            self._shown = [""] * len(values)
+        shown = self._shown
+        for index, (value, (row, column, width)) in enumerate(zip(values, self._cells)):
+            if shown[index] == value:
+                continue
+            parts.append(f"\x1b[{row};{column}H{fit_cell(value, width)}")
+            shown[index] = value
+            self.cells_written += 1
+        if parts:
+            frame = "".join(parts)
+            self._stream.write(frame)
+            self._stream.flush()
+            self.bytes_written += len(frame)
+        self.frames += 1
+        return self
+
+    def start(self) -> Self:
+        """
+        Draw the frames in a daemon thread at the set rate.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        if not self._timer.is_running:
+            self._shown = None
+        self._timer.start()
+        return self
+
+    def stop(self, timeout: float | None = None) -> Self:
+        """
+        Stop the thread, and leave the cursor below the tables.
+
+        Args:
+            timeout (float, optional): The seconds to wait for the thread to exit. Defaults to None.
+
+        Returns:
+            Self: The instance of the class.
+        """
+        self._timer.stop(timeout)
+        if self._shown is not None:
+            self._stream.write(f"\x1b[{self._layout.count(chr(10)) + 1};1H\x1b[?25h")
+            self._stream.flush()
+        return self
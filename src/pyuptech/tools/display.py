@@ -2,6 +2,16 @@ from typing import Literal, Dict
 
 from ..modules.screen import Screen, Color, FontSize
 from ..modules.sensors import OnBoardSensors
+from .dashboard import (
+    layout_table,
+    adc_rows,
+    io_rows,
+    mpu_rows,
+    adc_values,
+    io_values,
+    mpu_values,
+    labels_key,
+)
 
 
 def mpu_display_on_lcd(
@@ -43,6 +53,7 @@ def make_mpu_table(sensors: OnBoardSensors) -> str:
 
     This function extracts acceleration, gyroscope, and attitude data from sensor readings and formats it into an
     aesthetically pleasing table, displaying the values for each axis of acceleration, gyroscope, and attitude angles.
+    Each data pack is read once, and the columns are sized to the values.
 
     Parameters:
         sensors: An instance of the `OnBoardSensors` class.
@@ -50,34 +61,7 @@ def make_mpu_table(sensors: OnBoardSensors) -> str:
     Returns:
         str: A formatted table string.
     """
-    from terminaltables import DoubleTable
-
-    # Initialize the data list to store table data
-    combined_data = [
-        ["ACC", "Value", "GYRO", "Value", "ATTI", "Value"],
-    ]
-    acc_names = ["X_ACC", "Y_ACC", "Z_ACC"]
-
-    gyro_names = ["X_GYRO", "Y_GYRO", "Z_GYRO"]
-
-    atti_names = ["Pitch", "Roll", "Yaw"]
-    # Iterate through acceleration, gyroscope, and attitude data, adding them to the combined_data list
-    for i in range(len(acc_names)):
-        combined_data.append(
-            [
-                acc_names[i],
-                f"{sensors.acc_all()[i]:.2f}",  # Acceleration value
-                gyro_names[i],
-                f"{sensors.gyro_all()[i]:.2f}",  # Gyroscope value
-                atti_names[i],
-                f"{sensors.atti_all()[i]:.2f}",  # Attitude value
-            ]
-        )
-
-    # Create a table using the DoubleTable class and customize its style
-    table = DoubleTable(combined_data)
-    table.inner_row_border = True  # Add inner row borders for improved readability
-    return table.table
+    return layout_table(mpu_rows(), mpu_values(sensors))
 
 
 def make_adc_table(
@@ -85,7 +69,7 @@ def make_adc_table(
     adc_labels: Dict[int, str] = None,
 ) -> str:
     """
-    Generate and return a formatted string table containing ADC (Analog-to-Digital Converter) and IO (Input/Output) channel information.
+    Generate and return a formatted string table containing ADC (Analog-to-Digital Converter) channel information.
 
     Parameters:
         sensors: An instance of the `OnBoardSensors` class.
@@ -95,30 +79,10 @@ def make_adc_table(
         A string representation of the table, formatted using the terminaltables library.
 
     Dependencies:
-        This function relies on external functions `adc_all_channels()`, `io_all_channels()`, and `get_all_io_mode()` from the `sensors` module.
+        This function relies on the external function `adc_all_channels()` from the `sensors` module.
     """
-
-    from terminaltables import (
-        DoubleTable,
-    )  # Import library for formatting the table output
-
-    # Use empty dictionaries as default values if adc_labels or io_labels are not provided
-    adc_labels = adc_labels or {}
-
-    # Retrieve all ADC and IO channel data from the sensors module
-    adc = sensors.adc_all_channels()
-
-    # Construct the rows of the table
-    rows = [
-        ["ADC Name"]
-        + [adc_labels.get(i, f"ADC{i}") for i in range(len(adc))],  # ADC Name row
-        ["ADC Data"] + [f"{x}" for x in adc],  # ADC Data row
-    ]
-
-    # Format the row data into a table using DoubleTable class
-    table = DoubleTable(rows)
-    table.inner_row_border = True  # Enable inner row borders
-    return table.table  # Return the formatted table string
+    values = adc_values(sensors)
+    return layout_table(adc_rows(len(values), labels_key(adc_labels)), values)
 
 
 def make_io_table(
@@ -138,29 +102,7 @@ def make_io_table(
     Dependencies:
         This function relies on external functions `io_all_channels()` and `get_all_io_mode()` from the `sensors` module.
     """
-
-    from terminaltables import (
-        DoubleTable,
-    )  # Import library for formatting the table output
-
-    io_labels = io_labels or {}
-
-    # Retrieve all ADC and IO channel data from the sensors module
-    io = sensors.io_all_channels()
-    io_modes = sensors.get_all_io_mode()
-
-    # Construct the rows of the table
-    rows = [
-        ["IO Name"] + [io_labels.get(i, f"IO{i}") for i in range(8)],  # IO Name row
-        ["IO Data"] + [int(bit) for bit in f"{io:08b}"[::-1]],  # IO Data row (binary)
-        ["IO Mode"]
-        + [int(bit) for bit in f"{io_modes:08b}"[::-1]],  # IO Mode row (binary)
-    ]
-
-    # Format the row data into a table using DoubleTable class
-    table = DoubleTable(rows)
-    table.inner_row_border = True  # Enable inner row borders
-    return table.table  # Return the formatted table string
+    return layout_table(io_rows(labels_key(io_labels)), io_values(sensors))
 
 
 def adc_io_display_on_lcd(
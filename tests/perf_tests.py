@@ -1,5 +1,13 @@
 import unittest
+from contextlib import ExitStack
+from threading import Lock, Thread, RLock
 from time import sleep, perf_counter_ns
+from typing import Tuple
+from unittest.mock import patch
+
+from pyuptech import OnBoardSensors, Screen, Color
+from pyuptech.modules import screen as screen_module
+from pyuptech.modules import sensors as sensors_module
 
 
 def sample_freq_test(func):
@@ -33,5 +41,109 @@ class PerfTestCase(unittest.TestCase):
         sample_freq_test(dummy_func)
 
 
+class SlowLib:
+    """
+    Stands in for libuptech: each call sleeps like a bus transaction, releasing the GIL as a ctypes call does,
+    and records how many calls of the same subsystem and of all the subsystems were in flight at once.
+    """
+
+    def __init__(self, call_us: int):
+        self.call_s = call_us / 1000000
+        self._guard = Lock()
+        self._active = {"adc_io": 0, "mpu": 0, "lcd": 0}
+        self._total = 0
+        self.max_same_subsystem = 0
+        self.max_overlap = 0
+
+    @staticmethod
+    def subsystem(name: str) -> str:
+        if name.startswith("mpu"):
+            return "mpu"
+        if name.startswith("UG_") or name.startswith("lcd"):
+            return "lcd"
+        return "adc_io"
+
+    def __getattr__(self, name: str):
+        subsystem = self.subsystem(name)
+
+        def call(*_):
+            with self._guard:
+                self._active[subsystem] += 1
+                self._total += 1
+                self.max_same_subsystem = max(self.max_same_subsystem, self._active[subsystem])
+                self.max_overlap = max(self.max_overlap, self._total)
+            sleep(self.call_s)
+            with self._guard:
+                self._active[subsystem] -= 1
+                self._total -= 1
+            return 0
+
+        return call
+
+
+def lock_contention_benchmark(serialized: bool, calls: int = 200, call_us: int = 200) -> Tuple[float, SlowLib]:
+    """
+    Drive the real sensor getters, screen calls and LED calls from concurrent threads over a slow stand-in library.
+
+    Args:
+        serialized: put all the subsystems behind one lock instead of ADC_IO_LOCK, MPU_LOCK and LCD_LOCK
+        calls: the count of calls each thread makes
+        call_us: the duration of a single library call, in microseconds
+
+    Returns:
+        the wall time of the whole run in milliseconds, and the library with its overlap counts
+    """
+    lib = SlowLib(call_us)
+    sensors = OnBoardSensors(adc_min_sample_interval_ms=0)
+    screen = Screen()
+    patches = [patch.object(sensors_module, "__TECHSTAR_LIB__", lib), patch.object(screen_module, "__lib__", lib)]
+    if serialized:
+        one_lock = RLock()
+        for module, name in (
+            (sensors_module, "ADC_IO_LOCK"),
+            (sensors_module, "MPU_LOCK"),
+            (screen_module, "ADC_IO_LOCK"),
+            (screen_module, "LCD_LOCK"),
+        ):
+            patches.append(patch.object(module, name, one_lock))
+    workloads = (
+        lambda i: sensors.adc_all_channels(),
+        lambda i: sensors.acc_all(),
+        lambda i: sensors.gyro_all(),
+        lambda i: screen.fill_screen(Color.BLACK),
+        # the LEDs share the ADC-IO channel with the ADC
+        lambda i: screen.set_led_color(0, Color.RED if i & 1 else Color.BLUE),
+    )
+
+    def worker(workload):
+        for i in range(calls):
+            workload(i)
+
+    threads = [Thread(target=worker, args=(workload,)) for workload in workloads]
+    with ExitStack() as stack:
+        for p in patches:
+            stack.enter_context(p)
+        start = perf_counter_ns()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return (perf_counter_ns() - start) / 1000000, lib
+
+
+class LockContentionTestCase(unittest.TestCase):
+
+    def test_subsystem_locks_overlap(self):
+        serialized, one_lock_lib = lock_contention_benchmark(serialized=True)
+        overlapped, lib = lock_contention_benchmark(serialized=False)
+        print(f"ADC/MPU/LCD behind one lock: {serialized:.1f}ms")
+        print(f"ADC/MPU/LCD behind their own locks: {overlapped:.1f}ms")
+        self.assertEqual(one_lock_lib.max_overlap, 1)
+        # calls of one subsystem never overlap, calls of different subsystems do
+        self.assertEqual(lib.max_same_subsystem, 1)
+        self.assertGreater(lib.max_overlap, 1)
+        self.assertLess(overlapped, serialized)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from math import sin, cos, radians
+
+from pyuptech import AttitudeEstimator, AttitudeFilter, SensorEmulator
+
+E9 = 1000000000
+
+
+def spin(estimator: AttitudeEstimator, gyro, acc, seconds: float = 1.0, rate_hz: int = 200):
+    step = E9 // rate_hz
+    for i in range(int(seconds * rate_hz) + 1):
+        estimator.update(gyro, acc, i * step)
+
+
+class AttitudeEstimatorTests(unittest.TestCase):
+
+    def test_yaw_integration(self):
+        for algorithm in AttitudeFilter:
+            estimator = AttitudeEstimator(algorithm=algorithm)
+            spin(estimator, (0.0, 0.0, radians(90)), (0.0, 0.0, 1.0))
+            self.assertAlmostEqual(estimator.yaw, 90.0, delta=0.5, msg=algorithm)
+            self.assertAlmostEqual(estimator.pitch, 0.0, delta=0.5, msg=algorithm)
+
+    def test_converges_to_gravity(self):
+        tilt = radians(20)
+        for algorithm in AttitudeFilter:
+            estimator = AttitudeEstimator(algorithm=algorithm, beta=0.5)
+            spin(estimator, (0.0, 0.0, 0.0), (0.0, sin(tilt), cos(tilt)), seconds=10)
+            self.assertAlmostEqual(estimator.pitch, 20.0, delta=1.0, msg=algorithm)
+
+    def test_dmp_drift(self):
+        estimator = AttitudeEstimator()
+        spin(estimator, (0.0, 0.0, radians(10)), (0.0, 0.0, 1.0))
+        estimator.compare_with_dmp((0.0, 0.0, 0.0))
+        self.assertAlmostEqual(estimator.stats.dmp_yaw_error, 10.0, delta=0.5)
+        self.assertGreater(estimator.stats.dmp_max_abs_error, 9.0)
+        self.assertEqual(estimator.stats.updates, 201)
+
+    def test_sample_from_tick(self):
+        emu = SensorEmulator()
+        estimator = AttitudeEstimator(emu)
+        with emu.tick(mpu=True) as snap:
+            estimator.sample()
+        self.assertEqual(estimator._last_timestamp_ns, snap.timestamp_ns)
+
+    def test_sample_agrees_with_gyro_si(self):
+        # one emulated pack through the estimator and through gyro_si must give the same angular velocity
+        emu = SensorEmulator()
+        emu.mpu_rand_range = (-100, 100)
+        emu.mpu_set_gyro_fsr(500)
+        estimator = AttitudeEstimator(emu)
+        with emu.tick(mpu=True) as snap:
+            estimator.update((0.0, 0.0, 0.0), snap.acc, snap.timestamp_ns - E9 // 100)
+            estimator.sample()
+            gyro_si = emu.gyro_si()
+        reference = AttitudeEstimator()
+        reference.update((0.0, 0.0, 0.0), snap.acc, 0)
+        reference.update(gyro_si, snap.acc, E9 // 100)
+        self.assertEqual(estimator.attitude(), reference.attitude())
+        # the library returns degree/s at the default range, a smaller range scales the readings down
+        self.assertAlmostEqual(gyro_si[2], radians(snap.gyro[2]) * 500 / 2000)
+        self.assertAlmostEqual(reference.yaw, snap.gyro[2] * 500 / 2000 / 100, places=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import gc
+import logging
+import tracemalloc
+import unittest
+from array import array
+from ctypes import c_float
+
+from pyuptech import SensorEmulator, ADCCalibration, ChannelCalibration
+from pyuptech.modules.buffers import fill_buffer
+from pyuptech.modules.sensors import ADCArrayType, MPUArrayType
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# the traces of the measurement itself and of the log listener thread
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, logging.__file__),
+    tracemalloc.Filter(False, "*/pyuptech/modules/logger.py"),
+)
+
+
+def allocations_per_read(read, reads=1000) -> float:
+    """
+    The memory blocks traced by tracemalloc that each steady state call adds, with every result kept alive.
+
+    The blocks are counted after `reads` calls and again after as many more, so the caches filled once, e.g. by the
+    first read, cancel out, and any allocation a call leaves behind, including garbage with gc disabled, shows up.
+    """
+    results = [None] * (2 * reads)
+    for _ in range(10):
+        read()
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        for index in range(reads):
+            results[index] = read()
+        first = tracemalloc.take_snapshot()
+        for index in range(reads, 2 * reads):
+            results[index] = read()
+        second = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+    # filtered once tracing stopped, as compiling the patterns allocates
+    first, second = first.filter_traces(_FILTERS), second.filter_traces(_FILTERS)
+    return sum(stat.count_diff for stat in second.compare_to(first, "filename")) / reads
+
+
+class FillBufferTests(unittest.TestCase):
+
+    def test_buffer_types(self):
+        source = ADCArrayType(*range(4000, 4010))
+        for out in ([0] * 10, array("H", bytes(20)), array("d", bytes(80)), ADCArrayType(), (c_float * 12)()):
+            self.assertIs(fill_buffer(out, source), out)
+            self.assertEqual(list(out[:10]), list(range(4000, 4010)))
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_numpy(self):
+        out = numpy.zeros(3, dtype=numpy.float32)
+        fill_buffer(out, MPUArrayType(1.5, -2.5, 3.0))
+        self.assertEqual(out.tolist(), [1.5, -2.5, 3.0])
+
+    def test_short_buffer(self):
+        with self.assertRaises(IndexError):
+            fill_buffer([0] * 2, MPUArrayType())
+
+
+class OutParameterTests(unittest.TestCase):
+
+    def setUp(self):
+        self.sensors = SensorEmulator()
+
+    def test_getters_fill_in_place(self):
+        for name, size in (("adc_all_channels", 10), ("acc_all", 3), ("gyro_all", 3), ("atti_all", 3)):
+            out = [None] * size
+            self.assertIs(getattr(self.sensors, name)(out=out), out)
+            self.assertNotIn(None, out)
+
+    def test_tick_snapshot_fills(self):
+        with self.sensors.tick(mpu=True) as snapshot:
+            adc, acc = array("H", bytes(20)), [0.0] * 3
+            self.sensors.adc_all_channels(out=adc)
+            self.sensors.acc_all(out=acc)
+            self.assertEqual(tuple(adc), snapshot.adc)
+            self.assertEqual(tuple(acc), snapshot.acc)
+
+    def test_si_and_calibrated_match_tuples(self):
+        self.sensors.set_adc_calibration(ADCCalibration({0: ChannelCalibration(scale=2.0)}, resolution_bits=16))
+        with self.sensors.tick(mpu=True):
+            calibrated = [0.0] * 10
+            self.sensors.adc_calibrated_channels(out=calibrated)
+            self.assertEqual(tuple(calibrated), self.sensors.adc_calibrated_channels())
+            gyro, acc = [0.0] * 3, [0.0] * 3
+            self.assertEqual(self.sensors.imu_si(out=(gyro, acc)), (gyro, acc))
+            self.assertEqual((tuple(gyro), tuple(acc)), self.sensors.imu_si())
+            self.assertEqual(tuple(self.sensors.acc_si(out=acc)), self.sensors.acc_si())
+
+    def test_allocation_free(self):
+        self.sensors.set_adc_calibration(ADCCalibration({0: ChannelCalibration(scale=2.0)}, resolution_bits=16))
+        adc, floats, vector = array("H", bytes(20)), array("d", bytes(80)), (c_float * 3)()
+        pair = (array("f", bytes(12)), (c_float * 3)())
+        calls = {
+            "adc_all_channels": lambda: self.sensors.adc_all_channels(out=adc),
+            "acc_all": lambda: self.sensors.acc_all(out=vector),
+            "gyro_all": lambda: self.sensors.gyro_all(out=pair[0]),
+            "atti_all": lambda: self.sensors.atti_all(out=floats),
+            "gyro_si": lambda: self.sensors.gyro_si(out=vector),
+            "imu_si": lambda: self.sensors.imu_si(out=pair),
+            "adc_calibrated_channels": lambda: self.sensors.adc_calibrated_channels(out=floats),
+        }
+        for name, read in calls.items():
+            with self.subTest(name):
+                self.assertEqual(allocations_per_read(read), 0)
+        # the tuple returning form allocates a tuple and its floats on every read
+        self.assertGreaterEqual(allocations_per_read(self.sensors.acc_all), 3)
+
+    def test_list_buffer_holds_new_objects(self):
+        out = [0.0] * 3
+        self.sensors.acc_all(out=out)
+        first = [id(value) for value in out]
+        held = list(out)
+        self.sensors.acc_all(out=out)
+        # a list stores references, so every read puts new float objects into it
+        self.assertNotEqual([id(value) for value in out], first)
+        del held
+
+
+if __name__ == "__main__":
+    unittest.main()
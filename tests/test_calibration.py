@@ -0,0 +1,51 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from pyuptech import ADCCalibration, ChannelCalibration, SensorEmulator
+
+
+class CalibrationTests(unittest.TestCase):
+
+    def test_forms(self):
+        calibration = ADCCalibration(
+            {
+                0: ChannelCalibration(points=[(1000, 10.0), (0, 0.0), (2000, 30.0)]),
+                1: ChannelCalibration(polynomial=[1.0, 0.0, 2.0]),
+                9: ChannelCalibration(scale=0.5, offset=1.0),
+            }
+        )
+        frame = (500, 3, 7, 7, 7, 7, 7, 7, 7, 100)
+        converted = calibration.convert(frame)
+        self.assertEqual(converted[0], 5.0)
+        self.assertEqual(converted[1], 19.0)
+        self.assertEqual(converted[2], 7.0)
+        self.assertEqual(converted[9], 51.0)
+        self.assertEqual(calibration.convert_channel(0, 1500), 20.0)
+        # clamped at the top of the range
+        self.assertEqual(calibration.convert((65535,) * 10)[0], 30.0)
+
+    def test_from_file(self):
+        profile = {"resolution_bits": 10, "channels": {"9": {"scale": 2}}}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "adc.json"
+            path.write_text(json.dumps(profile))
+            calibration = ADCCalibration.from_file(path)
+        self.assertEqual(calibration.resolution, 1024)
+        self.assertEqual(calibration.convert((1,) * 10)[9], 2.0)
+
+    def test_sensors_accessor(self):
+        emu = SensorEmulator()
+        with self.assertRaises(RuntimeError):
+            emu.adc_calibrated_channels()
+        emu.set_adc_calibration(ADCCalibration({9: ChannelCalibration(scale=0.0)}))
+        with emu.tick() as snap:
+            converted = emu.adc_calibrated_channels()
+            self.assertIs(emu.adc_calibrated_channels(), converted)
+        self.assertEqual(converted[9], 0.0)
+        self.assertEqual(converted[0], float(min(snap.adc[0], 4095)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from pyuptech import ComparatorBank
+
+
+def frame(**values) -> tuple:
+    raw = [0] * 10
+    for key, value in values.items():
+        raw[int(key[1:])] = value
+    return tuple(raw)
+
+
+class ComparatorBankTests(unittest.TestCase):
+
+    def test_hysteresis(self):
+        bank = ComparatorBank({0: (100, 200), 3: (1000, 2000)})
+        self.assertEqual(bank.update(frame(c0=150)), 0)
+        self.assertEqual(bank.update(frame(c0=200)), 0b1)
+        self.assertEqual(bank.update(frame(c0=150)), 0b1)
+        self.assertEqual(bank.update(frame(c0=100, c3=2500)), 0b1000)
+        self.assertEqual(bank.update(frame(c0=65535, c3=1500, c9=65535)), 0b1001)
+
+    def test_inverted_and_combined(self):
+        bank = ComparatorBank({1: (100, 200)}, inverted=0b10)
+        self.assertEqual(bank.update(frame(c1=50)), 0b10)
+        self.assertEqual(bank.update(frame(c1=250)), 0)
+        bank.update(frame(c1=50))
+        self.assertEqual(bank.combine_with_io(0b1), 0b1000000001)
+
+    def test_change_events(self):
+        changes = []
+        bank = ComparatorBank({2: (10, 20)}, frame_getter=lambda: frame(c2=30))
+        bank.on_change(lambda mask, changed, ts: changes.append((mask, changed)))
+        bank.sample()
+        bank.sample()
+        self.assertEqual(changes, [(0b100, 0b100)])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            ComparatorBank({0: (20, 10)})
+        with self.assertRaises(ValueError):
+            ComparatorBank({1: (100, 200)}, inverted=0b110)
+        with self.assertRaises(ValueError):
+            ComparatorBank({10: (10, 20)})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import io
+import re
+import time
+import unittest
+
+from pyuptech import SensorEmulator, TerminalDashboard, make_adc_table, make_mpu_table
+from pyuptech.tools.dashboard import TableTemplate, fit_cell
+
+_CURSOR_WRITE = re.compile(r"\x1b\[(\d+);(\d+)H([^\x1b]*)")
+
+
+class CountingSensors(SensorEmulator):
+
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+        self.adc = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+
+    def adc_all_channels(self):
+        self.reads += 1
+        return tuple(self.adc)
+
+    def acc_all(self):
+        self.reads += 1
+        return 0.5, -1.25, 9.81
+
+    def gyro_all(self):
+        self.reads += 1
+        return 0.0, 0.0, 0.0
+
+    def atti_all(self):
+        self.reads += 1
+        return 1.0, 2.0, 3.0
+
+    @staticmethod
+    def io_all_channels():
+        return 0b00000101
+
+    @staticmethod
+    def get_all_io_mode():
+        return 0b11110000
+
+
+class TableTemplateTests(unittest.TestCase):
+
+    def test_fill_matches_slots(self):
+        template = TableTemplate([["Name", "A", "B"], ["Data", 3, 5]])
+        table = template.fill(["1", "22"])
+        lines = table.split("\n")
+        for (line, index, _, width), value in zip(template.slots, ("1", "22")):
+            self.assertEqual(lines[line][index : index + width], fit_cell(value, width))
+        self.assertEqual(len(table), len(template.text))
+
+    def test_wide_labels_shift_columns(self):
+        template = TableTemplate([["名称", 2]])
+        line, index, column, _ = template.slots[0]
+        self.assertGreater(column, index)
+
+    def test_overflow(self):
+        self.assertEqual(fit_cell("12345", 3), "###")
+        self.assertEqual(fit_cell("1", 3), "  1")
+
+    def test_mpu_table_reads_once(self):
+        sensors = CountingSensors()
+        table = make_mpu_table(sensors)
+        self.assertEqual(sensors.reads, 3)
+        self.assertIn("-1.25", table)
+        self.assertIn("9.81", table)
+        self.assertIn("ADC0", make_adc_table(sensors))
+
+    def test_one_shot_tables_fit_wide_values(self):
+        sensors = CountingSensors()
+        sensors.adc[0] = 1234567
+        sensors.acc_all = lambda: (123456789.5, 0.0, 0.0)
+        self.assertIn("1234567", make_adc_table(sensors))
+        table = make_mpu_table(sensors)
+        self.assertIn("123456789.50", table)
+        self.assertNotIn("#", table)
+
+
+class TerminalDashboardTests(unittest.TestCase):
+
+    def setUp(self):
+        self.sensors = CountingSensors()
+        self.stream = io.StringIO()
+        self.dashboard = TerminalDashboard(self.sensors, stream=self.stream)
+
+    def writes(self):
+        text = self.stream.getvalue()
+        self.stream.seek(0)
+        self.stream.truncate()
+        return _CURSOR_WRITE.findall(text)
+
+    def test_only_changed_cells_written(self):
+        self.dashboard.refresh()
+        self.assertEqual(len(self.writes()), 10 + 16 + 9)
+        self.dashboard.refresh()
+        self.assertEqual(self.writes(), [])
+        self.sensors.adc[3] = 4095
+        self.dashboard.refresh()
+        writes = self.writes()
+        self.assertEqual(len(writes), 1)
+        self.assertEqual(writes[0][2], " 4095")
+        self.assertEqual(self.dashboard.cells_written, 36)
+        self.assertEqual(self.dashboard.frames, 3)
+
+    def test_cells_land_on_the_layout(self):
+        self.dashboard.refresh()
+        text = self.stream.getvalue()
+        layout = text[text.index("\x1b[H") + 3 : text.index("\x1b[", text.index("\x1b[H") + 3)].split("\n")
+        for row, column, value in _CURSOR_WRITE.findall(text):
+            line = layout[int(row) - 1]
+            start = int(column) - 1
+            # the layout is blank where each value goes, between two borders
+            self.assertEqual(line[start : start + len(value)].strip(), "")
+            self.assertEqual(line[start - 1], " ")
+
+    def test_unknown_section(self):
+        with self.assertRaises(ValueError):
+            TerminalDashboard(self.sensors, sections=("lcd",), stream=self.stream)
+
+    def test_thread(self):
+        dashboard = TerminalDashboard(self.sensors, sections=("adc",), frequency_hz=100, stream=self.stream)
+        dashboard.start()
+        time.sleep(0.1)
+        dashboard.stop(timeout=1)
+        self.assertGreater(dashboard.frames, 2)
+        self.assertTrue(self.stream.getvalue().endswith("\x1b[?25h"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from pyuptech import IODebouncer
+
+
+class IODebouncerTests(unittest.TestCase):
+
+    def test_bounce_rejected(self):
+        debouncer = IODebouncer(windows=3)
+        for raw in (0b1, 0b0, 0b1, 0b1, 0b0):
+            self.assertEqual(debouncer.update(raw), 0)
+
+    def test_stable_accepted(self):
+        debouncer = IODebouncer(windows=3)
+        self.assertEqual([debouncer.update(0b1) for _ in range(4)], [0, 0, 1, 1])
+        self.assertEqual([debouncer.update(0b0) for _ in range(3)], [1, 1, 0])
+
+    def test_per_pin_windows(self):
+        debouncer = IODebouncer(windows=[1, 2, 5, 1, 1, 1, 1, 7])
+        history = [debouncer.update(0b10000111) for _ in range(7)]
+        self.assertEqual(
+            history,
+            [0b00000001, 0b00000011, 0b00000011, 0b00000011, 0b00000111, 0b00000111, 0b10000111],
+        )
+        self.assertEqual(debouncer.mask, 0b10000111)
+
+    def test_getter(self):
+        raw = [0xFF]
+        debouncer = IODebouncer(lambda: raw[0], windows=1, initial_mask=0)
+        self.assertEqual(debouncer.io_all_channels(), 0xFF)
+
+    def test_invalid_windows(self):
+        with self.assertRaises(ValueError):
+            IODebouncer(windows=0)
+        with self.assertRaises(ValueError):
+            IODebouncer(windows=[1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
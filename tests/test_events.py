@@ -0,0 +1,64 @@
+import unittest
+from queue import Queue
+
+from pyuptech import IOEdge, IOEventDispatcher
+
+
+class IOEventTests(unittest.TestCase):
+
+    def setUp(self):
+        self.masks = [0b00000000]
+        self.dispatcher = IOEventDispatcher(lambda: self.masks[0])
+
+    def feed(self, mask: int) -> int:
+        self.masks[0] = mask
+        return self.dispatcher.poll()
+
+    def test_edges(self):
+        rising, falling, both = [], [], []
+        (
+            self.dispatcher.on(0, IOEdge.RISING, rising.append)
+            .on(0, IOEdge.FALLING, falling.append)
+            .on(7, IOEdge.ANY, both.append)
+        )
+        self.assertEqual(self.feed(0b00000000), 0)  # first poll only takes the reference
+        self.assertEqual(self.feed(0b10000001), 0b10000001)
+        self.assertEqual(self.feed(0b10000001), 0)
+        self.assertEqual(self.feed(0b00000000), 0b10000001)
+
+        self.assertEqual([e.pin for e in rising], [0])
+        self.assertEqual([e.pin for e in falling], [0])
+        self.assertEqual([e.edge for e in both], [IOEdge.RISING, IOEdge.FALLING])
+
+    def test_off(self):
+        got = []
+        self.dispatcher.on(1, IOEdge.ANY, got.append).off(1)
+        self.feed(0)
+        self.feed(0b10)
+        self.assertEqual(got, [])
+
+    def test_failing_callback(self):
+        got = []
+
+        def fail(_):
+            raise RuntimeError("boom")
+
+        self.dispatcher.on(0, IOEdge.RISING, fail).on(0, IOEdge.RISING, got.append).on(3, IOEdge.RISING, got.append)
+        self.feed(0)
+        with self.assertLogs("pyuptech", "ERROR"):
+            self.assertEqual(self.feed(0b1001), 0b1001)
+        self.assertEqual([e.pin for e in got], [0, 3])
+
+    def test_queue(self):
+        queue = Queue()
+        dispatcher = IOEventDispatcher(lambda: self.masks[0], queue=queue)
+        dispatcher.poll()
+        self.masks[0] = 0b100
+        dispatcher.poll()
+        event = queue.get_nowait()
+        self.assertEqual((event.pin, event.edge, event.mask), (2, IOEdge.RISING, 0b100))
+        self.assertTrue(queue.empty())
+
+
+if __name__ == "__main__":
+    unittest.main()
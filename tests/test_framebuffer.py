@@ -0,0 +1,95 @@
+import os
+import unittest
+from time import perf_counter
+
+from pyuptech import CommandCanvas, ScreenCompositor, SharedCanvas, Color, FontSize
+from pyuptech.modules.commands import decode_commands, ScreenOp
+from pyuptech.modules.framebuffer import _LAYER_HEADER, _layer_offset
+
+
+class CompositorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = CommandCanvas()
+        self.compositor = ScreenCompositor(
+            self.screen, name=f"pyuptech_fb_test_{os.getpid()}", layers=2, layer_capacity=256, max_fps=1000
+        )
+
+    def tearDown(self):
+        self.compositor.close()
+
+    def ops(self):
+        return [(op, args) for op, args in decode_commands(self.screen.commands)]
+
+    def test_round_trip(self):
+        canvas = CommandCanvas().set_font_size(FontSize.FONT_8X12).put_string(1, 2, "héllo").draw_line(0, 0, 5, -5, 7)
+        self.assertEqual(
+            list(decode_commands(canvas.commands)),
+            [
+                (ScreenOp.SET_FONT_SIZE, (FontSize.FONT_8X12,)),
+                (ScreenOp.PUT_STRING, (1, 2, "héllo")),
+                (ScreenOp.DRAW_LINE, (0, 0, 5, -5, 7)),
+            ],
+        )
+
+    def test_layers_composed_in_order(self):
+        self.assertFalse(self.compositor.poll())
+        top = SharedCanvas(1, self.compositor.name)
+        bottom = SharedCanvas(0, self.compositor.name)
+        top.put_string(0, 0, "top").commit()
+        bottom.fill_frame(0, 0, 10, 10, Color.RED).commit()
+        self.assertTrue(self.compositor.poll())
+        ops = [op for op, _ in self.ops()]
+        self.assertLess(ops.index(ScreenOp.FILL_FRAME), ops.index(ScreenOp.PUT_STRING))
+        self.assertEqual(ops[-1], ScreenOp.REFRESH)
+
+        self.screen.clear()
+        self.assertFalse(self.compositor.poll())
+        top.close()
+        bottom.close()
+
+    def test_capacity(self):
+        with SharedCanvas(0, self.compositor.name) as canvas:
+            with self.assertRaises(ValueError):
+                canvas.put_string(0, 0, "x" * 300).commit()
+        with self.assertRaises(ValueError):
+            SharedCanvas(2, self.compositor.name)
+
+    def test_stuck_layer_skipped(self):
+        screen = CommandCanvas()
+        name = f"pyuptech_fb_stuck_{os.getpid()}"
+        with ScreenCompositor(screen, name, 2, 256, max_fps=1000, layer_timeout_ms=20) as compositor:
+            with SharedCanvas(1, compositor.name) as canvas:
+                canvas.put_string(0, 0, "alive").commit()
+            # a canvas killed in the middle of a commit leaves the seq of its layer odd
+            _LAYER_HEADER.pack_into(compositor._buf, _layer_offset(0, 256), 1, 0)
+            started = perf_counter()
+            self.assertTrue(compositor.poll())
+            self.assertLess(perf_counter() - started, 0.5)
+            self.assertIn((ScreenOp.PUT_STRING, (0, 0, "alive")), list(decode_commands(screen.commands)))
+            self.assertFalse(compositor.poll())
+
+    def test_stuck_layer_waited_once(self):
+        screen = CommandCanvas()
+        name = f"pyuptech_fb_stuck_once_{os.getpid()}"
+        with ScreenCompositor(screen, name, 2, 256, max_fps=1000, layer_timeout_ms=300) as compositor:
+            offset = _layer_offset(0, 256)
+            _LAYER_HEADER.pack_into(compositor._buf, offset, 1, 0)
+            started = perf_counter()
+            compositor.compose()
+            self.assertGreaterEqual(perf_counter() - started, 0.25)
+            with SharedCanvas(1, compositor.name) as canvas:
+                canvas.put_string(0, 0, "alive").commit()
+                started = perf_counter()
+                compositor.compose()
+                self.assertLess(perf_counter() - started, 0.15)
+                self.assertIn((ScreenOp.PUT_STRING, (0, 0, "alive")), list(decode_commands(screen.commands)))
+                # the stuck layer is read again once its seq changes
+                with SharedCanvas(0, compositor.name) as recovered:
+                    recovered.put_string(0, 8, "back").commit()
+                compositor.compose()
+                self.assertIn((ScreenOp.PUT_STRING, (0, 8, "back")), list(decode_commands(screen.commands)))
+
+
+if __name__ == "__main__":
+    unittest.main()
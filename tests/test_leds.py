@@ -0,0 +1,134 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from pyuptech import LEDAnimation, LEDAnimator, Color, Screen
+from pyuptech.modules import screen as screen_module
+from pyuptech.modules.leds import E9
+
+
+class FakeLEDs:
+
+    def __init__(self):
+        self.calls = []
+        self.led_colors = (None, None)
+
+    def set_led_color(self, index, color):
+        self.calls.append((index, color))
+        colors = list(self.led_colors)
+        colors[index] = color
+        self.led_colors = tuple(colors)
+        return self
+
+
+class FakeLib:
+
+    def __init__(self):
+        self.calls = []
+
+    def adc_led_set(self, index, color):
+        self.calls.append((index, color))
+
+
+class LEDAnimationTests(unittest.TestCase):
+
+    def test_blink(self):
+        blink = LEDAnimation.blink(Color.RED, period_s=1.0, duty=0.25)
+        self.assertEqual(blink.color_at(0.1), Color.RED)
+        self.assertEqual(blink.color_at(0.5), Color.BLACK)
+        self.assertEqual(blink.color_at(1.1), Color.RED)
+        self.assertFalse(blink.finished(100))
+
+    def test_breathe_interpolates(self):
+        breathe = LEDAnimation.breathe(0x00FF00, period_s=2.0)
+        self.assertEqual(breathe.color_at(0), 0)
+        self.assertEqual(breathe.color_at(0.5), 0x008000)
+        self.assertEqual(breathe.color_at(1.0), 0x00FF00)
+        self.assertEqual(breathe.color_at(2.5), 0x008000)
+
+    def test_sequence_keeps_segment_kinds(self):
+        sequence = LEDAnimation.sequence(
+            LEDAnimation.blink(Color.RED, period_s=0.2), LEDAnimation.fade_between(0x000000, 0x0000FE, 1.0)
+        )
+        self.assertEqual(sequence.color_at(0.05), Color.RED)
+        self.assertEqual(sequence.color_at(0.15), Color.BLACK)
+        self.assertEqual(sequence.color_at(0.7), 0x00007F)
+        self.assertEqual(sequence.color_at(5), 0x0000FE)
+        self.assertTrue(sequence.finished(1.2))
+
+    def test_invalid_keyframes(self):
+        with self.assertRaises(ValueError):
+            LEDAnimation([])
+        with self.assertRaises(ValueError):
+            LEDAnimation([(0.5, Color.RED)])
+        with self.assertRaises(ValueError):
+            LEDAnimation([(0, Color.RED), (1, Color.BLUE), (0.5, Color.RED)])
+
+
+class LEDAnimatorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.leds = FakeLEDs()
+        self.animator = LEDAnimator(self.leds)
+
+    def test_unchanged_colors_not_written(self):
+        self.animator.play(0, LEDAnimation.blink(Color.RED, period_s=1.0))
+        started = self.animator._playing[0][1]
+        for step in range(10):
+            self.animator.tick(started + step * E9 // 10)
+        self.assertEqual(self.leds.calls, [(0, Color.RED), (0, Color.BLACK)])
+        self.assertEqual(self.animator.writes, 2)
+        self.assertEqual(self.animator.skipped_writes, 9)
+        self.assertEqual(self.animator.colors, [Color.BLACK, None])
+
+    def test_finished_animation_released(self):
+        self.animator.play(1, LEDAnimation.fade_between(Color.BLACK, Color.WHITE, 0.5))
+        started = self.animator._playing[1][1]
+        self.animator.tick(started + E9)
+        self.assertEqual(self.animator.playing, [])
+        self.assertEqual(self.leds.calls[-1], (1, Color.WHITE))
+        self.animator.tick(started + 2 * E9)
+        self.assertEqual(len(self.leds.calls), 2)
+
+    def test_set_stops_animation(self):
+        self.animator.play(0, LEDAnimation.blink(Color.RED))
+        self.animator.set(0, Color.RED)
+        self.assertEqual(self.animator.playing, [])
+        self.assertEqual(self.leds.calls, [(0, Color.RED)])
+        with self.assertRaises(ValueError):
+            self.animator.set(2, Color.RED)
+
+    def test_colors_set_on_screen_count(self):
+        self.leds.set_led_color(0, Color.BLUE)
+        self.assertEqual(self.animator.colors, [Color.BLUE, None])
+        self.animator.set(0, Color.BLUE)
+        self.assertEqual(self.animator.skipped_writes, 1)
+        self.assertEqual(len(self.leds.calls), 1)
+
+    def test_timer_thread(self):
+        animator = LEDAnimator(self.leds, frequency_hz=200).start()
+        try:
+            animator.play(0, LEDAnimation.blink(Color.RED, period_s=0.02))
+            time.sleep(0.2)
+        finally:
+            animator.stop(timeout=1)
+        self.assertGreater(len(self.leds.calls), 2)
+        self.assertFalse(animator.is_running)
+
+
+class ScreenLEDTests(unittest.TestCase):
+
+    def test_unchanged_colors_not_written(self):
+        lib = FakeLib()
+        with patch.object(screen_module, "__lib__", lib):
+            screen = Screen()
+            screen.set_led_color(0, Color.RED).set_led_0(Color.RED).set_all_leds_same(Color.RED)
+            self.assertEqual(lib.calls, [(0, Color.RED), (1, Color.RED)])
+            screen.set_all_leds_single(Color.RED, Color.BLUE).set_led_1(Color.BLUE)
+            screen.set_all_leds_off().set_all_leds_off()
+        self.assertEqual(lib.calls[2:], [(1, Color.BLUE), (0, 0), (1, 0)])
+        self.assertEqual(screen.led_colors, (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import logging
+import os
+import unittest
+from queue import SimpleQueue
+from time import sleep
+
+from pyuptech import RepeatAggregator
+from pyuptech.modules import logger as logger_module
+from pyuptech.modules.logger import DeferredQueueHandler, SweepingQueueListener
+
+
+class RepeatAggregatorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.summaries = []
+        self.logger = logging.getLogger("pyuptech.test_logger")
+        self.logger.propagate = False
+        self.passed = []
+        handler = logging.Handler()
+        handler.emit = self.passed.append
+        self.aggregator = RepeatAggregator(0.05, sink=self.summaries.append)
+        handler.addFilter(self.aggregator)
+        self.logger.addHandler(handler)
+
+    def test_repeated_call_site(self):
+        for i in range(100):
+            self.logger.error("ADC_GetAll failed, attempt %d", i)
+        self.assertEqual(len(self.passed), 1)
+        self.assertEqual(self.summaries, [])
+
+        sleep(0.06)
+        self.logger.error("another call site")
+        self.assertEqual(len(self.summaries), 1)
+        summary = self.summaries[0]
+        self.assertTrue(summary.aggregated)
+        self.assertEqual(summary.getMessage(), "ADC_GetAll failed, attempt 99 [99x in last 0.1s]")
+
+    def test_below_level(self):
+        for _ in range(10):
+            self.logger.warning("once")
+            self.logger.info("always")
+        self.assertEqual(sum(record.levelno == logging.INFO for record in self.passed), 10)
+        self.assertEqual(sum(record.levelno == logging.WARNING for record in self.passed), 1)
+
+    def test_flush(self):
+        for _ in range(3):
+            self.logger.error("burst")
+        summaries = self.aggregator.flush()
+        self.assertEqual(len(summaries), 1)
+        self.assertIn("[2x in last", summaries[0].getMessage())
+        self.assertEqual(self.summaries, summaries)
+        self.logger.error("burst")
+        self.assertEqual(len(self.passed), 2)
+
+    def test_deferred_formatting(self):
+        class Lazy:
+            formatted = 0
+
+            def __str__(self):
+                Lazy.formatted += 1
+                return "lazy"
+
+        for _ in range(50):
+            self.logger.error("value %s", Lazy())
+        self.assertEqual(Lazy.formatted, 0)
+
+
+class ListenerPathTests(unittest.TestCase):
+
+    def setUp(self):
+        self.passed = []
+        sink = logging.Handler()
+        sink.emit = self.passed.append
+        queue = SimpleQueue()
+        self.queue_handler = DeferredQueueHandler(queue)
+        self.aggregator = RepeatAggregator(0.1, sink=self.queue_handler.emit)
+        self.queue_handler.addFilter(self.aggregator)
+        self.listener = SweepingQueueListener(queue, sink, on_tick=self.aggregator.sweep, interval_s=0.02)
+        self.logger = logging.getLogger("pyuptech.test_logger.listener")
+        self.logger.propagate = False
+        self.logger.addHandler(self.queue_handler)
+        self.listener.start()
+
+    def tearDown(self):
+        self.listener.stop()
+        self.logger.removeHandler(self.queue_handler)
+
+    def test_burst_then_silence(self):
+        for i in range(20):
+            self.logger.warning("IO_InputGetAll failed, attempt %d", i)
+        # nothing is logged after the burst, the listener closes the window on its own
+        sleep(0.2)
+        messages = [record.getMessage() for record in self.passed]
+        self.assertEqual(
+            messages,
+            ["IO_InputGetAll failed, attempt 0", "IO_InputGetAll failed, attempt 19 [19x in last 0.1s]"],
+        )
+        self.assertTrue(self.passed[1].aggregated)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs os.fork")
+    def test_listener_restarted_in_forked_child(self):
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                logging.getLogger("pyuptech").debug("logged from the child")
+                sleep(0.2)
+                listener = logger_module._listener
+                if listener is not None and listener._thread.is_alive() and logger_module._log_queue.empty():
+                    code = 0
+            finally:
+                os._exit(code)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
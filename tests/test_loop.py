@@ -0,0 +1,98 @@
+import unittest
+from threading import Event, current_thread
+from time import sleep
+from unittest.mock import patch
+
+from pyuptech import ControlLoop, OverrunPolicy, SensorEmulator, SensorSnapshot
+from pyuptech.modules import loop as loop_module
+
+
+class FakeClock:
+    """
+    A perf_counter_ns that moves 1us per read and jumps on sleep, so that the steps take no time.
+    """
+
+    def __init__(self):
+        self.now = 0
+
+    def perf_counter_ns(self) -> int:
+        self.now += 1000
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += int(seconds * 1e9)
+
+
+class ControlLoopTests(unittest.TestCase):
+
+    def test_fixed_rate(self):
+        clock = FakeClock()
+        snapshots, starts = [], []
+
+        def step(snapshot):
+            snapshots.append(snapshot)
+            starts.append(clock.now)
+
+        loop = ControlLoop(step, frequency_hz=500, sensors=SensorEmulator())
+        with patch.object(loop_module, "perf_counter_ns", clock.perf_counter_ns), patch.object(
+            loop_module, "sleep", clock.sleep
+        ):
+            loop.run(iterations=20)
+        self.assertEqual(len(snapshots), 20)
+        self.assertIsInstance(snapshots[0], SensorSnapshot)
+        self.assertEqual(loop.stats.iterations, 20)
+        self.assertEqual(loop.stats.overruns, 0)
+        # the steps start on the 2ms grid, within the few microseconds the fake clock advances per read
+        for index, started in enumerate(starts):
+            self.assertLess(abs(started - starts[0] - index * 2_000_000), 10_000)
+
+    def test_skip_overruns(self):
+        loop = ControlLoop(lambda _: sleep(0.003), frequency_hz=1000, policy=OverrunPolicy.SKIP)
+        loop.run(iterations=5)
+        self.assertEqual(loop.stats.overruns, 4)
+        self.assertGreaterEqual(loop.stats.skipped, 8)
+        self.assertGreaterEqual(loop.stats.latency_percentile(50), 3000000)
+
+    def test_degrade(self):
+        loop = ControlLoop(lambda _: sleep(0.003), frequency_hz=1000, policy=OverrunPolicy.DEGRADE)
+        loop.run(iterations=5)
+        self.assertEqual(loop.frequency_hz, 250)
+
+    def test_stop_from_thread(self):
+        loop = ControlLoop(lambda _: None, frequency_hz=1000).start()
+        sleep(0.02)
+        loop.stop(timeout=1)
+        self.assertFalse(loop.is_running)
+        self.assertGreater(loop.stats.iterations, 0)
+
+
+    def test_restart_after_timed_out_stop(self):
+        release = Event()
+        threads = set()
+
+        def slow(_):
+            threads.add(current_thread())
+            release.wait(1)
+
+        loop = ControlLoop(slow, frequency_hz=1000).start()
+        sleep(0.02)
+        loop.stop(timeout=0.01)
+        # the thread is still in its step, so no second one is started next to it
+        self.assertTrue(loop.is_running)
+        with self.assertLogs("pyuptech", "WARNING"):
+            loop.start()
+        release.set()
+        loop.stop(timeout=1)
+        self.assertFalse(loop.is_running)
+        self.assertEqual(len(threads), 1)
+
+    def test_stop_from_step(self):
+        loop = ControlLoop(lambda _: loop.stop(), frequency_hz=1000)
+        loop.start()
+        sleep(0.05)
+        self.assertFalse(loop.is_running)
+        self.assertEqual(loop.stats.iterations, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
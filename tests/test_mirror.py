@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+from time import sleep
+
+from pyuptech import CommandCanvas, MirrorScreen, MirrorViewer, Color
+from pyuptech.modules.commands import decode_commands, ScreenOp
+from pyuptech.modules.mirror import encode_message, KIND_DELTA, _MESSAGE
+
+
+class DeltaTests(unittest.TestCase):
+
+    def test_unchanged_middle(self):
+        reference = bytes(range(200))
+        frame = reference[:90] + b"xy" + reference[92:]
+        message = encode_message(KIND_DELTA, reference, frame)
+        kind, compressed, prefix, suffix, length = _MESSAGE.unpack_from(message)
+        self.assertEqual((prefix, suffix, length), (90, 108, 2))
+        self.assertEqual(message[_MESSAGE.size :], b"xy")
+
+    def test_growing_frame(self):
+        message = encode_message(KIND_DELTA, b"abc", b"abcabc")
+        self.assertEqual(_MESSAGE.unpack_from(message)[2:], (3, 0, 3))
+
+    def test_compressed(self):
+        message = encode_message(KIND_DELTA, b"", b"\x01" * 1000)
+        self.assertTrue(_MESSAGE.unpack_from(message)[1])
+        self.assertLess(len(message), 100)
+
+
+class MirrorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "mirror.sock")
+        self.screen = CommandCanvas()
+        self.mirror = MirrorScreen(self.screen, self.path, max_overhead=1.0)
+
+    def tearDown(self):
+        self.mirror.close()
+
+    def test_frames_reach_viewer(self):
+        self.mirror.fill_screen(Color.BLACK).put_string(0, 0, "before")
+        self.mirror.refresh()
+        target = CommandCanvas()
+        viewer = MirrorViewer(self.path, target)
+        self.mirror.refresh()
+        self.assertEqual(self.mirror.viewers, 1)
+
+        for value in range(10):
+            self.mirror.fill_frame(0, 0, 10, 10, Color.RED).put_string(0, 0, f"v{value}")
+            self.mirror.refresh()
+        sleep(0.01)
+        viewer.poll(1.0)
+        ops = list(decode_commands(target.commands))
+        self.assertEqual(ops[:2], [(ScreenOp.FILL_SCREEN, (Color.BLACK,)), (ScreenOp.PUT_STRING, (0, 0, "before"))])
+        self.assertEqual(ops[-1], (ScreenOp.PUT_STRING, (0, 0, "v9")))
+        self.assertEqual(viewer.frames, 10)
+        # the screen got every call, refreshes included
+        self.assertEqual(sum(op is ScreenOp.REFRESH for op, _ in decode_commands(self.screen.commands)), 12)
+        self.assertLess(self.mirror.stats.compression, 1.0)
+        viewer.close()
+
+    def test_throttled_frames_are_merged(self):
+        target = CommandCanvas()
+        viewer = MirrorViewer(self.path, target)
+        self.mirror.refresh()
+        self.mirror._credit_ns = -1e12
+        self.mirror.put_string(0, 0, "skipped")
+        self.mirror.refresh()
+        self.assertEqual(self.mirror.stats.skipped, 1)
+        self.mirror._credit_ns = 0
+        self.mirror.put_string(0, 8, "sent")
+        self.mirror.refresh()
+        sleep(0.01)
+        viewer.poll(1.0)
+        strings = [args[2] for op, args in decode_commands(target.commands) if op is ScreenOp.PUT_STRING]
+        self.assertEqual(strings, ["skipped", "sent"])
+        viewer.close()
+
+    def test_history_bounded_without_fill_screen(self):
+        mirror = MirrorScreen(CommandCanvas(), os.path.join(tempfile.mkdtemp(), "bounded.sock"), history_limit=256)
+        with mirror:
+            for value in range(200):
+                mirror.put_string(0, 0, f"value {value}")
+                self.assertLessEqual(len(mirror._history), 512)
+            target = CommandCanvas()
+            viewer = MirrorViewer(mirror.address, target)
+            mirror.refresh()
+            viewer.poll(1.0)
+            strings = [args[2] for op, args in decode_commands(target.commands) if op is ScreenOp.PUT_STRING]
+            self.assertEqual(strings[-1], "value 199")
+            self.assertLessEqual(len(target.commands), 256)
+            viewer.close()
+
+    def test_unrecorded_calls_forwarded(self):
+        self.screen.set_led_0 = lambda color: self.screen
+        self.assertIs(self.mirror.set_led_0(Color.RED), self.screen)
+        self.assertEqual(self.mirror._history, b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+from math import pi
+
+from pyuptech import SensorEmulator
+
+
+class MPUScalingTests(unittest.TestCase):
+
+    def setUp(self):
+        self.emu = SensorEmulator()
+
+    def test_default_fsr(self):
+        self.assertEqual((self.emu.gyro_fsr, self.emu.acc_fsr), (2000, 8))
+
+    def test_scaled_with_cached_fsr(self):
+        self.emu.mpu_set_gyro_fsr(250).mpu_set_accel_fsr(2)
+        self.assertEqual((self.emu.gyro_fsr, self.emu.acc_fsr), (250, 2))
+        with self.emu.tick(mpu=True) as snap:
+            gyro, acc = self.emu.imu_si()
+            self.assertEqual(self.emu.gyro_si(), gyro)
+            self.assertEqual(self.emu.acc_si(), acc)
+        # the library divides by the sensitivities of the default ranges, 2000 degree/s and 8g
+        self.assertAlmostEqual(gyro[0], snap.gyro[0] * 250 / 2000 * pi / 180)
+        self.assertAlmostEqual(acc[2], snap.acc[2] * 2 / 8 * 9.80665)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import threading
+import unittest
+from time import sleep
+
+from pyuptech import SensorEmulator
+
+
+class SlowEmulator(SensorEmulator):
+    """hardware-like calls that release the GIL"""
+
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def adc_all_channels(self):
+        self.threads.add(threading.current_thread().name)
+        sleep(0.003)
+        return super().adc_all_channels()
+
+    def acc_all(self):
+        self.threads.add(threading.current_thread().name)
+        sleep(0.003)
+        return super().acc_all()
+
+
+class ParallelReadTests(unittest.TestCase):
+
+    def test_overlapped(self):
+        emu = SlowEmulator()
+        self.assertIsNone(emu.parallel_read_stats)
+        snap = emu.read_all_parallel()
+        self.assertTrue(snap.has_mpu)
+        self.assertEqual(len(emu.threads), 2)
+        stats = emu.parallel_read_stats
+        self.assertEqual(stats.reads, 1)
+        self.assertGreater(stats.last_saved_ns, 1000000)
+        emu._parallel_reader.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
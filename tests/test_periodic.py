@@ -0,0 +1,84 @@
+import threading
+import time
+import unittest
+from threading import Event
+
+from pyuptech.modules.periodic import PeriodicThread
+
+
+class PeriodicThreadTests(unittest.TestCase):
+
+    def test_calls_at_interval(self):
+        calls = []
+        timer = PeriodicThread(lambda: calls.append(time.perf_counter()), 10_000_000, "Test timer", "test-timer")
+        timer.start().start()
+        time.sleep(0.2)
+        timer.stop(timeout=1)
+        self.assertFalse(timer.is_running)
+        self.assertTrue(10 <= len(calls) <= 25, len(calls))
+
+    def test_errors_do_not_stop(self):
+        calls = []
+
+        def fail():
+            calls.append(None)
+            raise RuntimeError("boom")
+
+        timer = PeriodicThread(fail, 1_000_000, "Test timer", "test-timer")
+        with self.assertLogs("pyuptech", "ERROR") as logs:
+            timer.start()
+            time.sleep(0.05)
+            timer.stop(timeout=1)
+        self.assertGreater(len(calls), 1)
+        self.assertIn("Test timer failed, boom", logs.output[0])
+
+    def test_stop_from_target(self):
+        stopped = Event()
+
+        def once():
+            timer.stop()
+            stopped.set()
+
+        timer = PeriodicThread(once, 0, "Test timer", "test-timer")
+        timer.start()
+        self.assertTrue(stopped.wait(1))
+        self.assertFalse(timer.is_running)
+
+    def test_restart_after_timed_out_stop(self):
+        release = Event()
+        threads = set()
+
+        def slow():
+            threads.add(threading.current_thread())
+            release.wait(1)
+
+        timer = PeriodicThread(slow, 1_000_000, "Test timer", "test-timer").start()
+        time.sleep(0.02)
+        timer.stop(timeout=0.01)
+        # the thread is still in its call, so it is kept and no second one is started
+        self.assertTrue(timer.is_running)
+        with self.assertLogs("pyuptech", "WARNING"):
+            timer.start()
+        release.set()
+        timer.stop(timeout=1)
+        self.assertFalse(timer.is_running)
+        self.assertEqual(len(threads), 1)
+        release.clear()
+        timer.start()
+        time.sleep(0.02)
+        release.set()
+        timer.stop(timeout=1)
+        self.assertEqual(len(threads), 2)
+
+    def test_interval_change_while_running(self):
+        calls = []
+        timer = PeriodicThread(lambda: calls.append(None), 1_000_000_000, "Test timer", "test-timer").start()
+        time.sleep(0.05)
+        timer.interval_ns = 1_000_000
+        time.sleep(1.1)
+        timer.stop(timeout=1)
+        self.assertGreater(len(calls), 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
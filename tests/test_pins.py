@@ -0,0 +1,84 @@
+import unittest
+
+from pyuptech import Pin, PinGroup, SensorEmulator
+
+
+class FakeIO:
+    def __init__(self, mask: int = 0):
+        self.mask = mask
+        self.reads = 0
+        self.writes = 0
+
+    def get(self) -> int:
+        self.reads += 1
+        return self.mask
+
+    def set(self, mask: int):
+        self.writes += 1
+        self.mask = mask
+
+
+class PinGroupTests(unittest.TestCase):
+
+    def setUp(self):
+        self.io = FakeIO(0b10100101)
+
+    def test_read_once(self):
+        group = PinGroup([0, 1, 2, 5, 7, 6], self.io.get, self.io.set)
+        self.assertEqual(group.read(), (1, 0, 1, 1, 1, 0))
+        self.assertEqual(group.read_mask(), 0b10100101)
+        self.assertEqual(self.io.reads, 2)
+
+    def test_write_once(self):
+        group = PinGroup([1, 2, 3], self.io.get, self.io.set)
+        group.write([1, 0, 1])
+        self.assertEqual(self.io.mask, 0b10101011)
+        self.assertEqual(self.io.writes, 1)
+
+    def test_groups_write_in_turn(self):
+        left = PinGroup([0, 1], self.io.get, self.io.set)
+        right = PinGroup([2, 3], self.io.get, self.io.set)
+        left.write([0, 1])
+        right.write([0, 1])
+        Pin(7, self.io.get, self.io.set).set(0)
+        left.write([1, 1])
+        self.assertEqual(self.io.mask, 0b00101011)
+
+    def test_shared_output_levels(self):
+        sensors = SensorEmulator().adc_io_open().set_all_io_levels(0b10000000)
+        writes = []
+        sensors.set_all_io_levels = lambda levels: writes.append(levels) or SensorEmulator.set_all_io_levels(
+            sensors, levels
+        )
+        sensors.io_all_channels = lambda: self.fail("The inputs were read for a write")
+        left, right = sensors.pin_group(0, 1), sensors.pin_group(2, 3)
+        left.write([1, 0])
+        right.write([1, 1])
+        sensors.flip_io_level(6)
+        left.write([0, 1])
+        # every write builds on the levels written by the others, without reading the inputs
+        self.assertEqual(writes, [0b10000001, 0b10001101, 0b11001110])
+        self.assertEqual(sensors.io_output_levels(), 0b11001110)
+
+    def test_single_pin(self):
+        pin = Pin(3, self.io.get, self.io.set)
+        self.assertEqual(pin.get(), 0)
+        pin.set(1)
+        self.assertEqual(pin.level_of(self.io.mask), 1)
+        self.assertEqual(pin.mask, 0b1000)
+        with self.assertRaises(AttributeError):
+            pin.extra = 1
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            Pin(8)
+        with self.assertRaises(ValueError):
+            PinGroup([0, 1], self.io.get, self.io.set).write([1])
+        with self.assertRaises(ValueError):
+            Pin(2, self.io.get).set(1)
+        with self.assertRaises(ValueError):
+            PinGroup([0, 1], self.io.get).write([1, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
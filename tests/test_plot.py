@@ -0,0 +1,77 @@
+import unittest
+
+from pyuptech import CommandCanvas, Sparkline, SensorEmulator, Color
+from pyuptech.modules.commands import decode_commands, ScreenOp
+
+
+class SparklineTests(unittest.TestCase):
+
+    def setUp(self):
+        self.canvas = CommandCanvas()
+
+    def ops(self):
+        ops = [op for op, _ in decode_commands(self.canvas.commands)]
+        self.canvas.clear()
+        return ops
+
+    def test_fixed_range_draws_one_column(self):
+        plot = Sparkline(self.canvas, 0, 0, 16, 8, y_range=(0, 100))
+        for value in (10, 20, 30):
+            plot.push(value)
+        self.assertEqual(plot.full_redraws, 0)
+        self.assertEqual(plot.columns_drawn, 3)
+        self.ops()
+        plot.push(40)
+        # erase the column, connect to the previous sample, clear the gap ahead
+        self.assertEqual(self.ops(), [ScreenOp.DRAW_LINE, ScreenOp.DRAW_LINE, ScreenOp.DRAW_LINE])
+
+    def test_clamped_and_scaled(self):
+        plot = Sparkline(self.canvas, 10, 20, 4, 11, y_range=(0, 10))
+        self.assertEqual(plot._to_row(0), 30)
+        self.assertEqual(plot._to_row(10), 20)
+        self.assertEqual(plot._to_row(5), 25)
+        self.assertEqual(plot._to_row(-50), 30)
+        self.assertEqual(plot._to_row(50), 20)
+
+    def test_autoscale_hysteresis(self):
+        plot = Sparkline(self.canvas, 0, 0, 10, 8, margin=0.1)
+        plot.push(100)
+        self.assertEqual(plot.full_redraws, 1)
+        for value in (95, 105, 100, 98):
+            plot.push(value)
+        low, high = plot.y_range
+        self.assertTrue(low <= 95 and high >= 105)
+        redraws = plot.full_redraws
+
+        # small noise inside the range never redraws
+        for value in (99, 101, 100, 102, 97):
+            plot.push(value)
+        self.assertEqual(plot.full_redraws, redraws)
+
+        # a spike grows the range at once
+        plot.push(200)
+        self.assertEqual(plot.full_redraws, redraws + 1)
+        self.assertGreaterEqual(plot.y_range[1], 200)
+
+        # it shrinks back only after a whole sweep without the spike
+        for _ in range(9):
+            plot.push(100)
+        self.assertGreaterEqual(plot.y_range[1], 200)
+        for _ in range(10):
+            plot.push(100)
+        self.assertLess(plot.y_range[1], 200)
+
+    def test_multiple_series_bound(self):
+        emu = SensorEmulator()
+        plot = Sparkline(self.canvas, 0, 0, 8, 8, colors=(Color.RED, Color.BLUE), y_range=(0, 4096))
+        plot.bind(emu.adc_all_channels, (0, 3)).sample().sample()
+        colors = {args[-1] for _, args in decode_commands(self.canvas.commands)} - {Color.BLACK}
+        self.assertEqual(colors, {Color.RED, Color.BLUE})
+        single = Sparkline(self.canvas, 0, 0, 8, 8).bind(emu.atti_all, (2,))
+        single.sample()
+        with self.assertRaises(ValueError):
+            plot.push(1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from pyuptech import BoardProfile, ProfileStep, SensorEmulator, FontSize, Color
+from pyuptech.modules.screen import ScreenDirection
+
+
+class FakeBoard(SensorEmulator):
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+        self.modes = 0
+        self.levels = 0
+
+    def adc_io_open(self):
+        self.calls.append("adc_io_open")
+        return super().adc_io_open()
+
+    def MPU6500_Open(self):
+        self.calls.append("MPU6500_Open")
+        return super().MPU6500_Open()
+
+    def get_all_io_mode(self):
+        return self.modes
+
+    def io_all_channels(self):
+        return self.levels
+
+    def set_io_mode(self, index, mode):
+        self.calls.append("set_io_mode")
+        self.modes = self.modes & ~(1 << index) | mode << index
+        return self
+
+    def set_all_io_mode(self, mode):
+        self.calls.append("set_all_io_mode")
+        self.modes = 0xFF if mode else 0
+        return self
+
+    def set_all_io_levels(self, levels):
+        self.calls.append("set_all_io_levels")
+        self.levels = levels
+        return self
+
+    def mpu_set_gyro_fsr(self, fsr):
+        self.calls.append("mpu_set_gyro_fsr")
+        return super().mpu_set_gyro_fsr(fsr)
+
+
+class FakeScreen:
+
+    def __init__(self):
+        self.calls = []
+        self.direction = None
+        self.font_size = FontSize.FONT_12X20
+        self.led_colors = (None, None)
+
+    def open(self, direction):
+        self.calls.append("open")
+        self.direction = ScreenDirection(direction)
+        return self
+
+    def set_font_size(self, font_size):
+        self.calls.append("set_font_size")
+        self.font_size = font_size
+        return self
+
+    def set_all_leds_single(self, first, second):
+        self.calls.append("set_all_leds_single")
+        self.led_colors = (first, second)
+        return self
+
+    def set_led_color(self, index, color):
+        self.calls.append("set_led_color")
+        colors = list(self.led_colors)
+        colors[index] = color
+        self.led_colors = tuple(colors)
+        return self
+
+
+PROFILE = {
+    "io": {"modes": "0b11110000", "levels": "0b00110000"},
+    "mpu": {"gyro_fsr": 500, "acc_fsr": 8},
+    "screen": {"direction": 2, "font_size": "FONT_8X12", "leds": [Color.RED, Color.BLACK]},
+}
+
+
+class BoardProfileTests(unittest.TestCase):
+
+    def setUp(self):
+        self.board = FakeBoard()
+        self.screen = FakeScreen()
+        self.profile = BoardProfile.from_dict(PROFILE)
+
+    def test_first_apply_then_idempotent(self):
+        steps = self.profile.apply(self.board, self.screen)
+        self.assertEqual(
+            self.board.calls,
+            ["adc_io_open"] + ["set_io_mode"] * 4 + ["set_all_io_levels", "MPU6500_Open", "mpu_set_gyro_fsr"],
+        )
+        self.assertEqual(self.screen.calls, ["open", "set_font_size", "set_all_leds_single"])
+        self.assertEqual(len(steps), 11)
+        self.assertEqual(steps[1], ProfileStep("sensors", "set_io_mode", (4, 1)))
+        self.assertEqual(self.profile.apply(self.board, self.screen), [])
+        self.assertEqual(self.profile.plan(self.board, self.screen), [])
+
+    def test_only_differences_applied(self):
+        self.profile.apply(self.board, self.screen)
+        self.board.modes = 0b01110000
+        self.board.levels = 0b00110001  # an input reading high is not a difference
+        self.screen.led_colors = (Color.RED, Color.BLUE)
+        steps = self.profile.apply(self.board, self.screen)
+        self.assertEqual(
+            steps,
+            [
+                ProfileStep("sensors", "set_io_mode", (7, 1)),
+                ProfileStep("sensors", "set_all_io_levels", (0b00110000,)),
+                ProfileStep("screen", "set_led_color", (1, Color.BLACK)),
+            ],
+        )
+        self.board.levels = 0b00100000
+        self.assertEqual(
+            self.profile.apply(self.board, self.screen), [ProfileStep("sensors", "set_all_io_levels", (0b00110000,))]
+        )
+
+    def test_plan_makes_no_calls(self):
+        plan = self.profile.plan(self.board, self.screen)
+        self.assertEqual(self.board.calls, [])
+        self.assertEqual(self.screen.calls, [])
+        # the modes of a closed plug are unknown, so all of them are planned
+        self.assertEqual(sum(step.method == "set_io_mode" for step in plan), 8)
+
+    def test_missing_target(self):
+        with self.assertRaises(ValueError):
+            self.profile.apply(self.board)
+        self.assertEqual(BoardProfile(open_mpu=True).apply(self.board), [ProfileStep("sensors", "MPU6500_Open", ())])
+
+    def test_invalid_fields(self):
+        with self.assertRaises(ValueError):
+            BoardProfile(gyro_fsr=300)
+        with self.assertRaises(ValueError):
+            BoardProfile(io_modes=0x100)
+        with self.assertRaises(ValueError):
+            BoardProfile(leds=[Color.RED])
+
+    def test_failed_open_not_trusted(self):
+        board = FakeBoard()
+        # the plug stays closed, as when the lib fails to open it
+        board.adc_io_open = lambda: board.calls.append("adc_io_open") or board
+        board.get_all_io_mode = lambda: self.fail("The modes of a closed plug were read")
+        self.profile.apply(board, self.screen)
+        self.assertEqual(board.calls.count("set_io_mode"), 8)
+        self.assertIn("set_all_io_levels", board.calls)
+
+    def test_font_size_forms(self):
+        for font_size in (FontSize.FONT_8X12, FontSize.FONT_8X12.value, "FONT_8X12"):
+            self.assertIs(BoardProfile(font_size=font_size).font_size, FontSize.FONT_8X12)
+        self.assertEqual(
+            BoardProfile(font_size=7).apply(screen=self.screen),
+            [ProfileStep("screen", "set_font_size", (FontSize.FONT_8X12,))],
+        )
+        for font_size in (99, "FONT_99X99"):
+            with self.assertRaises(ValueError):
+                BoardProfile(font_size=font_size)
+
+    def test_from_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = Path(directory) / "board.json"
+            json_path.write_text(json.dumps(PROFILE), encoding="utf-8")
+            toml_path = Path(directory) / "board.toml"
+            toml_path.write_text(
+                "[io]\nmodes = 0b11110000\nlevels = 0b00110000\n"
+                "[mpu]\ngyro_fsr = 500\nacc_fsr = 8\n"
+                '[screen]\ndirection = 2\nfont_size = "FONT_8X12"\nleds = [0xFF0000, 0x000000]\n',
+                encoding="utf-8",
+            )
+            for path in (json_path, toml_path):
+                profile = BoardProfile.from_file(path)
+                self.assertTrue(profile.open_adc_io and profile.open_mpu)
+                self.assertEqual(profile.io_modes, 0b11110000)
+                self.assertEqual(profile.font_size, FontSize.FONT_8X12)
+                self.assertEqual(profile.leds, (0xFF0000, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
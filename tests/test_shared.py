@@ -0,0 +1,73 @@
+import os
+import unittest
+from time import perf_counter
+
+from pyuptech import SensorEmulator, SensorPublisher, SensorSubscriber
+from pyuptech.modules.shared import _SEQ
+
+
+class SharedSensorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.name = f"pyuptech_test_{os.getpid()}"
+        self.publisher = SensorPublisher(SensorEmulator(), name=self.name, mpu=True)
+        self.subscriber = SensorSubscriber(self.name)
+
+    def tearDown(self):
+        self.subscriber.close()
+        self.publisher.close()
+
+    def test_round_trip(self):
+        self.assertEqual(self.subscriber.generation, 0)
+        self.publisher.publish()
+        snap = self.subscriber.snapshot()
+        self.assertEqual(self.subscriber.generation, 1)
+        self.assertEqual(self.subscriber.adc_all_channels(), snap.adc)
+        self.assertEqual(self.subscriber.io_all_channels(), snap.io)
+        self.assertEqual(self.subscriber.get_io_level(3), (snap.io >> 3) & 1)
+        self.assertEqual(self.subscriber.acc_all(), snap.acc)
+        self.assertEqual(self.subscriber.gyro_all(), snap.gyro)
+        self.assertEqual(self.subscriber.atti_all(), snap.atti)
+
+    def test_without_mpu(self):
+        emu = SensorEmulator()
+        snap = emu.take_snapshot()
+        self.publisher.write(snap)
+        got = self.subscriber.snapshot()
+        self.assertFalse(got.has_mpu)
+        self.assertEqual((got.adc, got.io, got.timestamp_ns), (snap.adc, snap.io, snap.timestamp_ns))
+        self.assertIsNone(self.subscriber.acc_all())
+        self.assertIsNone(self.subscriber.gyro_all())
+        self.assertIsNone(self.subscriber.atti_all())
+
+    def test_before_first_publish(self):
+        subscriber = self.subscriber
+        self.assertEqual(subscriber.generation, 0)
+        self.assertIsNone(subscriber.snapshot())
+        self.assertIsNone(subscriber.timestamp_ns)
+        self.assertIsNone(subscriber.adc_all_channels())
+        self.assertIsNone(subscriber.io_all_channels())
+        self.assertIsNone(subscriber.get_io_level(0))
+        self.assertIsNone(subscriber.acc_all())
+        self.assertIsNone(subscriber.gyro_all())
+        self.assertIsNone(subscriber.atti_all())
+
+    def test_seq_skips_zero_on_wrap(self):
+        self.publisher._seq = 0xFFFFFFFE
+        self.publisher.publish()
+        self.assertNotEqual(_SEQ.unpack_from(self.publisher._buf, 0)[0], 0)
+        self.assertIsNotNone(self.subscriber.adc_all_channels())
+
+    def test_dead_writer_times_out(self):
+        self.publisher.publish()
+        # a publisher killed in the middle of a write leaves the seq odd
+        _SEQ.pack_into(self.publisher._buf, 0, 3)
+        with SensorSubscriber(self.name, timeout_ms=20) as subscriber:
+            started = perf_counter()
+            with self.assertRaises(TimeoutError):
+                subscriber.adc_all_channels()
+            self.assertLess(perf_counter() - started, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from threading import Thread
+
+from pyuptech import SensorEmulator, SensorSnapshot
+
+
+class TickTests(unittest.TestCase):
+
+    def setUp(self):
+        self.emu = SensorEmulator()
+
+    def test_consistent_within_tick(self):
+        with self.emu.tick() as snap:
+            self.assertIsInstance(snap, SensorSnapshot)
+            self.assertIs(self.emu.adc_all_channels(), snap.adc)
+            self.assertEqual(self.emu.io_all_channels(), snap.io)
+            self.assertEqual(
+                [self.emu.get_io_level(i) for i in range(8)],
+                [(snap.io >> i) & 1 for i in range(8)],
+            )
+            self.assertFalse(snap.has_mpu)
+        self.assertNotIn("adc_all_channels", vars(self.emu))
+        self.assertIsNone(self.emu.tick_snapshot)
+
+    def test_mpu_tick(self):
+        with self.emu.tick(mpu=True) as snap:
+            self.assertTrue(snap.has_mpu)
+            self.assertIs(self.emu.acc_all(), snap.acc)
+            self.assertIs(self.emu.atti_all(), snap.atti)
+            with self.emu.tick() as inner:
+                self.assertIs(inner, snap)
+            self.assertIs(self.emu.tick_snapshot, snap)
+        self.assertNotIn("acc_all", vars(self.emu))
+
+    def test_nested_mpu_tick_merges(self):
+        with self.emu.tick() as outer:
+            self.assertIsNot(self.emu.acc_all(), self.emu.acc_all())
+            with self.emu.tick(mpu=True) as inner:
+                self.assertTrue(inner.has_mpu)
+                self.assertIs(inner.adc, outer.adc)
+                self.assertIs(self.emu.gyro_all(), inner.gyro)
+                self.assertIs(self.emu.adc_all_channels(), outer.adc)
+            # leaving the nested tick keeps the outer one active
+            self.assertIs(self.emu.tick_snapshot, outer)
+            self.assertIs(self.emu.adc_all_channels(), outer.adc)
+            self.assertIsNot(self.emu.acc_all(), inner.acc)
+        self.assertIsNone(self.emu.tick_snapshot)
+
+    def test_other_threads_read_hardware(self):
+        seen = []
+        with self.emu.tick() as snap:
+            thread = Thread(target=lambda: seen.append((self.emu.tick_snapshot, self.emu.adc_all_channels())))
+            thread.start()
+            thread.join()
+            self.assertIs(self.emu.adc_all_channels(), snap.adc)
+        self.assertIsNone(seen[0][0])
+        self.assertIsNot(seen[0][1], snap.adc)
+
+    def test_bound_getters_served(self):
+        read_io = self.emu.io_all_channels
+        with self.emu.tick() as snap:
+            self.assertEqual([read_io() for _ in range(5)], [snap.io] * 5)
+
+    def test_restored_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with self.emu.tick():
+                raise RuntimeError
+        self.assertIsNone(self.emu.tick_snapshot)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import random
+import unittest
+
+from pyuptech import CommandCanvas, Sprite, SpriteCache, Color
+from pyuptech.modules.commands import decode_commands, ScreenOp
+
+
+class PixelCanvas:
+    """rasterizes the calls a sprite issues, the lines are horizontal or vertical"""
+
+    def __init__(self):
+        self.pixels = {}
+        self.calls = 0
+
+    def fill_frame(self, x1, y1, x2, y2, color):
+        self.calls += 1
+        for y in range(y1, y2 + 1):
+            for x in range(x1, x2 + 1):
+                self.pixels[x, y] = color
+
+    draw_line = fill_frame
+
+    def draw_pixel(self, x, y, color):
+        self.fill_frame(x, y, x, y, color)
+
+
+def rasterize(rows, transparent, dx=0, dy=0):
+    return {
+        (x + dx, y + dy): color
+        for y, row in enumerate(rows)
+        for x, color in enumerate(row)
+        if color != transparent
+    }
+
+
+class SpriteTests(unittest.TestCase):
+
+    def test_solid_block_is_one_call(self):
+        sprite = Sprite([[Color.RED] * 8 for _ in range(6)])
+        self.assertEqual(sprite.frames, ((0, 0, 7, 5, Color.RED),))
+        self.assertEqual(sprite.calls, 1)
+
+    def test_reproduces_image(self):
+        rng = random.Random(7)
+        rows = [[rng.choice((0, 0, Color.RED, Color.BLUE)) for _ in range(20)] for _ in range(12)]
+        sprite = Sprite(rows, transparent=0)
+        canvas = PixelCanvas()
+        sprite.draw(canvas, 5, 3)
+        self.assertEqual(canvas.pixels, rasterize(rows, 0, 5, 3))
+        self.assertLess(sprite.calls, sum(color != 0 for row in rows for color in row))
+
+    def test_rgb888(self):
+        data = bytes([255, 0, 0, 0, 0, 0, 255, 0, 0, 0, 0, 255])
+        sprite = Sprite.from_rgb888(data, 2, 2, transparent=0)
+        canvas = PixelCanvas()
+        sprite.draw(canvas, 0, 0)
+        self.assertEqual(canvas.pixels, {(0, 0): Color.RED, (0, 1): Color.RED, (1, 1): Color.BLUE})
+        with self.assertRaises(ValueError):
+            Sprite.from_rgb888(data, 3, 2)
+
+    def test_bitmap(self):
+        sprite = Sprite.from_bitmap(["#.#", 0b111], 3, Color.GREEN)
+        canvas = PixelCanvas()
+        sprite.draw(canvas, 0, 0)
+        self.assertEqual(set(canvas.pixels), {(0, 0), (2, 0), (0, 1), (1, 1), (2, 1)})
+        opaque = Sprite.from_bitmap(["#.#"], 3, Color.GREEN, background=Color.BLACK)
+        self.assertEqual(opaque.calls, 3)
+
+    def test_ragged_rows(self):
+        with self.assertRaises(ValueError):
+            Sprite([[1, 2], [1]])
+
+    def test_recorded_blit(self):
+        sprite = Sprite([[1, 1], [1, 1]])
+        canvas = CommandCanvas().blit(sprite, 10, 20)
+        self.assertEqual(list(decode_commands(canvas.commands)), [(ScreenOp.FILL_FRAME, (10, 20, 11, 21, 1))])
+
+
+class SpriteCacheTests(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        cache = SpriteCache(capacity=2)
+        conversions = []
+
+        def converter(key):
+            def convert():
+                conversions.append(key)
+                return Sprite([[1]])
+
+            return convert
+
+        for key in ("a", "b", "a", "c", "a", "b"):
+            cache.get_or_convert(key, converter(key))
+        self.assertEqual(conversions, ["a", "b", "c", "b"])
+        self.assertEqual(cache.evictions, 2)
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+        self.assertNotIn("c", cache)
+        self.assertEqual(len(cache), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+
+from pyuptech import CommandCanvas, TextConsole, FontSize, layout_text
+from pyuptech.modules.commands import decode_commands, ScreenOp
+from pyuptech.modules.screen import ScreenDirection, _print_layout
+
+
+class LayoutTests(unittest.TestCase):
+
+    def test_wrap_and_clip(self):
+        self.assertEqual(layout_text("hello pyuptech world", 10), ("hello", "pyuptech", "world"))
+        self.assertEqual(layout_text("abcdefghij", 4), ("abcd", "efgh", "ij"))
+        self.assertEqual(layout_text("a\n\nb", 4), ("a", "", "b"))
+        self.assertEqual(layout_text("one two three four", 5, rows=2), ("one", "two"))
+        with self.assertRaises(ValueError):
+            layout_text("x", 0)
+
+    def test_cached(self):
+        first = layout_text("cached text", 6)
+        self.assertIs(layout_text("cached text", 6), first)
+
+    def test_print_layout(self):
+        # 128 / 12 = 10 columns, 64 / 20 = 3 rows
+        lines = _print_layout("the quick brown fox jumps over it", FontSize.FONT_12X20, ScreenDirection.HORIZONTAL)
+        self.assertEqual(lines, ((0, b"the quick"), (20, b"brown fox"), (40, b"jumps over")))
+
+    def test_metrics(self):
+        self.assertEqual((FontSize.FONT_6X8.column_width, FontSize.FONT_6X8.row_height), (6, 8))
+        self.assertEqual((FontSize.FONT_24X40.column_width, FontSize.FONT_24X40.row_height), (24, 40))
+        self.assertEqual((ScreenDirection.VERTICAL.width, ScreenDirection.VERTICAL.height), (64, 128))
+
+
+class ConsoleTests(unittest.TestCase):
+
+    def setUp(self):
+        self.canvas = CommandCanvas()
+        # 6 columns, 3 rows
+        self.console = TextConsole(self.canvas, 0, 0, 36, 24, FontSize.FONT_6X8)
+
+    def calls(self):
+        calls = [(op, args) for op, args in decode_commands(self.canvas.commands) if op < ScreenOp.SET_FONT_SIZE]
+        self.canvas.clear()
+        return calls
+
+    def test_scroll(self):
+        for line in ("a", "b", "c"):
+            self.console.print(line)
+        self.assertEqual(self.console.lines, ["b", "c", ""])
+        self.calls()
+        self.console.print("d")
+        self.assertEqual(self.console.lines, ["c", "d", ""])
+        self.assertEqual(
+            self.calls(),
+            [(ScreenOp.PUT_STRING, (0, 0, "c")), (ScreenOp.PUT_STRING, (0, 8, "d"))],
+        )
+
+    def test_only_changed_suffix(self):
+        self.console.write("val 1")
+        self.calls()
+        self.console.write("9")
+        self.assertEqual(self.calls(), [(ScreenOp.PUT_STRING, (30, 0, "9"))])
+
+    def test_write_continues_line(self):
+        self.console.write("a: ")
+        self.console.write("1")
+        self.assertEqual(self.console.lines, ["a: 1"])
+        # a continued line that wraps is laid out again from its raw text
+        self.console.write("2 xy")
+        self.console.write("z\nb")
+        self.assertEqual(self.console.lines, ["a: 12", "xyz", "b"])
+
+    def test_shorter_line_clears_tail(self):
+        self.console.write("abcdef")
+        self.console.clear()
+        self.console.write("ab")
+        self.assertIn((ScreenOp.FILL_FRAME, (0, 0, 35, 7, 0)), self.calls())
+
+    def test_unchanged_rows_skipped(self):
+        self.console.print("same")
+        drawn = self.console.rows_drawn
+        self.console.render()
+        self.assertEqual(self.console.rows_drawn, drawn)
+
+
+if __name__ == "__main__":
+    unittest.main()
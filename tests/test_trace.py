@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+from time import perf_counter
+
+from pyuptech import CommandCanvas, ScreenRecorder, ScreenTrace, Color, FontSize
+from pyuptech.modules.commands import ScreenOp
+
+
+def draw_frame(screen, text):
+    (
+        screen.set_font_size(FontSize.FONT_6X8)
+        .set_fore_color(Color.WHITE)
+        .fill_frame(0, 0, 10, 10, Color.RED)
+        .put_string(0, 0, text)
+        .refresh()
+    )
+
+
+class TraceTests(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = CommandCanvas()
+        self.recorder = ScreenRecorder(self.screen)
+
+    def test_round_trip(self):
+        draw_frame(self.recorder, "a")
+        draw_frame(self.recorder, "b")
+        trace = self.recorder.trace
+        self.assertEqual(len(trace), 10)
+        # the calls reached the screen
+        self.assertEqual(self.screen.commands.count(bytes((ScreenOp.REFRESH,))), 2)
+
+        path = os.path.join(tempfile.mkdtemp(), "ui.trace")
+        trace.save(path)
+        loaded = ScreenTrace.load(path)
+        self.assertEqual(list(loaded), list(trace))
+        target = CommandCanvas()
+        loaded.replay(target)
+        self.assertEqual(target.commands, self.screen.commands)
+        with self.assertRaises(ValueError):
+            ScreenTrace.from_bytes(b"NOPE\x01")
+
+    def test_redundancy(self):
+        draw_frame(self.recorder, "a")
+        draw_frame(self.recorder, "a")
+        self.recorder.fill_frame(0, 0, 10, 10, Color.RED).fill_frame(0, 0, 10, 10, Color.RED).refresh()
+        report = self.recorder.trace.analyze()
+        self.assertEqual(report.frames, 3)
+        self.assertEqual(report.redundant_frames, 1)
+        self.assertEqual(report.redundant_state_changes, 2)
+        self.assertEqual(report.redundant_draws, 1)
+        self.assertEqual(report.costs[ScreenOp.FILL_FRAME].count, 4)
+        self.assertIn("fill_frame", str(report))
+
+    def test_redundancy_across_frames(self):
+        recorder = self.recorder
+        recorder.fill_screen(Color.BLACK).set_font_size(FontSize.FONT_6X8)
+        recorder.put_string(0, 0, "speed").put_string(0, 20, "12").refresh()
+        # the same label in the next frames changes nothing, the value does
+        recorder.put_string(0, 0, "speed").put_string(0, 20, "13").refresh()
+        recorder.put_string(0, 0, "speed").refresh()
+        self.assertEqual(recorder.trace.analyze().redundant_draws, 2)
+        # a call drawn over the label, or a new color, makes the next label draw count
+        recorder.fill_frame(0, 0, 5, 5, Color.RED).put_string(0, 0, "speed").refresh()
+        recorder.set_fore_color(Color.RED).put_string(0, 0, "speed").refresh()
+        self.assertEqual(recorder.trace.analyze().redundant_draws, 2)
+        # and so does clearing the screen
+        recorder.fill_screen(Color.BLACK).put_string(0, 20, "13").refresh()
+        self.assertEqual(recorder.trace.analyze().redundant_draws, 2)
+
+    def test_realtime_replay(self):
+        trace = ScreenTrace()
+        trace.append(0, 0, bytes((ScreenOp.REFRESH,)))
+        trace.append(20000, 0, bytes((ScreenOp.REFRESH,)))
+        start = perf_counter()
+        trace.replay(CommandCanvas(), realtime=True, speed=2.0)
+        self.assertGreaterEqual(perf_counter() - start, 0.009)
+        report = trace.replay(CommandCanvas())
+        self.assertEqual(report.duration_us, 20000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+from threading import Event
+
+from pyuptech import SensorEmulator
+
+
+class StallingEmulator(SensorEmulator):
+    """an emulator whose ADC reads block until released"""
+
+    def __init__(self):
+        super().__init__()
+        self.stall = False
+        self.release = Event()
+        self.fail = False
+
+    def adc_all_channels(self):
+        if self.fail:
+            raise OSError("bus error")
+        if self.stall:
+            self.release.wait(1)
+        return super().adc_all_channels()
+
+
+class BoundedReaderTests(unittest.TestCase):
+
+    def setUp(self):
+        self.emu = StallingEmulator()
+        self.reader = self.emu.bounded_reader(budget_ms=20, budgets_ms={"adc_all_channels": 5})
+
+    def tearDown(self):
+        self.emu.release.set()
+        self.reader.close()
+
+    def test_fresh(self):
+        reading = self.reader.adc_all_channels()
+        self.assertFalse(reading.stale)
+        self.assertEqual(len(reading.value), 10)
+        self.assertGreater(reading.timestamp_ns, 0)
+
+    def test_stale_on_timeout(self):
+        good = self.reader.adc_all_channels()
+        self.emu.stall = True
+        stale = self.reader.adc_all_channels()
+        self.assertTrue(stale.stale)
+        self.assertEqual(stale.value, good.value)
+        self.assertEqual(stale.timestamp_ns, good.timestamp_ns)
+        # the stalled fetch is still in flight, no second fetch is queued behind it
+        self.assertTrue(self.reader.adc_all_channels().stale)
+        self.assertEqual(self.reader.timeouts["adc_all_channels"], 2)
+        self.assertEqual(self.reader.timeouts["atti_all"], 0)
+
+        self.emu.stall = False
+        self.emu.release.set()
+        self.reader._in_flight["adc_all_channels"].result(1)
+        self.assertFalse(self.reader.adc_all_channels().stale)
+
+    def test_never_read(self):
+        self.emu.stall = True
+        reading = self.reader.adc_all_channels()
+        self.assertTrue(reading.stale)
+        self.assertIsNone(reading.value)
+        self.assertEqual(reading.timestamp_ns, 0)
+
+    def test_failure(self):
+        good = self.reader.adc_all_channels()
+        self.emu.fail = True
+        reading = self.reader.adc_all_channels()
+        self.assertTrue(reading.stale)
+        self.assertEqual(reading.value, good.value)
+        self.assertEqual(self.reader.failures["adc_all_channels"], 1)
+
+    def test_unknown_call(self):
+        with self.assertRaises(ValueError):
+            self.emu.bounded_reader(budgets_ms={"adc_led_set": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
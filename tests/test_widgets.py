@@ -0,0 +1,91 @@
+import unittest
+
+from pyuptech import (
+    CommandCanvas,
+    Color,
+    Label,
+    ValueField,
+    BarGauge,
+    IndicatorRow,
+    Page,
+    PageContainer,
+)
+from pyuptech.modules.commands import decode_commands, ScreenOp
+
+
+class WidgetTests(unittest.TestCase):
+
+    def setUp(self):
+        self.canvas = CommandCanvas()
+
+    def calls(self):
+        calls = [(op, args) for op, args in decode_commands(self.canvas.commands) if op < ScreenOp.SET_FONT_SIZE]
+        self.canvas.clear()
+        return calls
+
+    def test_value_field_redraws_changed_chars(self):
+        field = ValueField(0, 0, "adc:", 4)
+        self.assertEqual((field.width, field.height), (48, 8))
+        field.render(self.canvas, 1234)
+        self.assertEqual(self.calls(), [(ScreenOp.PUT_STRING, (24, 0, "1234"))])
+        field.render(self.canvas, 1284)
+        self.assertEqual(self.calls(), [(ScreenOp.PUT_STRING, (36, 0, "8"))])
+        self.assertFalse(field.render(self.canvas, 1284))
+        field.render(self.canvas, 7)
+        self.assertEqual(self.calls(), [(ScreenOp.PUT_STRING, (24, 0, "7   "))])
+
+    def test_bar_gauge_fills_delta(self):
+        gauge = BarGauge(0, 0, 12, 5, 0, 100)
+        gauge.render(self.canvas, 50)
+        self.assertEqual(self.calls(), [(ScreenOp.FILL_FRAME, (1, 1, 5, 3, Color.GREEN))])
+        gauge.render(self.canvas, 80)
+        self.assertEqual(self.calls(), [(ScreenOp.FILL_FRAME, (6, 1, 8, 3, Color.GREEN))])
+        gauge.render(self.canvas, 10)
+        self.assertEqual(self.calls(), [(ScreenOp.FILL_FRAME, (2, 1, 8, 3, Color.BLACK))])
+        # values that fill the same pixels are not redrawn
+        self.assertFalse(gauge.render(self.canvas, 11))
+        # values beyond the ends are clamped
+        self.assertTrue(gauge.render(self.canvas, 500))
+        self.assertFalse(gauge.render(self.canvas, 900))
+
+    def test_indicator_row_redraws_flipped(self):
+        row = IndicatorRow(0, 0, bits=4, size=4, spacing=1)
+        row.render(self.canvas, 0b0101)
+        self.assertEqual(len(self.calls()), 2)
+        row.render(self.canvas, 0b0100)
+        self.assertEqual(self.calls(), [(ScreenOp.FILL_FRAME, (1, 1, 2, 2, Color.BLACK))])
+
+    def test_chrome_recorded_once(self):
+        label = Label(0, 0, "title")
+        self.assertIs(label.chrome, label.chrome)
+        self.assertIn((ScreenOp.PUT_STRING, (0, 0, "title")), list(decode_commands(label.chrome)))
+
+
+class PageContainerTests(unittest.TestCase):
+
+    def test_switch_erases_widgets_only(self):
+        canvas = CommandCanvas()
+        value = [1]
+        field = ValueField(0, 0, "v:", 3).bind(lambda: value[0])
+        pages = PageContainer(canvas).add("a", Page(field)).add("b", Page(Label(0, 20, "b")))
+        pages.show("a")
+        self.assertEqual(pages.update(), 0)
+        value[0] = 2
+        self.assertEqual(pages.update(), 1)
+
+        canvas.clear()
+        pages.show("b")
+        ops = list(decode_commands(canvas.commands))
+        self.assertNotIn(ScreenOp.FILL_SCREEN, [op for op, _ in ops])
+        self.assertEqual(ops[0], (ScreenOp.FILL_FRAME, (0, 0, 29, 7, Color.BLACK)))
+
+        # showing again redraws the value whatever it was
+        canvas.clear()
+        pages.show("a")
+        self.assertIn((ScreenOp.PUT_STRING, (12, 0, "2  ")), list(decode_commands(canvas.commands)))
+        with self.assertRaises(KeyError):
+            pages.show("c")
+
+
+if __name__ == "__main__":
+    unittest.main()